@@ -1,157 +1,917 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, BackgroundTasks, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+import asyncio
+import json
+import logging
 import time
 import os
+import stat
+import zipfile
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 
 from app.models.requests import ConvertRequest, PDFQARequest
-from app.models.responses import SummarizeResponse, ConvertResponse, UsageResponse, ErrorResponse, PDFQAResponse
-from app.core.pdf_processor import PDFProcessor
+from app.models.responses import (
+    SummarizeResponse, BatchItemResult, BatchSummarizeResponse, ConvertResponse, BundleConvertResponse,
+    UsageResponse, ErrorResponse, PDFQAResponse, JobResponse
+)
+from app.core.pdf_processor import PDFProcessor, PDFDocument
 from app.core.summarizer import GPTSummarizer
-from app.core.converter import DocumentConverter
+from app.core.answer_cache import AnswerCache
+from app.core.artifact_store import ArtifactStore
+from app.core.converter import DocumentConverter, MEDIA_TYPES
+from app.core.download_janitor import DownloadJanitor
+from app.core.job_queue import JobQueue, JobQueueFullError, JobFailedError, JobStatus
+from app.core.page_extractor import PageExtractor
 from app.core.rate_limiter import RateLimiter
+from app.core.retriever import RetrievalIndex, RetrievalIndexStore
+from app.core.single_flight import SingleFlight
+from app.core.summary_cache import SummaryCache
+from app.core.text_store import PageTextStore
+from app.core.worker_pool import WorkerPool, PoolSaturatedError
 from app.config import settings
+from app.utils.llm_client import LLMUnavailableError, llm_client
+from app.utils.metrics import RequestTimer, metrics, set_endpoint, stage
 from app.utils.openai_client import OpenAIClient
+from app.utils.http_cache import CachedFileResponse
+from app.utils.tokenizer import token_budget, token_counter
+from app.utils.upload_spool import SpooledUpload, UploadTooLargeError, spool_upload
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 # Initialize services
 pdf_processor = PDFProcessor()
 summarizer = GPTSummarizer()
+document_converter = DocumentConverter()
 rate_limiter = RateLimiter()
 openai_client = OpenAIClient()
+summary_cache = SummaryCache()
+qa_index_store = RetrievalIndexStore()
+text_store = PageTextStore()
+download_janitor = DownloadJanitor()
+artifact_store = ArtifactStore(janitor=download_janitor)
+job_queue = JobQueue()
+summary_flights = SingleFlight("summary")
+answer_cache = AnswerCache()
+
+# 이벤트 루프를 막지 않도록 PDF 파싱/문서 변환/LLM 호출을 별도 풀에서 실행
+pdf_pool = WorkerPool("pdf", settings.pdf_pool_workers, kind=settings.pdf_pool_kind, max_queue=settings.pool_max_queue)
+# 여러 페이지를 추출할 때는 문서를 구간으로 나누어 작업자들에 분산 (pdf_pool 슬롯 하나가 문서 하나)
+page_extractor = PageExtractor()
+convert_pool = WorkerPool("convert", settings.convert_pool_workers, kind="thread", max_queue=settings.pool_max_queue)
+llm_pool = WorkerPool("llm", settings.llm_max_concurrency, kind="async", max_queue=settings.pool_max_queue)
+
+
+def _job_metrics() -> Dict:
+    """작업 큐 통계에 상태별 작업 수를 풀어 넣습니다."""
+    stats = job_queue.stats()
+    stats.update({f"status_{status}": count for status, count in stats["jobs"].items()})
+    return stats
+
+
+# /metrics에서 내보낼 통계 (수집 시점에 각 서비스의 stats()를 읽음)
+metrics.register_stats("pool", lambda: {pool.name: pool.stats() for pool in (pdf_pool, convert_pool, llm_pool)}, label="pool")
+metrics.register_stats("cache", lambda: {
+    "summary": summary_cache.stats(),
+    "answer": answer_cache.stats(),
+    "page_text": page_extractor.cache.stats(),
+}, label="cache")
+metrics.register_stats("artifacts", artifact_store.stats)
+metrics.register_stats("downloads", download_janitor.stats)
+metrics.register_stats("flights", summary_flights.stats)
+metrics.register_stats("jobs", _job_metrics)
+metrics.register_stats("llm", lambda: {
+    **llm_client.stats(),
+    "circuit_open": llm_client.breaker.state != llm_client.breaker.CLOSED,
+})
+
+
+def warm_up_services() -> None:
+    """첫 요청이 느려지지 않도록 무거운 라이브러리와 서비스를 미리 불러옵니다."""
+    import fitz  # noqa: F401
+    import numpy  # noqa: F401
+    llm_client.client
+    token_counter.exact  # tiktoken 어휘 파일 확인/로드
+    document_converter.warm_up()
+    page_extractor.warm_up()
+
+
+def evict_expired_documents() -> int:
+    """만료된 페이지 텍스트와 그 문서의 검색 인덱스/답변 캐시를 함께 삭제하고 삭제한 문서 수를 반환합니다.
+
+    페이지 텍스트가 이미 없는 문서(읽다가 만료된 문서 등)의 인덱스도 같이 정리합니다. (블로킹, 스레드에서 호출)
+    """
+    expired = set(text_store.evict_expired())
+    expired.update(qa_index_store.evict(text_store.contains))
+    for file_id in expired:
+        answer_cache.invalidate(file_id)
+    return len(expired)
+
+
+SERVICE_BUSY_DETAIL = "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요."
+LLM_UNAVAILABLE_DETAIL = "AI 서비스가 일시적으로 응답하지 않습니다. 잠시 후 다시 시도해주세요."
+USAGE_LIMIT_DETAIL = "일일 사용 한도를 초과했습니다. 내일 다시 시도해주세요."
+QA_DOCUMENT_NOT_FOUND_DETAIL = "PDF 파일을 찾을 수 없습니다. 문서를 다시 요약한 뒤 질문해주세요."
+
+
+async def _check_usage(session_id: str) -> Dict:
+    """사용량 제한을 확인하고 남은 횟수가 없으면 429 오류를 발생시킵니다."""
+    with stage("rate_limit"):
+        # SQLite 저장소는 잠금 대기가 길어질 수 있으므로 이벤트 루프를 막지 않도록 스레드에서 실행
+        usage_info = await asyncio.to_thread(rate_limiter.check_limit, session_id)
+    if usage_info["remaining"] <= 0:
+        raise HTTPException(
+            status_code=429,
+            detail=USAGE_LIMIT_DETAIL
+        )
+    return usage_info
+
+
+async def _read_upload(file: UploadFile, session_id: str) -> SpooledUpload:
+    """사용량, 파일 형식, 파일 크기를 확인하고 업로드를 임시 파일로 옮겨 반환합니다."""
+    # 1. 사용량 제한 확인
+    await _check_usage(session_id)
+    return await _spool_pdf(file)
+
+
+async def _spool_pdf(file: UploadFile, spool_dir: Optional[str] = None) -> SpooledUpload:
+    """파일 형식과 크기를 확인하고 업로드를 임시 파일로 옮겨 반환합니다."""
+    # 2. 파일 검증
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="PDF 파일만 업로드 가능합니다."
+        )
+    
+    # 3. 파일 크기 확인 (청크 단위로 옮기며 제한을 넘는 순간 중단, 해시도 함께 계산)
+    try:
+        with stage("upload"):
+            return await spool_upload(file, settings.max_file_size, spool_dir=spool_dir)
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=413,
+            detail=f"파일 크기가 {settings.max_file_size // (1024*1024)}MB를 초과합니다."
+        )
+
+
+def _summary_cache_key(file_hash: str, max_pages: int, full_document: bool = False) -> str:
+    """동일 문서/설정의 요약을 재사용하기 위한 캐시 키를 생성합니다.
+    
+    입력 토큰 예산에 따라 잘리는 위치(map-reduce는 청크 크기)가 달라지므로 예산도 키에 넣습니다.
+    """
+    prompt_version = f"{summarizer.PROMPT_VERSION}-{summarizer.input_token_budget}"
+    if full_document:
+        prompt_version = f"{prompt_version}-mapreduce"
+    return summary_cache.make_key(
+        file_hash,
+        max_pages,
+        summarizer.model,
+        prompt_version
+    )
+
+
+async def _extract_document(
+    upload: SpooledUpload,
+    max_pages: int,
+    on_page: Optional[Callable[[int, int], None]] = None
+) -> PDFDocument:
+    """PDF의 유효성/페이지 수/페이지별 텍스트를 추출합니다.
+    
+    앞 몇 페이지만 필요하면 작업 프로세스 하나에서 한 번에 파싱하고,
+    그보다 많으면 PageExtractor로 구간을 나누어 병렬 추출합니다. (작업자에는 내용 대신 경로만 전달)
+    열리지만 페이지 텍스트를 읽을 수 없는 손상된 PDF도 열 수 없는 PDF와 같이 유효하지 않은 문서로 반환합니다. (400)
+    """
+    with stage("extract"):
+        try:
+            if max_pages <= settings.page_extract_shard_pages:
+                return await pdf_pool.run(pdf_processor.parse, None, max_pages, upload.path)
+            async with pdf_pool.slot():
+                return await page_extractor.parse(upload.path, upload.file_hash, max_pages, on_page)
+        except ValueError as e:
+            return PDFDocument(is_valid=False, error=str(e))
+
+
+async def _parse_upload(
+    upload: SpooledUpload,
+    max_pages: int,
+    on_page: Optional[Callable[[int, int], None]] = None
+) -> PDFDocument:
+    """PDF를 파싱하고 요약할 텍스트가 있는지 검증합니다."""
+    document = await _extract_document(upload, max_pages, on_page)
+    if not document.is_valid:
+        raise HTTPException(
+            status_code=400,
+            detail="유효하지 않은 PDF 파일입니다."
+        )
+    
+    if not document.text:
+        raise HTTPException(
+            status_code=400,
+            detail="PDF에서 텍스트를 추출할 수 없습니다. 이미지 기반 PDF이거나 보호된 파일일 수 있습니다."
+        )
+    return document
+
+
+async def _summarize_upload(
+    upload: SpooledUpload,
+    max_pages: int,
+    full_document: bool = False,
+    report: Optional[Callable[[float, str], None]] = None
+) -> Tuple[Dict, Optional[PDFDocument]]:
+    """업로드한 PDF의 요약을 반환합니다. (요약 결과 딕셔너리, 새로 파싱했다면 문서)
+    
+    report(진행률, 단계)가 주어지면 파싱/요약 진행 상황을 알립니다. (비동기 작업용)
+    """
+    # 4. 캐시 확인 (동일 문서/설정으로 요약한 결과가 있으면 재사용)
+    cache_key = _summary_cache_key(upload.file_hash, max_pages, full_document)
+    with stage("cache"):
+        cached = await summary_cache.get(cache_key)
+    if cached is not None:
+        return cached, None
+    
+    # 같은 문서/설정의 요약이 이미 진행 중이면 새로 파싱/호출하지 않고 그 결과를 함께 사용
+    return await summary_flights.do(cache_key, _summarize_uncached, upload, cache_key, max_pages, full_document, report)
+
+
+async def _summarize_uncached(
+    upload: SpooledUpload,
+    cache_key: str,
+    max_pages: int,
+    full_document: bool,
+    report: Optional[Callable[[float, str], None]]
+) -> Tuple[Dict, PDFDocument]:
+    """PDF를 파싱하고 요약을 생성해 캐시에 저장합니다."""
+    # 5~6. PDF 파싱 및 텍스트 추출
+    document = await _parse_upload(
+        upload,
+        max_pages,
+        on_page=(lambda done, total: report(0.05 + 0.15 * done / total, "extracting")) if report else None
+    )
+    if report is not None:
+        report(0.2, "summarizing")
+    
+    # 7. GPT-3.5로 요약 생성
+    with stage("llm"):
+        if full_document:
+            summary = await summarizer.summarize_long(
+                document.page_texts,
+                cache=summary_cache,
+                pool=llm_pool,
+                on_progress=(lambda done, total: report(0.2 + 0.7 * done / total, "summarizing")) if report else None
+            )
+        else:
+            summary = await llm_pool.run(summarizer.summarize_text, document.text)
+    
+    cached = {
+        "summary": summary,
+        "page_count": document.extracted_page_count
+    }
+    await summary_cache.set(cache_key, cached)
+    return cached, document
+
+
+async def _register_document(
+    file_id: str,
+    upload: SpooledUpload,
+    document: Optional[PDFDocument] = None,
+    cleanup: bool = True
+) -> None:
+    """Q&A에 사용할 수 있도록 문서의 페이지별 텍스트를 저장합니다. (응답 후 백그라운드 실행)
+    
+    이미 저장된 문서는 만료 시각만 미루고 다시 추출하지 않으며,
+    요약 단계에서 이미 모든 페이지를 추출했다면 다시 파싱하지 않습니다.
+    cleanup이면 끝난 뒤 업로드 임시 파일을 지웁니다. (작업 큐의 입력 파일은 큐가 지움)
+    """
+    try:
+        if await asyncio.to_thread(text_store.touch, file_id):
+            return
+        
+        if document is None or document.extracted_page_count < min(document.page_count, settings.text_store_max_pages):
+            document = await _extract_document(upload, settings.text_store_max_pages)
+        if document.is_valid:
+            with stage("register"):
+                await asyncio.to_thread(text_store.put, file_id, document.page_texts)
+    except Exception:
+        logger.exception("문서 등록 실패 (%s)", file_id)
+    finally:
+        if cleanup:
+            upload.cleanup()
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events 형식의 메시지를 생성합니다."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
 
 
 @router.post("/summarize", response_model=SummarizeResponse)
 async def summarize_pdf(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    session_id: str = Form(...)
+    session_id: str = Form(...),
+    full_document: bool = Form(False)
 ):
-    """PDF 파일을 업로드하고 요약을 생성합니다."""
+    """PDF 파일을 업로드하고 요약을 생성합니다.
+    
+    full_document가 True이면 앞 페이지만이 아니라 문서 전체(최대 full_document_max_pages)를
+    청크 단위 map-reduce 방식으로 요약합니다.
+    """
     
     start_time = time.time()
+    timer = RequestTimer("summarize")
+    max_pages = settings.full_document_max_pages if full_document else settings.max_pages
+    upload = None
+    registered = False
     
     try:
-        # 1. 사용량 제한 확인
-        usage_info = rate_limiter.check_limit(session_id)
-        if usage_info["remaining"] <= 0:
-            raise HTTPException(
-                status_code=429,
-                detail="일일 사용 한도를 초과했습니다. 내일 다시 시도해주세요."
-            )
+        # 1~3. 사용량/형식/크기 확인
+        upload = await _read_upload(file, session_id)
         
-        # 2. 파일 검증
-        if not file.filename.lower().endswith('.pdf'):
-            raise HTTPException(
-                status_code=400,
-                detail="PDF 파일만 업로드 가능합니다."
-            )
+        # 4~7. 캐시 확인, PDF 파싱, 요약 생성
+        file_id = upload.file_hash
+        cached, document = await _summarize_upload(upload, max_pages, full_document)
         
-        # 3. 파일 크기 확인
-        contents = await file.read()
-        if len(contents) > settings.max_file_size:
+        # 8. 사용량 증가 (확인과 증가를 원자적으로 처리)
+        with stage("rate_limit"):
+            incremented, updated_usage = await asyncio.to_thread(rate_limiter.consume, session_id)
+        if not incremented:
             raise HTTPException(
-                status_code=413,
-                detail=f"파일 크기가 {settings.max_file_size // (1024*1024)}MB를 초과합니다."
-            )
-        
-        # 4. PDF 유효성 검증
-        if not pdf_processor.validate_pdf(contents):
-            raise HTTPException(
-                status_code=400,
-                detail="유효하지 않은 PDF 파일입니다."
-            )
-        
-        # 5. PDF에서 텍스트 추출
-        extracted_text = pdf_processor.extract_text_from_pages(contents, settings.max_pages)
-        if not extracted_text.strip():
-            raise HTTPException(
-                status_code=400,
-                detail="PDF에서 텍스트를 추출할 수 없습니다. 이미지 기반 PDF이거나 보호된 파일일 수 있습니다."
+                status_code=429,
+                detail=USAGE_LIMIT_DETAIL
             )
         
-        # 6. GPT-3.5로 요약 생성
-        summary = summarizer.summarize_text(extracted_text)
-        
-        # 7. 사용량 증가
-        rate_limiter.increment_usage(session_id)
-        updated_usage = rate_limiter.check_limit(session_id)
+        # 9. Q&A용 페이지 텍스트 저장 (응답 후 실행)
+        background_tasks.add_task(_register_document, file_id, upload, document)
+        registered = True
         
         processing_time = time.time() - start_time
         
         return SummarizeResponse(
-            summary=summary,
-            page_count=min(pdf_processor.get_page_count(contents), settings.max_pages),
+            summary=cached["summary"],
+            page_count=cached["page_count"],
             usage_remaining=updated_usage["remaining"],
-            processing_time=processing_time
+            processing_time=processing_time,
+            file_id=file_id
         )
         
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_BUSY_DETAIL)
+    except LLMUnavailableError:
+        raise HTTPException(status_code=503, detail=LLM_UNAVAILABLE_DETAIL)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"처리 중 오류가 발생했습니다: {str(e)}"
         )
+    finally:
+        # 백그라운드 등록으로 넘기지 못한 업로드 임시 파일은 바로 삭제
+        if upload is not None and not registered:
+            upload.cleanup()
+        timer.finish()
 
 
-@router.post("/convert", response_model=ConvertResponse)
-async def convert_document(
-    summary_text: str = Form(...),
-    format: str = Form(...),
+async def _summarize_batch_item(
+    file: UploadFile,
+    session_id: str,
+    max_pages: int,
+    full_document: bool,
+    semaphore: asyncio.Semaphore,
+    background_tasks: BackgroundTasks,
+    within_quota: bool = True
+) -> BatchItemResult:
+    """배치의 파일 하나를 요약합니다. 실패해도 예외 대신 오류가 담긴 결과를 반환합니다.
+    
+    요약(LLM 호출) 전에 사용량 1회를 미리 차감하고, 요약에 실패하면 되돌립니다.
+    within_quota가 False이면(남은 횟수를 넘는 파일) 업로드를 읽지 않고 바로 429로 표시합니다.
+    """
+    start_time = time.time()
+    if not within_quota:
+        return BatchItemResult(
+            filename=file.filename,
+            status_code=429,
+            error=USAGE_LIMIT_DETAIL,
+            processing_time=0.0
+        )
+    
+    upload = None
+    reserved = None
+    registered = False
+    
+    try:
+        async with semaphore:
+            upload = await _spool_pdf(file)
+            
+            # 다른 요청이 그사이 남은 횟수를 썼으면 LLM을 호출하지 않고 이 파일은 429
+            with stage("rate_limit"):
+                incremented, usage_info = await asyncio.to_thread(rate_limiter.consume, session_id)
+            if not incremented:
+                raise HTTPException(
+                    status_code=429,
+                    detail=USAGE_LIMIT_DETAIL
+                )
+            reserved = usage_info
+            
+            cached, document = await _summarize_upload(upload, max_pages, full_document)
+        
+        background_tasks.add_task(_register_document, upload.file_hash, upload, document)
+        registered = True
+        reserved = None  # 요약에 성공했으므로 차감 확정
+        
+        return BatchItemResult(
+            filename=file.filename,
+            status_code=200,
+            summary=cached["summary"],
+            page_count=cached["page_count"],
+            file_id=upload.file_hash,
+            processing_time=time.time() - start_time
+        )
+    
+    except HTTPException as e:
+        status_code, error = e.status_code, e.detail
+    except PoolSaturatedError:
+        status_code, error = 503, SERVICE_BUSY_DETAIL
+    except LLMUnavailableError:
+        status_code, error = 503, LLM_UNAVAILABLE_DETAIL
+    except Exception as e:
+        status_code, error = 500, f"처리 중 오류가 발생했습니다: {str(e)}"
+    finally:
+        if upload is not None and not registered:
+            upload.cleanup()
+        # 미리 차감한 사용량은 요약에 실패하면(취소 포함) 되돌림
+        if reserved is not None:
+            await asyncio.to_thread(rate_limiter.refund, session_id, reserved["day"])
+    
+    return BatchItemResult(
+        filename=file.filename,
+        status_code=status_code,
+        error=error,
+        processing_time=time.time() - start_time
+    )
+
+
+@router.post("/summarize/batch", response_model=BatchSummarizeResponse)
+async def summarize_pdf_batch(
+    background_tasks: BackgroundTasks,
+    files: List[UploadFile] = File(...),
+    session_id: str = Form(...),
+    full_document: bool = Form(False)
+):
+    """여러 PDF를 한 번에 업로드하고 파일별 요약을 생성합니다.
+    
+    파일들은 최대 batch_concurrency개씩 동시에 파싱/요약되므로 전체 시간은 가장 오래 걸린 파일에 가깝습니다.
+    사용량은 성공한 파일마다 1회씩 차감되고, 실패한 파일은 결과에 오류로 표시됩니다.
+    남은 횟수보다 많은 파일을 올리면 앞에서부터 남은 횟수만큼만 요약하고 나머지는 429로 표시합니다.
+    """
+    
+    start_time = time.time()
+    set_endpoint("summarize_batch")
+    max_pages = settings.full_document_max_pages if full_document else settings.max_pages
+    
+    if len(files) > settings.batch_max_files:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.batch_max_files}개 파일까지 요약할 수 있습니다."
+        )
+    usage_info = await _check_usage(session_id)
+    
+    semaphore = asyncio.Semaphore(settings.batch_concurrency)
+    results = await asyncio.gather(*(
+        _summarize_batch_item(
+            file, session_id, max_pages, full_document, semaphore, background_tasks,
+            within_quota=index < usage_info["remaining"]
+        )
+        for index, file in enumerate(files)
+    ))
+    
+    succeeded = sum(1 for result in results if result.status_code == 200)
+    updated_usage = await asyncio.to_thread(rate_limiter.check_limit, session_id)
+    
+    return BatchSummarizeResponse(
+        results=results,
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        usage_remaining=updated_usage["remaining"],
+        processing_time=time.time() - start_time
+    )
+
+
+@router.post("/summarize/stream")
+async def summarize_pdf_stream(
+    file: UploadFile = File(...),
     session_id: str = Form(...)
 ):
-    """요약 텍스트를 지정된 형식으로 변환합니다."""
+    """PDF 요약을 Server-Sent Events로 스트리밍합니다.
+    
+    이벤트 순서: received → validated → extracted → token(반복) → done
+    오류가 발생하면 error 이벤트를 보내고 스트림을 종료하며, 사용량은 차감하지 않습니다.
+    """
+    
+    start_time = time.time()
+    set_endpoint("summarize_stream")
+    
+    # 스트림을 시작하기 전에 확인할 수 있는 오류는 일반 HTTP 오류로 응답
+    upload = await _read_upload(file, session_id)
+    file_id = upload.file_hash
+    
+    async def event_stream():
+        try:
+            yield _sse_event("received", {"file_size": upload.size})
+            
+            cache_key = _summary_cache_key(file_id, settings.max_pages)
+            cached = await summary_cache.get(cache_key)
+            
+            if cached is not None:
+                yield _sse_event("validated", {"cached": True})
+                yield _sse_event("extracted", {"page_count": cached["page_count"], "cached": True})
+                yield _sse_event("token", {"text": cached["summary"]})
+            else:
+                document = await _parse_upload(upload, settings.max_pages)
+                yield _sse_event("validated", {"cached": False, "total_pages": document.page_count})
+                yield _sse_event("extracted", {"page_count": document.extracted_page_count, "cached": False})
+                
+                parts = []
+                async with llm_pool.slot():
+                    async for delta in summarizer.stream_summary(document.text):
+                        parts.append(delta)
+                        yield _sse_event("token", {"text": delta})
+                
+                cached = {
+                    "summary": "".join(parts).strip(),
+                    "page_count": document.extracted_page_count
+                }
+                await summary_cache.set(cache_key, cached)
+            
+            # 요약이 끝까지 성공한 경우에만 사용량 증가
+            incremented, updated_usage = await asyncio.to_thread(rate_limiter.consume, session_id)
+            if not incremented:
+                yield _sse_event("error", {
+                    "status_code": 429,
+                    "detail": USAGE_LIMIT_DETAIL
+                })
+                return
+            
+            yield _sse_event("done", {
+                "page_count": cached["page_count"],
+                "usage_remaining": updated_usage["remaining"],
+                "processing_time": time.time() - start_time,
+                "file_id": file_id
+            })
+            
+        except HTTPException as e:
+            yield _sse_event("error", {"status_code": e.status_code, "detail": e.detail})
+        except PoolSaturatedError:
+            yield _sse_event("error", {"status_code": 503, "detail": SERVICE_BUSY_DETAIL})
+        except LLMUnavailableError:
+            yield _sse_event("error", {"status_code": 503, "detail": LLM_UNAVAILABLE_DETAIL})
+        except Exception as e:
+            yield _sse_event("error", {"status_code": 500, "detail": f"처리 중 오류가 발생했습니다: {str(e)}"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(_register_document, file_id, upload)
+    )
+
+
+async def _run_summarize_job(job: Dict, report: Callable[[float, str], None]) -> Dict:
+    """비동기 요약 작업 처리기: /summarize와 같은 단계를 거쳐 요약 응답과 같은 결과를 반환합니다."""
+    start_time = time.time()
+    set_endpoint("job_summarize")
+    payload = job["payload"]
+    upload = SpooledUpload(payload["input_path"], payload["size"], payload["file_hash"])
+    max_pages = settings.full_document_max_pages if payload["full_document"] else settings.max_pages
     
     try:
-        # 1. 사용량 확인 (요약을 먼저 했는지 확인)
-        usage_info = rate_limiter.check_limit(session_id)
-        if usage_info["usage_count"] == 0:
-            raise HTTPException(
-                status_code=400,
-                detail="먼저 PDF를 요약해주세요."
-            )
+        report(0.05, "extracting")
+        cached, document = await _summarize_upload(upload, max_pages, payload["full_document"], report)
         
-        # 2. 요약 텍스트 검증
-        if not summary_text or len(summary_text.strip()) < 10:
+        # 요약이 성공한 경우에만 사용량 증가
+        incremented, updated_usage = await asyncio.to_thread(rate_limiter.consume, payload["session_id"])
+        if not incremented:
             raise HTTPException(
-                status_code=400,
-                detail="유효한 요약 텍스트가 필요합니다."
+                status_code=429,
+                detail=USAGE_LIMIT_DETAIL
             )
         
+        # 작업이 끝났다고 알리기 전에 Q&A용 페이지 텍스트를 저장
+        # 입력 파일은 이 프로세스가 lease를 가진 채 작업을 끝냈다고 기록한 뒤에 큐가 삭제
+        # (lease가 지나 다른 프로세스가 다시 가져갔다면 그 프로세스가 쓰는 파일이므로 지우면 안 됨)
+        report(0.95, "registering")
+        await _register_document(upload.file_hash, upload, document, cleanup=False)
+    except HTTPException as e:
+        raise JobFailedError(e.status_code, e.detail)
+    except PoolSaturatedError:
+        raise JobFailedError(503, SERVICE_BUSY_DETAIL)
+    except LLMUnavailableError:
+        raise JobFailedError(503, LLM_UNAVAILABLE_DETAIL)
+    
+    return {
+        "summary": cached["summary"],
+        "page_count": cached["page_count"],
+        "usage_remaining": updated_usage["remaining"],
+        "processing_time": time.time() - start_time,
+        "file_id": upload.file_hash
+    }
+
+
+job_queue.register("summarize", _run_summarize_job)
+
+
+@router.post("/jobs/summarize", response_model=JobResponse, status_code=202)
+async def submit_summarize_job(
+    file: UploadFile = File(...),
+    session_id: str = Form(...),
+    full_document: bool = Form(False),
+    priority: int = Form(0)
+):
+    """PDF 요약을 비동기 작업으로 등록하고 작업 ID를 바로 반환합니다.
+    
+    진행 상황은 GET /jobs/{job_id}로 조회하거나 /jobs/{job_id}/ws WebSocket으로 받을 수 있습니다.
+    priority가 높은 작업부터 처리하며, 사용량은 작업이 성공했을 때만 차감됩니다.
+    """
+    await _check_usage(session_id)
+    # 서버가 다시 시작되어도 작업을 이어갈 수 있도록 업로드를 작업 폴더에 보관
+    upload = await _spool_pdf(file, spool_dir=settings.job_dir)
+    
+    try:
+        job = await job_queue.submit(
+            "summarize",
+            {
+                "input_path": upload.path,
+                "size": upload.size,
+                "file_hash": upload.file_hash,
+                "session_id": session_id,
+                "full_document": full_document,
+                "filename": file.filename,
+            },
+            priority=priority
+        )
+    except JobQueueFullError:
+        upload.cleanup()
+        raise HTTPException(status_code=503, detail=SERVICE_BUSY_DETAIL)
+    return JobResponse(**job)
+
+
+@router.get("/jobs/stats")
+async def get_job_stats():
+    """작업 큐의 대기열 깊이와 상태별 작업 수를 반환합니다."""
+    return job_queue.stats()
+
+
+@router.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """작업 상태와 진행률, 끝났다면 결과를 반환합니다."""
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return JobResponse(**job)
+
+
+@router.delete("/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """대기 중이거나 실행 중인 작업을 취소합니다. 이미 끝난 작업은 그대로 반환합니다."""
+    job = await job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return JobResponse(**job)
+
+
+async def _next_job_update(job_id: str, job: Dict, updates: asyncio.Queue) -> Optional[Dict]:
+    """작업 상태가 바뀔 때까지 기다려 새 작업 정보를 반환합니다. (작업이 삭제되었으면 None)
+
+    다른 worker 프로세스가 실행 중인 작업은 이 프로세스에 알림이 오지 않으므로 job_poll_interval마다 저장소를 다시 읽습니다.
+    """
+    while True:
+        try:
+            return await asyncio.wait_for(updates.get(), settings.job_poll_interval)
+        except asyncio.TimeoutError:
+            latest = await job_queue.get(job_id)
+            if latest is None or any(latest[key] != job[key] for key in ("status", "progress", "stage")):
+                return latest
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def watch_job(websocket: WebSocket, job_id: str):
+    """작업 상태가 바뀔 때마다 작업 정보를 보내고, 작업이 끝나면 연결을 닫습니다."""
+    await websocket.accept()
+    # 상태를 읽기 전에 구독해야 그 사이의 변경을 놓치지 않음
+    updates = job_queue.subscribe(job_id)
+    try:
+        job = await job_queue.get(job_id)
+        if job is None:
+            await websocket.close(code=4404)
+            return
+        while True:
+            await websocket.send_json(JobResponse(**job).model_dump())
+            if job["status"] in JobStatus.FINISHED:
+                break
+            job = await _next_job_update(job_id, job, updates)
+            if job is None:
+                break
+        await websocket.close()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        job_queue.unsubscribe(job_id, updates)
+
+
+UNSUPPORTED_FORMAT_DETAIL = f"지원하는 형식: {', '.join(MEDIA_TYPES)}"
+
+
+async def _validate_convert_request(summary_text: str, session_id: str) -> None:
+    """변환 요청의 사용량(요약을 먼저 했는지)과 요약 텍스트를 확인합니다."""
+    with stage("rate_limit"):
+        usage_info = await asyncio.to_thread(rate_limiter.check_limit, session_id)
+    if usage_info["usage_count"] == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="먼저 PDF를 요약해주세요."
+        )
+    
+    if not summary_text or len(summary_text.strip()) < 10:
+        raise HTTPException(
+            status_code=400,
+            detail="유효한 요약 텍스트가 필요합니다."
+        )
+
+
+@router.post("/convert", response_model=ConvertResponse)
+async def convert_document(
+    summary_text: str = Form(...),
+    format: str = Form(...),
+    session_id: str = Form(...),
+    inline: bool = Form(False)
+):
+    """요약 텍스트를 지정된 형식으로 변환합니다.
+    
+    inline이면 파일을 저장하지 않고 변환된 내용을 바로 응답 본문으로 보냅니다.
+    """
+    
+    timer = RequestTimer("convert")
+    try:
+        # 1~2. 사용량/요약 텍스트 확인
+        await _validate_convert_request(summary_text, session_id)
+        
         # 3. 형식 검증
-        if format not in ["docx", "pdf", "txt"]:
+        if format not in MEDIA_TYPES:
             raise HTTPException(
                 status_code=400,
-                detail="지원하는 형식: docx, pdf, txt"
+                detail=UNSUPPORTED_FORMAT_DETAIL
             )
         
-        # 4. 문서 변환
-        converter = DocumentConverter()
-        
-        if format == "docx":
-            file_content = converter.to_docx(summary_text)
-            filename = f"summary_{int(time.time())}.docx"
-        elif format == "pdf":
-            file_content = converter.to_pdf(summary_text)
-            filename = f"summary_{int(time.time())}.pdf"
-        elif format == "txt":
-            file_content = converter.to_txt(summary_text)
-            filename = f"summary_{int(time.time())}.txt"
+        # 4. 같은 요약/형식/렌더러 버전으로 이미 변환한 파일이 있으면 재사용
+        filename = ArtifactStore.make_filename(summary_text, format, DocumentConverter.RENDERER_VERSION)
+        with stage("cache"):
+            file_size = None if inline else await artifact_store.size(filename)
         
-        # 5. 파일 저장
-        file_path = os.path.join("downloads", filename)
-        with open(file_path, "wb") as f:
-            f.write(file_content)
+        if file_size is None:
+            # 5. 문서 변환 (폰트는 프로세스당 한 번만 탐색/등록되므로 공유 변환기를 사용)
+            with stage("render"):
+                file_content = await convert_pool.run(document_converter.convert, summary_text, format)
+            
+            if inline:
+                return Response(
+                    content=file_content,
+                    media_type=MEDIA_TYPES[format],
+                    headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+                )
+            
+            # 6. 파일 저장 (이벤트 루프를 막지 않도록 비동기로)
+            with stage("store"):
+                await artifact_store.write(filename, file_content)
+            file_size = len(file_content)
         
         return ConvertResponse(
             download_url=f"/pdf/download/{filename}",
             filename=filename,
-            file_size=len(file_content)
+            file_size=file_size
         )
         
     except HTTPException:
         raise
+    except PoolSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_BUSY_DETAIL)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"변환 중 오류가 발생했습니다: {str(e)}"
+        )
+    finally:
+        timer.finish()
+
+
+def _parse_formats(formats: str) -> List[str]:
+    """쉼표로 구분된 형식 목록을 검증하고 중복을 제거합니다."""
+    requested = list(dict.fromkeys(fmt.strip().lower() for fmt in formats.split(",") if fmt.strip()))
+    if not requested or any(fmt not in MEDIA_TYPES for fmt in requested):
+        raise HTTPException(
+            status_code=400,
+            detail=UNSUPPORTED_FORMAT_DETAIL
+        )
+    return requested
+
+
+class _ZipStreamBuffer:
+    """ZipFile이 쓴 바이트를 모아 두었다가 응답 조각으로 내보내는 쓰기 전용 버퍼
+    
+    tell/seek이 없으므로 ZipFile은 data descriptor 방식으로 순차 기록합니다.
+    """
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self) -> None:
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _stream_bundle_zip(contents: Dict[str, bytes]):
+    """변환 결과를 ZIP 항목 단위로 만들어 바로 내보냅니다. (전체 압축 파일을 메모리에 만들지 않음)"""
+    buffer = _ZipStreamBuffer()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for fmt, content in contents.items():
+            info = zipfile.ZipInfo(f"summary.{fmt}", date_time=time.localtime()[:6])
+            info.external_attr = 0o644 << 16
+            # docx/pdf는 이미 압축된 형식이므로 다시 압축하지 않음
+            info.compress_type = zipfile.ZIP_STORED if fmt in ("docx", "pdf") else zipfile.ZIP_DEFLATED
+            archive.writestr(info, content)
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+@router.post("/convert/bundle", response_model=BundleConvertResponse)
+async def convert_document_bundle(
+    summary_text: str = Form(...),
+    formats: str = Form("docx,pdf,txt,html"),
+    session_id: str = Form(...),
+    delivery: str = Form("manifest")
+):
+    """요약 텍스트를 여러 형식으로 한 번에 변환합니다.
+    
+    formats는 쉼표로 구분된 형식 목록이며, 형식별 변환은 변환 풀에서 동시에 실행됩니다.
+    delivery가 "manifest"이면 형식별 다운로드 URL 목록을, "zip"이면 모든 파일을 담은 ZIP을 스트리밍합니다.
+    """
+    
+    set_endpoint("convert_bundle")
+    try:
+        await _validate_convert_request(summary_text, session_id)
+        requested = _parse_formats(formats)
+        if delivery not in ("manifest", "zip"):
+            raise HTTPException(
+                status_code=400,
+                detail="delivery는 manifest 또는 zip이어야 합니다."
+            )
+        
+        filenames = {
+            fmt: ArtifactStore.make_filename(summary_text, fmt, DocumentConverter.RENDERER_VERSION)
+            for fmt in requested
+        }
+        sizes = dict(zip(requested, await asyncio.gather(*(artifact_store.size(filenames[fmt]) for fmt in requested))))
+        missing = [fmt for fmt in requested if sizes[fmt] is None]
+        
+        # 문단 분리는 한 번만 하고 모든 형식의 렌더러가 공유
+        paragraphs = DocumentConverter.parse_paragraphs(summary_text)
+        with stage("render"):
+            rendered = dict(zip(missing, await asyncio.gather(*(
+                convert_pool.run(document_converter.convert, summary_text, fmt, paragraphs)
+                for fmt in missing
+            ))))
+        
+        if delivery == "zip":
+            cached = [fmt for fmt in requested if fmt not in rendered]
+            rendered.update(zip(cached, await asyncio.gather(*(artifact_store.read(filenames[fmt]) for fmt in cached))))
+            return StreamingResponse(
+                _stream_bundle_zip({fmt: rendered[fmt] for fmt in requested}),
+                media_type="application/zip",
+                headers={"Content-Disposition": 'attachment; filename="summary_bundle.zip"'}
+            )
+        
+        await asyncio.gather(*(artifact_store.write(filenames[fmt], rendered[fmt]) for fmt in missing))
+        return BundleConvertResponse(files=[
+            ConvertResponse(
+                download_url=f"/pdf/download/{filenames[fmt]}",
+                filename=filenames[fmt],
+                file_size=sizes[fmt] if sizes[fmt] is not None else len(rendered[fmt])
+            )
+            for fmt in requested
+        ])
+        
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_BUSY_DETAIL)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -164,7 +924,7 @@ async def get_usage(session_id: str):
     """사용량 정보를 조회합니다."""
     
     try:
-        usage_info = rate_limiter.check_limit(session_id)
+        usage_info = await asyncio.to_thread(rate_limiter.check_limit, session_id)
         
         return UsageResponse(
             usage_count=usage_info["usage_count"],
@@ -182,44 +942,142 @@ async def get_usage(session_id: str):
 
 @router.get("/download/{filename}")
 async def download_file(filename: str):
-    """변환된 파일을 다운로드합니다."""
+    """변환된 파일을 다운로드합니다.
+    
+    ETag와 If-None-Match(304), Range(206)를 지원하며 내용 주소 기반 파일은 오래 캐시하도록 알립니다.
+    """
     
-    file_path = os.path.join("downloads", filename)
+    file_path = os.path.join(settings.download_dir, os.path.basename(filename))
     
-    if not os.path.exists(file_path):
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except OSError:
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(
             status_code=404,
             detail="파일을 찾을 수 없습니다."
         )
     
-    return FileResponse(
-        path=file_path,
+    download_janitor.touch(filename)
+    return CachedFileResponse(
+        file_path,
+        stat_result=stat_result,
         filename=filename,
-        media_type='application/octet-stream'
+        media_type='application/octet-stream',
+        content_hash=ArtifactStore.content_hash(filename)
     )
 
 
+@router.get("/cache/stats")
+async def get_cache_stats():
+    """요약 캐시 통계를 조회합니다."""
+    return summary_cache.stats()
+
+
+@router.get("/qa/cache/stats")
+async def get_answer_cache_stats():
+    """Q&A 답변 캐시 적중(정확/유사 질문) 통계를 조회합니다."""
+    return answer_cache.stats()
+
+
+@router.get("/flights/stats")
+async def get_flight_stats():
+    """진행 중인 요약에 합쳐진(coalesced) 요청 수를 조회합니다."""
+    return summary_flights.stats()
+
+
+@router.get("/artifacts/stats")
+async def get_artifact_stats():
+    """변환 파일 재사용/저장 통계를 조회합니다."""
+    return artifact_store.stats()
+
+
+@router.get("/downloads/stats")
+async def get_download_stats():
+    """다운로드 폴더 정리(용량/회수 바이트) 통계를 조회합니다."""
+    return download_janitor.stats()
+
+
+@router.get("/pools/stats")
+async def get_pool_stats():
+    """작업 풀의 대기열 깊이와 대기 시간을 조회합니다."""
+    return {pool.name: pool.stats() for pool in (pdf_pool, convert_pool, llm_pool)}
+
+
+@router.get("/extract/stats")
+async def get_extract_stats():
+    """페이지 병렬 추출 작업자와 페이지 텍스트 캐시 통계를 조회합니다."""
+    return page_extractor.stats()
+
+
+@router.get("/llm/stats")
+async def get_llm_stats():
+    """LLM 호출/재시도/실패 횟수와 회로 차단기 상태를 조회합니다."""
+    return llm_client.stats()
+
+
 @router.post("/qa", response_model=PDFQAResponse)
 async def ask_question(request: PDFQARequest):
     """PDF 내용을 바탕으로 질문에 답변합니다."""
+    timer = RequestTimer("qa")
     try:
-        # PDF 파일 내용 가져오기
-        pdf_text = pdf_processor.get_pdf_text(request.file_id)
-        if not pdf_text:
-            raise HTTPException(status_code=404, detail="PDF 파일을 찾을 수 없습니다.")
+        # 잘못된 질문은 인덱스를 만들거나 불러오기 전에 거절
+        is_valid, error_message = openai_client.security.validate_question(request.question)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_message)
+        
+        # 검색 인덱스 가져오기 (없으면 요약 시 저장한 페이지 텍스트로 한 번 생성해 저장)
+        with stage("index"):
+            # 페이지 텍스트가 없거나 만료된 문서는 남아 있는 인덱스가 있어도 답하지 않음
+            if not await asyncio.to_thread(text_store.contains, request.file_id):
+                raise HTTPException(status_code=404, detail=QA_DOCUMENT_NOT_FOUND_DETAIL)
+            index = await asyncio.to_thread(qa_index_store.get, request.file_id)
+            if index is None:
+                page_texts = await asyncio.to_thread(text_store.get_pages, request.file_id)
+                if not any(text.strip() for text in page_texts):
+                    raise HTTPException(status_code=404, detail=QA_DOCUMENT_NOT_FOUND_DETAIL)
+                index = await pdf_pool.run(RetrievalIndex.build, page_texts)
+                await asyncio.to_thread(qa_index_store.put, request.file_id, index)
+        
+        # 같은 문서의 같은(또는 거의 같은) 질문에 대한 답변이 있으면 재사용
+        context_tokens = token_budget(settings.qa_context_token_budgets, settings.summary_model)
+        version = f"{index.fingerprint}:{settings.summary_model}:{context_tokens}"
+        with stage("cache"):
+            cached = answer_cache.get(request.file_id, version, request.question)
+        if cached is not None:
+            return PDFQAResponse(**cached)
+        
+        # 질문과 관련된 청크만 컨텍스트로 사용
+        with stage("retrieve"):
+            context = index.build_context(request.question, max_tokens=context_tokens)
         
         # OpenAI API를 사용하여 질문에 답변
-        response = openai_client.create_pdf_qa(
-            question=request.question,
-            context=pdf_text
-        )
+        with stage("llm"):
+            response = await llm_pool.run(
+                openai_client.create_pdf_qa,
+                question=request.question,
+                context=context,
+                model=settings.summary_model,
+                max_context_tokens=context_tokens
+            )
         
         # 응답 생성
         answer = response.choices[0].message.content
-        return PDFQAResponse(
+        result = PDFQAResponse(
             answer=answer,
-            context=pdf_text[:500] + "..." if len(pdf_text) > 500 else pdf_text
+            context=context[:500] + "..." if len(context) > 500 else context
         )
+        answer_cache.set(request.file_id, version, request.question, {"answer": result.answer, "context": result.context})
+        return result
     
+    except HTTPException:
+        raise
+    except PoolSaturatedError:
+        raise HTTPException(status_code=503, detail=SERVICE_BUSY_DETAIL)
+    except LLMUnavailableError:
+        raise HTTPException(status_code=503, detail=LLM_UNAVAILABLE_DETAIL)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        timer.finish() 
\ No newline at end of file
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import Dict, List
 from pydantic_settings import BaseSettings
 
 
@@ -15,16 +15,107 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     api_port: int = 8000
     debug: bool = True
+    startup_warm_up: str = "background"  # "background", "blocking" 또는 "off"
     
     # OpenAI Settings
     openai_api_key: str = ""
+    openai_base_url: str = ""  # 비워두면 기본 주소 (로컬 스텁 서버로 테스트할 때 지정)
+    summary_model: str = "gpt-3.5-turbo"
+    
+    # LLM Client Settings (요약/Q&A 공유 연결 풀, 재시도, 회로 차단기)
+    llm_timeout: float = 60.0  # 호출 하나의 제한 시간(초)
+    llm_connect_timeout: float = 5.0
+    llm_max_retries: int = 3  # 429/5xx/시간 초과 시 재시도 횟수
+    llm_backoff_base: float = 0.5  # 재시도 대기 시간 = 0 ~ base * 2^시도 (지터)
+    llm_backoff_max: float = 8.0
+    llm_max_connections: int = 100
+    llm_max_keepalive_connections: int = 20
+    llm_keepalive_expiry: float = 30.0
+    llm_circuit_failure_threshold: int = 5  # 연속으로 이만큼 실패하면 차단
+    llm_circuit_reset_timeout: float = 30.0  # 차단 후 시험 호출까지 대기 시간(초)
     
     # File Settings
     max_file_size: int = 5 * 1024 * 1024  # 5MB
+    upload_chunk_size: int = 1024 * 1024  # 업로드를 임시 파일로 옮길 때 한 번에 읽는 크기
+    upload_spool_dir: str = ""  # 비워두면 시스템 임시 폴더 사용
     max_pages: int = 3
+    download_dir: str = "downloads"
+    download_max_age: int = 24 * 3600  # 마지막 접근 후 이 시간이 지나면 삭제
+    download_max_bytes: int = 512 * 1024 * 1024  # 512MB (넘으면 오래전에 접근한 파일부터 삭제)
+    download_janitor_interval: int = 300
+    download_rescan_interval: int = 3600  # 폴더 전체를 다시 읽는 주기
+    
+    # Converter Font Settings (경로를 지정하면 matplotlib 폰트 탐색을 건너뜀)
+    korean_font_path: str = ""
+    korean_font_name: str = ""
+    
+    # Token Budget Settings (모델별 입력 토큰 예산)
+    tokenizer_encoding: str = "cl100k_base"
+    summary_input_token_budgets: Dict[str, int] = {
+        "default": 3000,
+        "gpt-3.5-turbo": 3000,
+        "gpt-4o-mini": 12000,
+    }
+    qa_context_token_budgets: Dict[str, int] = {
+        "default": 1500,
+        "gpt-3.5-turbo": 1500,
+        "gpt-4o-mini": 6000,
+    }
+    
+    # Full Document (Map-Reduce) Summary Settings
+    full_document_max_pages: int = 300
+    summary_map_concurrency: int = 4
+    
+    # Batch Summary Settings
+    batch_max_files: int = 10
+    batch_concurrency: int = 4  # 배치 하나가 동시에 처리하는 파일 수
+    
+    # Summary Cache Settings
+    summary_cache_dir: str = "cache/summaries"
+    summary_cache_max_bytes: int = 32 * 1024 * 1024  # 32MB (메모리 계층)
+    summary_cache_ttl: int = 7 * 24 * 3600  # 7일
+    summary_cache_disk_max_bytes: int = 256 * 1024 * 1024  # 256MB (디스크 계층, 부분 요약 포함)
+    
+    # Page Text Store Settings (Q&A용 페이지별 텍스트)
+    text_store_dir: str = "cache/page_text"
+    text_store_max_age: int = 7 * 24 * 3600  # 7일
+    text_store_max_pages: int = 1000
+    
+    # PDF Q&A Retrieval Settings
+    qa_index_dir: str = "cache/qa_index"
+    qa_index_max_cached: int = 32  # 메모리에 유지할 인덱스 수
+    qa_chunk_chars: int = 800
+    qa_top_k: int = 4
+    qa_answer_cache_max_entries: int = 2048
+    qa_answer_cache_per_file: int = 64  # 문서당 보관할 답변 수
+    qa_answer_similarity: float = 0.0  # 0이면 정규화한 질문이 같을 때만 재사용, 0보다 크면 문자 bigram 유사도로 비슷한 질문도 재사용
+    
+    # Worker Pool Settings
+    pdf_pool_kind: str = "process"  # "process" 또는 "thread"
+    pdf_pool_workers: int = 2
+    convert_pool_workers: int = 2
+    llm_max_concurrency: int = 8
+    pool_max_queue: int = 64  # 풀별 최대 대기 작업 수 (0이면 제한 없음)
+    page_extract_workers: int = 4  # 페이지 병렬 추출 작업자 수 (종류는 pdf_pool_kind를 따름)
+    page_extract_shard_pages: int = 16  # 작업자 하나에 한 번에 맡기는 페이지 수
+    page_cache_max_bytes: int = 64 * 1024 * 1024  # (문서 해시, 페이지)별 추출 텍스트 캐시 용량 (0이면 사용 안 함)
     
     # Rate Limiting
     daily_limit: int = 3
+    rate_limit_backend: str = "sqlite"  # "sqlite"(여러 worker 공유) 또는 "memory"(단일 프로세스)
+    rate_limit_db_path: str = "cache/rate_limit.db"
+    rate_limit_session_ttl: int = 2 * 24 * 3600  # 이 시간 동안 사용되지 않은 세션은 삭제
+    rate_limit_eviction_interval: int = 600
+    
+    # Job Queue Settings (비동기 요약 작업)
+    job_db_path: str = "cache/jobs.db"
+    job_dir: str = "cache/jobs"  # 작업이 끝날 때까지 업로드 PDF를 보관하는 폴더
+    job_workers: int = 2
+    job_max_queue: int = 100  # 최대 대기 작업 수 (0이면 제한 없음)
+    job_ttl: int = 24 * 3600  # 끝난 작업을 조회할 수 있는 기간
+    job_eviction_interval: int = 600
+    job_lease_seconds: int = 60  # 실행 중인 작업의 lease (이 시간 동안 연장되지 않으면 다른 프로세스가 다시 실행)
+    job_poll_interval: float = 1.0  # 다른 프로세스에 들어온 작업/취소 요청을 확인하는 간격(초)
     
     # CORS Settings
     allowed_origins: List[str] = [
@@ -0,0 +1,227 @@
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.security import SecurityUtils
+
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.,~…]+$")
+_WORD = re.compile(r"\w+")
+
+# 유사 질문 비교에서 한쪽에만 있으면 뜻이 달라지는 단어 (숫자와 함께 이런 단어가 다르면 재사용하지 않음)
+_NUMBER_WORDS = frozenset((
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen "
+    "sixteen seventeen eighteen nineteen twenty thirty forty fifty hundred thousand million "
+    "first second third fourth fifth sixth seventh eighth ninth tenth last once twice "
+    "ii iii iv vi vii viii ix"  # 한 글자(i, v, x)는 대명사 I 등과 구분할 수 없어 제외
+).split())
+_NEGATION_WORDS = frozenset((
+    "not no never none nor neither without cannot cant dont doesnt didnt isnt arent wasnt werent "
+    "wont shouldnt couldnt wouldnt except unless 안 못"
+).split())
+# 한국어는 어절에 조사가 붙으므로 단어 앞부분(수)이나 포함 여부(부정)로 확인
+_KOREAN_NUMBER_PREFIXES = ("하나", "둘", "셋", "넷", "다섯", "여섯", "일곱", "여덟", "아홉", "열", "첫", "두", "세", "네", "마지막")
+_KOREAN_NEGATIONS = ("않", "못", "없", "아니", "아닌", "말고", "제외")
+# 붙으면 뜻이 반대가 되는 영어 접두사 ("advantages"/"disadvantages", "possible"/"impossible")
+_NEGATING_PREFIXES = ("dis", "un", "in", "im", "il", "ir", "non", "mis", "anti")
+# 비교 전에 어절 끝에서 떼어 내는 조사 ('결론이'/'결론은' → '결론', 긴 것부터 확인)
+_KOREAN_PARTICLES = (
+    "에서는", "에서", "에게", "으로", "까지", "부터", "이란", "이랑",
+    "은", "는", "이", "가", "을", "를", "의", "에", "로", "와", "과", "도", "만", "란",
+)
+
+
+class AnswerCache:
+    """file_id별 Q&A 답변을 정규화한 질문으로 재사용하는 LRU 캐시
+
+    - 질문은 sanitize_input → NFKC → 대소문자 통일(casefold) → 끝의 물음표/마침표 제거로 정규화합니다.
+    - 기본값(similarity_threshold=0)은 정규화한 질문이 정확히 같을 때만 답변을 재사용합니다.
+    - similarity_threshold가 0보다 크면 문자 bigram Jaccard 유사도가 그 이상인 질문의 답변도 재사용합니다.
+      bigram은 어절마다(한국어는 끝의 조사를 뗀 뒤) 만들므로 '결론이 뭐야'와 '결론은 뭐야'는 같은 질문이 됩니다.
+      다만 한쪽에만 있는 단어 중 숫자/수 단어/부정어가 있거나, 한 단어가 다른 단어에 부정 접두사를 붙인 것이면
+      ("advantages"/"disadvantages") 다른 질문으로 봅니다.
+    - 항목마다 문서 버전(검색 인덱스 지문 등)을 저장하고, 버전이 바뀐 문서의 답변은 모두 버립니다.
+    - 전체 max_entries, 문서당 max_entries_per_file을 넘으면 가장 오래전에 사용한 답변부터 제거합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_entries_per_file: Optional[int] = None,
+        similarity_threshold: Optional[float] = None
+    ):
+        self.max_entries = max_entries or settings.qa_answer_cache_max_entries
+        self.max_entries_per_file = max_entries_per_file or settings.qa_answer_cache_per_file
+        self.similarity_threshold = (
+            similarity_threshold if similarity_threshold is not None else settings.qa_answer_similarity
+        )
+
+        # (file_id, 정규화한 질문) -> 답변 (전체 LRU 순서)
+        self._entries: "OrderedDict[Tuple[str, str], Dict]" = OrderedDict()
+        # file_id -> (문서 버전, 정규화한 질문 -> (bigram 집합, 단어 집합))
+        self._files: Dict[str, Tuple[str, Dict[str, Tuple[FrozenSet[str], FrozenSet[str]]]]] = {}
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "exact_hits": 0,
+            "near_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        """질문을 비교용 형태로 정규화합니다."""
+        text = unicodedata.normalize("NFKC", SecurityUtils.sanitize_input(question)).casefold()
+        return _TRAILING_PUNCTUATION.sub("", text)
+
+    @staticmethod
+    def _words(normalized: str) -> List[str]:
+        """질문을 단어로 나누고 한국어 어절 끝의 조사를 뗍니다."""
+        words = []
+        for word in _WORD.findall(normalized.replace("'", "").replace("’", "")):
+            if "가" <= word[-1] <= "힣":
+                for particle in _KOREAN_PARTICLES:
+                    # 남는 부분이 두 글자 이상일 때만 떼어 '차이', '나이' 같은 단어는 그대로 둠
+                    if word.endswith(particle) and len(word) - len(particle) >= 2:
+                        word = word[:-len(particle)]
+                        break
+            words.append(word)
+        return words
+
+    @classmethod
+    def _features(cls, normalized: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """(어절별 문자 bigram 집합, 단어 집합)을 반환합니다."""
+        words = cls._words(normalized)
+        bigrams = set()
+        for word in words:
+            if len(word) == 1:
+                bigrams.add(word)
+            else:
+                bigrams.update(word[i:i + 2] for i in range(len(word) - 1))
+        return frozenset(bigrams), frozenset(words)
+
+    @staticmethod
+    def _changes_meaning(word: str) -> bool:
+        """한쪽 질문에만 있을 때 질문의 뜻을 바꾸는 단어인지 확인합니다."""
+        if word in _NUMBER_WORDS or word in _NEGATION_WORDS or any(char.isdigit() for char in word):
+            return True
+        return word.startswith(_KOREAN_NUMBER_PREFIXES) or any(marker in word for marker in _KOREAN_NEGATIONS)
+
+    @classmethod
+    def _conflicts(cls, words: FrozenSet[str], candidate_words: FrozenSet[str]) -> bool:
+        only_here, only_there = words - candidate_words, candidate_words - words
+        if any(cls._changes_meaning(word) for word in only_here | only_there):
+            return True
+        # "advantages"/"disadvantages", "possible"/"impossible"처럼 접두사로 뜻이 바뀐 단어
+        # (복수형/축약형처럼 뒤에 붙은 것은 같은 단어로 봄)
+        return any(
+            longer[:-len(shorter)] in _NEGATING_PREFIXES and longer.endswith(shorter)
+            for a in only_here for b in only_there
+            for shorter, longer in ((a, b), (b, a))
+        )
+
+    def get(self, file_id: str, version: str, question: str) -> Optional[Dict]:
+        """캐시된 답변을 반환합니다. 없거나 문서 버전이 바뀌었으면 None을 반환합니다."""
+        normalized = self.normalize(question)
+        with self._lock:
+            file_entry = self._files.get(file_id)
+            if file_entry is None or file_entry[0] != version:
+                if file_entry is not None:
+                    self._invalidate(file_id)
+                self._stats["misses"] += 1
+                return None
+
+            questions = file_entry[1]
+            if normalized in questions:
+                self._stats["exact_hits"] += 1
+                return self._touch(file_id, normalized)
+
+            match = self._find_similar(questions, normalized)
+            if match is not None:
+                self._stats["near_hits"] += 1
+                return self._touch(file_id, match)
+
+            self._stats["misses"] += 1
+            return None
+
+    def set(self, file_id: str, version: str, question: str, value: Dict) -> None:
+        """답변을 저장합니다."""
+        normalized = self.normalize(question)
+        with self._lock:
+            file_entry = self._files.get(file_id)
+            if file_entry is not None and file_entry[0] != version:
+                self._invalidate(file_id)
+                file_entry = None
+            if file_entry is None:
+                file_entry = (version, {})
+                self._files[file_id] = file_entry
+
+            questions = file_entry[1]
+            questions[normalized] = self._features(normalized)
+            self._entries[(file_id, normalized)] = value
+            self._entries.move_to_end((file_id, normalized))
+
+            # 문서당 제한을 넘으면 그 문서에서 가장 오래전에 사용한 질문부터 제거
+            if len(questions) > self.max_entries_per_file:
+                for key in list(self._entries):
+                    if key[0] == file_id and key[1] != normalized:
+                        self._remove(key)
+                        break
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, file_id: str) -> None:
+        """문서의 답변을 모두 버립니다."""
+        with self._lock:
+            if file_id in self._files:
+                self._invalidate(file_id)
+
+    def stats(self) -> Dict:
+        """적중(정확/유사)/실패/제거 통계를 반환합니다."""
+        with self._lock:
+            hits = self._stats["exact_hits"] + self._stats["near_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "files": len(self._files),
+                "max_entries": self.max_entries,
+                "similarity_threshold": self.similarity_threshold,
+            }
+
+    def _find_similar(self, questions: Dict, normalized: str) -> Optional[str]:
+        """가장 비슷한 캐시된 질문을 찾습니다. (lock 보유 상태에서 호출)"""
+        if self.similarity_threshold <= 0:
+            return None
+        bigrams, words = self._features(normalized)
+        if not bigrams:
+            return None
+        best, best_score = None, self.similarity_threshold
+        for candidate, (candidate_bigrams, candidate_words) in questions.items():
+            score = len(bigrams & candidate_bigrams) / len(bigrams | candidate_bigrams)
+            if score >= best_score and not self._conflicts(words, candidate_words):
+                best, best_score = candidate, score
+        return best
+
+    def _touch(self, file_id: str, normalized: str) -> Dict:
+        self._entries.move_to_end((file_id, normalized))
+        return self._entries[(file_id, normalized)]
+
+    def _remove(self, key: Tuple[str, str]) -> None:
+        del self._entries[key]
+        file_id, normalized = key
+        questions = self._files[file_id][1]
+        del questions[normalized]
+        if not questions:
+            del self._files[file_id]
+        self._stats["evictions"] += 1
+
+    def _invalidate(self, file_id: str) -> None:
+        for normalized in self._files.pop(file_id)[1]:
+            del self._entries[(file_id, normalized)]
+        self._stats["invalidations"] += 1
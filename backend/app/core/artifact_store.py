@@ -0,0 +1,76 @@
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+import aiofiles
+import aiofiles.os
+
+from app.config import settings
+
+
+class ArtifactStore:
+    """변환 결과 파일을 내용 주소(해시) 기반 파일명으로 저장하는 클래스
+
+    파일명은 요약 텍스트, 형식, 렌더러 버전의 해시로 정해지므로
+    같은 요약을 다시 변환하면 렌더링 없이 기존 파일을 재사용하고,
+    같은 시각에 변환한 서로 다른 요약이 서로를 덮어쓰지 않습니다.
+    """
+
+    FILENAME_PREFIX = "summary_"
+    KEY_LENGTH = 32  # 해시 앞 128비트
+    _FILENAME_PATTERN = re.compile(rf"^{FILENAME_PREFIX}([0-9a-f]{{{KEY_LENGTH}}})\.[a-z]+$")
+
+    def __init__(self, base_dir: Optional[str] = None, janitor=None):
+        self.base_dir = base_dir or settings.download_dir
+        self.janitor = janitor  # DownloadJanitor가 주어지면 쓰기/재사용을 인덱스에 기록
+        self._stats = {"hits": 0, "writes": 0}
+        os.makedirs(self.base_dir, exist_ok=True)
+
+    @classmethod
+    def make_filename(cls, text: str, fmt: str, renderer_version: str) -> str:
+        """요약 텍스트/형식/렌더러 버전으로 파일명을 생성합니다."""
+        raw = f"{fmt}:{renderer_version}:{text}"
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:cls.KEY_LENGTH]
+        return f"{cls.FILENAME_PREFIX}{key}.{fmt}"
+
+    @classmethod
+    def content_hash(cls, filename: str) -> Optional[str]:
+        """내용 주소 기반 파일명이면 해시를, 아니면 None을 반환합니다."""
+        match = cls._FILENAME_PATTERN.match(filename)
+        return match.group(1) if match else None
+
+    def path(self, filename: str) -> str:
+        return os.path.join(self.base_dir, filename)
+
+    async def size(self, filename: str) -> Optional[int]:
+        """저장된 파일 크기를 반환합니다. 없으면 None을 반환합니다."""
+        try:
+            stat = await aiofiles.os.stat(self.path(filename))
+        except OSError:
+            return None
+        self._stats["hits"] += 1
+        if self.janitor is not None:
+            self.janitor.touch(filename)
+        return stat.st_size
+
+    async def read(self, filename: str) -> bytes:
+        """저장된 파일 내용을 비동기로 읽습니다."""
+        async with aiofiles.open(self.path(filename), "rb") as f:
+            return await f.read()
+
+    async def write(self, filename: str, content: bytes) -> None:
+        """파일을 비동기로 저장합니다. 임시 파일에 쓴 뒤 교체하므로 읽는 쪽은 완성된 파일만 봅니다."""
+        path = self.path(filename)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.{id(content)}.tmp"
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(content)
+        await aiofiles.os.replace(tmp_path, path)
+        self._stats["writes"] += 1
+        if self.janitor is not None:
+            self.janitor.record(filename, len(content))
+
+    def stats(self) -> Dict[str, int]:
+        """재사용/저장 횟수를 반환합니다."""
+        return dict(self._stats)
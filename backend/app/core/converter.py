@@ -1,65 +1,134 @@
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from reportlab.lib.pagesizes import A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+# python-docx / reportlab은 불러오는 비용이 커서 해당 형식으로 처음 변환할 때 불러옵니다.
 from io import BytesIO
-import tempfile
+from typing import Dict, List, Optional
+import html
 import os
-import platform
-import matplotlib.font_manager as fm
+import threading
+from app.config import settings
+
+
+REPORTLAB_FONT_NAME = 'KoreanFont'
+
+MEDIA_TYPES = {
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+    'pdf': 'application/pdf',
+    'txt': 'text/plain; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+}
+
+# 폰트 탐색/등록 결과는 프로세스 전역에서 한 번만 계산해 공유합니다.
+_font_lock = threading.Lock()
+_font_resolved = False
+_korean_font: Optional[Dict[str, str]] = None
+_font_registered = False
+
+
+def _configured_font() -> Optional[Dict[str, str]]:
+    """설정된 폰트 경로를 사용합니다. (matplotlib 없이 동작)"""
+    path = settings.korean_font_path
+    if not path or not os.path.exists(path):
+        return None
+    name = settings.korean_font_name or os.path.splitext(os.path.basename(path))[0]
+    return {'name': name, 'path': path}
+
+
+def _discover_korean_font() -> Optional[Dict[str, str]]:
+    """시스템에서 사용 가능한 한글 폰트를 찾습니다."""
+    try:
+        # matplotlib은 폰트 목록을 만드는 비용이 크므로 설정된 폰트가 없을 때만 불러옴
+        import matplotlib.font_manager as fm
+        
+        # 우선순위 폰트 목록
+        preferred_fonts = ['NanumGothic', 'Malgun Gothic', 'AppleGothic', 'Noto Sans CJK KR']
+        
+        available_fonts = {f.name: f.fname for f in fm.fontManager.ttflist}
+        
+        for font_name in preferred_fonts:
+            if font_name in available_fonts:
+                return {'name': font_name, 'path': available_fonts[font_name]}
+        
+        # 한글 폰트 검색
+        korean_fonts = {name: path for name, path in available_fonts.items() 
+                      if any(keyword in name.lower() for keyword in ['gothic', 'nanum', 'malgun'])}
+        
+        if korean_fonts:
+            font_name = list(korean_fonts.keys())[0]
+            return {'name': font_name, 'path': korean_fonts[font_name]}
+            
+        return None
+    except Exception:
+        return None
+
+
+def _register_korean_font(font: Optional[Dict[str, str]]) -> bool:
+    """reportlab에 한글 폰트 등록"""
+    try:
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        
+        if font and os.path.exists(font['path']):
+            pdfmetrics.registerFont(TTFont(REPORTLAB_FONT_NAME, font['path']))
+            return True
+    except Exception:
+        pass
+    return False
+
+
+def resolve_korean_font() -> Optional[Dict[str, str]]:
+    """한글 폰트를 찾아 reportlab에 등록합니다. 프로세스당 한 번만 실행되며 결과는 캐시됩니다."""
+    global _font_resolved, _korean_font, _font_registered
+    if _font_resolved:
+        return _korean_font
+    with _font_lock:
+        if not _font_resolved:
+            _korean_font = _configured_font() or _discover_korean_font()
+            _font_registered = _register_korean_font(_korean_font)
+            _font_resolved = True
+    return _korean_font
 
 
 class DocumentConverter:
     """문서 형식 변환을 담당하는 클래스"""
     
-    def __init__(self):
-        """한글 폰트 설정 초기화"""
-        self.korean_font = self._get_korean_font()
-        if self.korean_font:
-            self._register_korean_font()
+    # 변환 결과가 달라지도록 렌더링을 수정하면 버전을 올려 저장된 변환 파일을 무효화합니다.
+    RENDERER_VERSION = "1"
     
-    def _get_korean_font(self):
-        """시스템에서 사용 가능한 한글 폰트를 찾습니다."""
-        try:
-            # 우선순위 폰트 목록
-            preferred_fonts = ['NanumGothic', 'Malgun Gothic', 'AppleGothic', 'Noto Sans CJK KR']
-            
-            available_fonts = {f.name: f.fname for f in fm.fontManager.ttflist}
-            
-            for font_name in preferred_fonts:
-                if font_name in available_fonts:
-                    return {'name': font_name, 'path': available_fonts[font_name]}
-            
-            # 한글 폰트 검색
-            korean_fonts = {name: path for name, path in available_fonts.items() 
-                          if any(keyword in name.lower() for keyword in ['gothic', 'nanum', 'malgun'])}
-            
-            if korean_fonts:
-                font_name = list(korean_fonts.keys())[0]
-                return {'name': font_name, 'path': korean_fonts[font_name]}
-                
-            return None
-        except Exception:
-            return None
+    @property
+    def korean_font(self) -> Optional[Dict[str, str]]:
+        """한글 폰트 정보 (처음 사용할 때 한 번 탐색)"""
+        return resolve_korean_font()
     
-    def _register_korean_font(self):
-        """reportlab에 한글 폰트 등록"""
-        try:
-            if self.korean_font and os.path.exists(self.korean_font['path']):
-                pdfmetrics.registerFont(TTFont('KoreanFont', self.korean_font['path']))
-                return True
-        except Exception:
-            pass
-        return False
+    @property
+    def pdf_font_name(self) -> str:
+        """PDF 변환에 사용할 reportlab 폰트 이름"""
+        return REPORTLAB_FONT_NAME if resolve_korean_font() and _font_registered else 'Helvetica'
     
-    def to_docx(self, text: str) -> bytes:
+    def warm_up(self) -> None:
+        """변환 라이브러리를 불러오고 폰트 탐색과 등록을 미리 수행합니다. (앱 시작 시 호출)"""
+        import docx  # noqa: F401
+        import reportlab.platypus  # noqa: F401
+        resolve_korean_font()
+    
+    @staticmethod
+    def parse_paragraphs(text: str) -> List[str]:
+        """텍스트를 빈 줄 기준 문단으로 나눕니다. 여러 형식으로 변환할 때 한 번만 계산해 공유합니다."""
+        return [paragraph.strip() for paragraph in text.split('\n\n') if paragraph.strip()]
+    
+    def convert(self, text: str, fmt: str, paragraphs: Optional[List[str]] = None) -> bytes:
+        """텍스트를 지정된 형식(docx, pdf, txt, html)으로 변환합니다."""
+        if fmt not in MEDIA_TYPES:
+            raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+        if fmt == 'txt':
+            return self.to_txt(text)
+        return getattr(self, f"to_{fmt}")(text, paragraphs)
+    
+    def to_docx(self, text: str, paragraphs: Optional[List[str]] = None) -> bytes:
         """텍스트를 DOCX 형식으로 변환합니다."""
         try:
+            from docx import Document
+            from docx.shared import Pt
+            from docx.enum.text import WD_ALIGN_PARAGRAPH
+            
             doc = Document()
             
             # 제목 추가
@@ -67,28 +136,30 @@ class DocumentConverter:
             title.alignment = WD_ALIGN_PARAGRAPH.CENTER
             
             # 한글 폰트 설정
-            if self.korean_font:
-                title.runs[0].font.name = self.korean_font['name']
-                title.runs[0]._element.rPr.rFonts.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia', self.korean_font['name'])
+            korean_font = self.korean_font
+            if korean_font:
+                title.runs[0].font.name = korean_font['name']
+                title.runs[0]._element.rPr.rFonts.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia', korean_font['name'])
             
             # 텍스트를 문단별로 나누어 추가
-            paragraphs = text.split('\n\n')
+            if paragraphs is None:
+                paragraphs = self.parse_paragraphs(text)
             for paragraph in paragraphs:
-                if paragraph.strip():
-                    p = doc.add_paragraph(paragraph.strip())
+                if paragraph:
+                    p = doc.add_paragraph(paragraph)
                     # 한글 폰트 적용
-                    if self.korean_font:
+                    if korean_font:
                         for run in p.runs:
-                            run.font.name = self.korean_font['name']
+                            run.font.name = korean_font['name']
                             run.font.size = Pt(11)
-                            run._element.rPr.rFonts.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia', self.korean_font['name'])
+                            run._element.rPr.rFonts.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia', korean_font['name'])
                         
                         # 기본 run이 없는 경우를 위한 처리
                         if not p.runs:
                             run = p.runs[0] if p.runs else p.add_run()
-                            run.font.name = self.korean_font['name']
+                            run.font.name = korean_font['name']
                             run.font.size = Pt(11)
-                            run._element.rPr.rFonts.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia', self.korean_font['name'])
+                            run._element.rPr.rFonts.set('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}eastAsia', korean_font['name'])
             
             # BytesIO에 저장
             buffer = BytesIO()
@@ -99,9 +170,13 @@ class DocumentConverter:
         except Exception as e:
             raise ValueError(f"DOCX 변환 실패: {str(e)}")
     
-    def to_pdf(self, text: str) -> bytes:
+    def to_pdf(self, text: str, paragraphs: Optional[List[str]] = None) -> bytes:
         """텍스트를 PDF 형식으로 변환합니다."""
         try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            
             buffer = BytesIO()
             
             # PDF 문서 생성
@@ -118,7 +193,7 @@ class DocumentConverter:
             styles = getSampleStyleSheet()
             
             # 한글 폰트 설정
-            font_name = 'KoreanFont' if self.korean_font else 'Helvetica'
+            font_name = self.pdf_font_name
             
             title_style = ParagraphStyle(
                 'CustomTitle',
@@ -149,11 +224,12 @@ class DocumentConverter:
             story.append(Spacer(1, 12))
             
             # 본문 추가
-            paragraphs = text.split('\n\n')
+            if paragraphs is None:
+                paragraphs = self.parse_paragraphs(text)
             for paragraph in paragraphs:
-                if paragraph.strip():
+                if paragraph:
                     # HTML 특수문자 이스케이프
-                    clean_paragraph = paragraph.strip().replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+                    clean_paragraph = paragraph.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
                     story.append(Paragraph(clean_paragraph, normal_style))
                     story.append(Spacer(1, 6))
             
@@ -176,12 +252,13 @@ class DocumentConverter:
         except Exception as e:
             raise ValueError(f"TXT 변환 실패: {str(e)}")
     
-    def to_html(self, text: str) -> bytes:
+    def to_html(self, text: str, paragraphs: Optional[List[str]] = None) -> bytes:
         """텍스트를 HTML 형식으로 변환합니다. (추가 기능)"""
         try:
-            # 문단 분리
-            paragraphs = text.split('\n\n')
-            paragraph_html = ''.join(f'<p>{paragraph.strip()}</p>' for paragraph in paragraphs if paragraph.strip())
+            # 문단 분리 (요약 텍스트가 태그로 해석되지 않도록 이스케이프)
+            if paragraphs is None:
+                paragraphs = self.parse_paragraphs(text)
+            paragraph_html = ''.join(f'<p>{html.escape(paragraph)}</p>' for paragraph in paragraphs if paragraph)
             
             html_template = f"""<!DOCTYPE html>
 <html lang="ko">
@@ -0,0 +1,141 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+class DownloadJanitor:
+    """다운로드 폴더의 파일을 메모리 인덱스로 추적하며 오래되었거나 용량을 넘는 파일을 지우는 클래스
+
+    인덱스는 파일명 -> [크기, 마지막 접근 시각]이며 마지막 접근 순서(LRU)로 정렬되어 있습니다.
+    주기적인 정리(sweep)는 인덱스 앞쪽만 보므로 파일 수와 관계없이 지운 파일 수만큼만 일합니다.
+        - max_age_seconds 동안 접근되지 않은 파일을 삭제
+        - 전체 크기가 max_bytes를 넘으면 가장 오래전에 접근한 파일부터 삭제
+    인덱스 밖에서 생긴 파일은 rescan_interval마다 폴더를 다시 읽어 반영합니다.
+    """
+
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_age_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        rescan_interval: Optional[int] = None
+    ):
+        self.directory = directory or settings.download_dir
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else settings.download_max_age
+        self.max_bytes = max_bytes if max_bytes is not None else settings.download_max_bytes
+        self.rescan_interval = rescan_interval if rescan_interval is not None else settings.download_rescan_interval
+
+        self._index: "OrderedDict[str, list]" = OrderedDict()
+        self._total_bytes = 0
+        self._last_rescan = 0.0
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "sweeps": 0,
+            "rescans": 0,
+            "expired_files": 0,
+            "quota_evicted_files": 0,
+            "reclaimed_bytes": 0,
+            "last_sweep_ms": 0.0,
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def rescan(self) -> int:
+        """폴더를 읽어 인덱스를 다시 만들고 추적 중인 파일 수를 반환합니다."""
+        entries = []
+        now = time.time()
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                # 쓰는 중인 임시 파일은 오래 남아 있을 때만 정리 대상으로 삼음
+                if entry.name.endswith(self.TMP_SUFFIX) and now - stat.st_mtime < self.max_age_seconds:
+                    continue
+                entries.append((entry.name, stat.st_size, max(stat.st_atime, stat.st_mtime)))
+
+        with self._lock:
+            # 인덱스가 더 최근 접근 시각을 알고 있으면 유지 (noatime 마운트 대비)
+            entries = sorted(
+                ((name, size, max(accessed_at, self._index[name][1] if name in self._index else 0.0))
+                 for name, size, accessed_at in entries),
+                key=lambda item: item[2]
+            )
+            self._index = OrderedDict((name, [size, accessed_at]) for name, size, accessed_at in entries)
+            self._total_bytes = sum(size for _, size, _ in entries)
+            self._last_rescan = now
+            self._stats["rescans"] += 1
+            return len(self._index)
+
+    def record(self, filename: str, size: int) -> None:
+        """새로 쓴 파일을 인덱스에 추가합니다."""
+        with self._lock:
+            previous = self._index.pop(filename, None)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._index[filename] = [size, time.time()]
+            self._total_bytes += size
+
+    def touch(self, filename: str) -> None:
+        """파일이 사용(재사용/다운로드)되었음을 기록해 LRU 순서를 갱신합니다."""
+        with self._lock:
+            entry = self._index.get(filename)
+            if entry is not None:
+                entry[1] = time.time()
+                self._index.move_to_end(filename)
+
+    def sweep(self) -> int:
+        """만료되었거나 용량을 넘는 파일을 삭제하고 회수한 바이트 수를 반환합니다."""
+        started = time.perf_counter()
+        now = time.time()
+        if now - self._last_rescan >= self.rescan_interval:
+            self.rescan()
+
+        victims = []
+        with self._lock:
+            while self._index:
+                filename, (size, accessed_at) = next(iter(self._index.items()))
+                if now - accessed_at > self.max_age_seconds:
+                    reason = "expired_files"
+                elif self._total_bytes > self.max_bytes:
+                    reason = "quota_evicted_files"
+                else:
+                    break
+                del self._index[filename]
+                self._total_bytes -= size
+                victims.append((filename, size, reason))
+
+        reclaimed = 0
+        for filename, size, reason in victims:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError:
+                continue  # 이미 지워진 파일은 인덱스에서만 제거
+            reclaimed += size
+            self._stats[reason] += 1
+
+        self._stats["reclaimed_bytes"] += reclaimed
+        self._stats["sweeps"] += 1
+        self._stats["last_sweep_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return reclaimed
+
+    def stats(self) -> Dict:
+        """추적 중인 파일 수/크기와 정리 통계를 반환합니다."""
+        with self._lock:
+            return {
+                "files": len(self._index),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                **self._stats,
+            }
@@ -0,0 +1,507 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class JobStatus:
+    """작업 상태"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueueFullError(Exception):
+    """대기 중인 작업 수가 max_depth에 도달했을 때 발생하는 예외"""
+
+
+class JobFailedError(Exception):
+    """작업 처리기가 실패를 응답 코드와 함께 알릴 때 사용하는 예외"""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+class JobStore:
+    """작업 상태를 저장하는 SQLite(WAL) 저장소 (서버를 다시 시작해도 대기 중인 작업이 남음)
+
+    여러 worker 프로세스가 같은 DB를 공유하므로 대기열 자체가 이 테이블입니다.
+    - claim(): 대기 중인 작업 하나를 UPDATE ... RETURNING 한 문장으로 가져가 owner/lease_until을 기록
+    - 실행 중인 작업은 owner가 주기적으로 lease를 연장하고, lease가 지난 작업만 다른 프로세스가 다시 대기열에 넣음
+    - 다른 프로세스가 실행 중인 작업의 취소는 cancel_requested 표시로 요청하고 owner가 확인해 중단
+    모든 메서드는 블로킹이므로 이벤트 루프에서는 asyncio.to_thread로 호출합니다.
+    """
+
+    _JSON_FIELDS = ("payload", "result")
+    # 이전 버전 DB에 없던 열 (시작 시 추가)
+    _MIGRATIONS = {
+        "owner": "TEXT",
+        "lease_until": "REAL",
+        "cancel_requested": "INTEGER NOT NULL DEFAULT 0",
+    }
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or settings.job_db_path
+        self._local = threading.local()
+        # DB 파일과 테이블은 처음 연결할 때 만듦 (모듈을 import하기만 해도 cache/ 폴더가 생기지 않도록)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _ensure_schema(self) -> None:
+        """DB 폴더와 테이블을 한 번만 만들고 이전 버전 DB에 없는 열을 추가합니다."""
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            try:
+                self._create_schema(conn)
+            finally:
+                conn.close()
+            self._schema_ready = True
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                stage TEXT,
+                result TEXT,
+                error TEXT,
+                status_code INTEGER,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                owner TEXT,
+                lease_until REAL,
+                cancel_requested INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}  # (cid, name, ...)
+        for column, definition in self._MIGRATIONS.items():
+            if column not in columns:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, finished_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_queue ON jobs(status, priority DESC, created_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결을 반환합니다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._ensure_schema()
+            # isolation_level=None: 각 문장이 자체 트랜잭션으로 즉시 커밋됨
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _to_job(self, row: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if row is None:
+            return None
+        job = dict(row)
+        for field in self._JSON_FIELDS:
+            job[field] = json.loads(job[field]) if job[field] is not None else None
+        return job
+
+    def create(self, job: Dict) -> Dict:
+        row = self._connection().execute(
+            "INSERT INTO jobs (job_id, kind, status, priority, payload, created_at) VALUES (?, ?, ?, ?, ?, ?) RETURNING *",
+            (job["job_id"], job["kind"], job["status"], job["priority"], json.dumps(job["payload"]), job["created_at"])
+        ).fetchone()
+        return self._to_job(row)
+
+    def update_owned(self, job_id: str, owner: str, **fields) -> bool:
+        """owner가 실행 중인 작업만 갱신합니다. lease를 잃었거나(다른 프로세스가 다시 가져감) 이미 끝났으면 False"""
+        for field in self._JSON_FIELDS:
+            if field in fields:
+                fields[field] = json.dumps(fields[field], ensure_ascii=False)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        cursor = self._connection().execute(
+            f"UPDATE jobs SET {assignments} WHERE job_id = ? AND owner = ? AND status = ?",
+            (*fields.values(), job_id, owner, JobStatus.RUNNING)
+        )
+        return cursor.rowcount > 0
+
+    def finish(self, job_id: str, owner: str, **fields) -> bool:
+        """owner가 lease를 가진 실행 중 작업을 끝난 상태(fields의 status 등)로 기록합니다.
+
+        lease를 잃어 다른 프로세스가 다시 가져간 작업이면 기록하지 않고 False를 반환하며,
+        이때는 그 프로세스가 입력 파일을 쓰고 있으므로 지우면 안 됩니다.
+        """
+        return self.update_owned(job_id, owner, finished_at=time.time(), lease_until=None, **fields)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._connection().execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_job(row)
+
+    def claim(self, owner: str, lease_seconds: float) -> Optional[Dict]:
+        """우선순위가 가장 높은(같으면 먼저 들어온) 대기 작업을 owner 소유의 실행 중 작업으로 바꿔 반환합니다."""
+        now = time.time()
+        row = self._connection().execute(
+            """
+            UPDATE jobs SET status = ?, owner = ?, lease_until = ?, started_at = ?, stage = 'started'
+            WHERE job_id = (
+                SELECT job_id FROM jobs WHERE status = ? ORDER BY priority DESC, created_at LIMIT 1
+            ) AND status = ?
+            RETURNING *
+            """,
+            (JobStatus.RUNNING, owner, now + lease_seconds, now, JobStatus.QUEUED, JobStatus.QUEUED)
+        ).fetchone()
+        return self._to_job(row)
+
+    def renew(self, owner: str, job_ids: List[str], lease_seconds: float) -> List[str]:
+        """owner가 실제로 실행 중인 작업(job_ids)의 lease만 연장하고, 그중 취소가 요청된 작업 ID를 반환합니다.
+
+        끝났다고 기록하지 못한 작업은 job_ids에 없으므로 lease가 지나 다른 프로세스가 다시 실행합니다.
+        """
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" for _ in job_ids)
+        rows = self._connection().execute(
+            f"UPDATE jobs SET lease_until = ? WHERE owner = ? AND status = ? AND job_id IN ({placeholders}) "
+            "RETURNING job_id, cancel_requested",
+            (time.time() + lease_seconds, owner, JobStatus.RUNNING, *job_ids)
+        ).fetchall()
+        return [row["job_id"] for row in rows if row["cancel_requested"]]
+
+    def requeue_expired(self) -> int:
+        """lease가 지난 실행 중 작업(실행하던 프로세스가 멈춤)을 처음부터 다시 실행하도록 대기열에 넣습니다.
+
+        실행 중에 취소가 요청되었던 작업은 다시 실행하지 않고 취소로 끝냅니다.
+        """
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "UPDATE jobs SET status = ?, stage = 'cancelled', owner = NULL, lease_until = NULL, finished_at = ? "
+            "WHERE status = ? AND cancel_requested = 1 AND (lease_until IS NULL OR lease_until < ?)",
+            (JobStatus.CANCELLED, now, JobStatus.RUNNING, now)
+        )
+        cursor = conn.execute(
+            "UPDATE jobs SET status = ?, progress = 0, stage = NULL, started_at = NULL, owner = NULL, lease_until = NULL "
+            "WHERE status = ? AND (lease_until IS NULL OR lease_until < ?)",
+            (JobStatus.QUEUED, JobStatus.RUNNING, now)
+        )
+        return cursor.rowcount
+
+    def release(self, owner: str) -> int:
+        """종료하는 owner가 실행 중이던 작업을 다른 프로세스나 다음 시작 때 바로 실행하도록 대기열로 돌려놓습니다."""
+        cursor = self._connection().execute(
+            "UPDATE jobs SET status = ?, progress = 0, stage = NULL, started_at = NULL, owner = NULL, lease_until = NULL "
+            "WHERE owner = ? AND status = ?",
+            (JobStatus.QUEUED, owner, JobStatus.RUNNING)
+        )
+        return cursor.rowcount
+
+    def cancel_queued(self, job_id: str) -> Optional[Dict]:
+        """대기 중인 작업을 취소하고 반환합니다. 대기 중이 아니면(이미 누가 가져감) None"""
+        row = self._connection().execute(
+            "UPDATE jobs SET status = ?, stage = 'cancelled', finished_at = ?, cancel_requested = 1 "
+            "WHERE job_id = ? AND status = ? RETURNING *",
+            (JobStatus.CANCELLED, time.time(), job_id, JobStatus.QUEUED)
+        ).fetchone()
+        return self._to_job(row)
+
+    def request_cancel(self, job_id: str) -> Optional[Dict]:
+        """실행 중인 작업에 취소 요청을 표시하고 반환합니다. 실행 중이 아니면 None"""
+        row = self._connection().execute(
+            "UPDATE jobs SET cancel_requested = 1, stage = 'cancelling' WHERE job_id = ? AND status = ? RETURNING *",
+            (job_id, JobStatus.RUNNING)
+        ).fetchone()
+        return self._to_job(row)
+
+    def delete_finished(self, older_than: float) -> List[Dict]:
+        """older_than(타임스탬프) 이전에 끝난 작업을 삭제하고 삭제한 작업을 반환합니다."""
+        conn = self._connection()
+        placeholders = ", ".join("?" for _ in JobStatus.FINISHED)
+        rows = conn.execute(
+            f"DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ? RETURNING *",
+            (*JobStatus.FINISHED, older_than)
+        ).fetchall()
+        return [self._to_job(row) for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        rows = self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+JobHandler = Callable[[Dict, Callable[[float, str], None]], Awaitable[Dict]]
+
+
+class JobQueue:
+    """우선순위/취소/진행률을 지원하는 비동기 작업 큐 (여러 worker 프로세스가 같은 JobStore를 공유)
+
+    - submit()은 작업을 저장하고 바로 반환하며, 각 프로세스의 workers개 작업자가 저장소에서
+      priority가 높은 순(같으면 먼저 들어온 순)으로 작업을 하나씩 가져가(claim) 처리합니다.
+    - 처리기는 register(kind, handler)로 등록하며 handler(job, report)는 결과 딕셔너리를 반환합니다.
+      report(progress, stage)로 진행률(0~1)과 단계를 알리면 저장소와 구독자(subscribe)에게 전달됩니다.
+    - 실행 중인 작업은 lease를 주기적으로 연장하고, 프로세스가 멈춰 lease가 지난 작업만 다시 실행합니다.
+    - 취소는 저장소에 표시하므로 어느 프로세스로 요청이 와도 작업을 실행 중인 프로세스가 중단합니다.
+    - payload의 input_path 파일은 작업이 끝났다고 기록한 뒤(성공/실패/취소) 삭제하므로 처리기는 지우지 않습니다.
+    - SQLite 호출은 모두 asyncio.to_thread로 이벤트 루프 밖에서 실행합니다.
+    """
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        workers: Optional[int] = None,
+        max_depth: Optional[int] = None
+    ):
+        self.store = store or JobStore()
+        self.workers = max(1, workers or settings.job_workers)
+        self.max_depth = max_depth if max_depth is not None else settings.job_max_queue
+        self.lease_seconds = settings.job_lease_seconds
+        self.poll_interval = settings.job_poll_interval
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._wake: Optional[asyncio.Event] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._running: Dict[str, asyncio.Task] = {}
+        self._progress_writers: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: Set[str] = set()
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._counts: Dict[str, int] = {}
+        self._last_eviction = 0.0
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """작업 종류별 처리기를 등록합니다."""
+        self._handlers[kind] = handler
+
+    async def start(self) -> int:
+        """작업자를 시작하고, lease가 지나 다시 대기열에 넣은 작업 수를 반환합니다."""
+        self._wake = asyncio.Event()
+        await asyncio.to_thread(self._evict_finished)
+        recovered = await asyncio.to_thread(self.store.requeue_expired)
+        self._counts = await asyncio.to_thread(self.store.counts)
+
+        self._worker_tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+        self._maintenance_task = asyncio.create_task(self._maintain())
+        return recovered
+
+    async def stop(self) -> None:
+        """작업자를 멈추고, 실행 중이던 작업은 대기열로 돌려놓아 다른 프로세스나 다음 시작 때 다시 실행되게 합니다."""
+        tasks = self._worker_tasks + ([self._maintenance_task] if self._maintenance_task else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._maintenance_task = None
+        await asyncio.to_thread(self.store.release, self.owner)
+
+    async def submit(self, kind: str, payload: Dict, priority: int = 0) -> Dict:
+        """작업을 저장하고 작업 정보를 반환합니다."""
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 작업 종류입니다: {kind}")
+        if self.max_depth:
+            counts = await asyncio.to_thread(self.store.counts)
+            if counts.get(JobStatus.QUEUED, 0) >= self.max_depth:
+                raise JobQueueFullError("작업 대기열이 가득 찼습니다.")
+
+        job = await asyncio.to_thread(self.store.create, {
+            "job_id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": JobStatus.QUEUED,
+            "priority": priority,
+            "payload": payload,
+            "created_at": time.time(),
+        })
+        if self._wake is not None:
+            self._wake.set()
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    async def cancel(self, job_id: str) -> Optional[Dict]:
+        """작업을 취소합니다. 대기 중이면 바로 취소하고, 실행 중이면 실행 중인 프로세스가 처리기를 중단시킵니다."""
+        job = await asyncio.to_thread(self.store.cancel_queued, job_id)
+        if job is not None:
+            self._remove_input(job)
+            await self._notify(job_id)
+            return job
+
+        job = await asyncio.to_thread(self.store.request_cancel, job_id)
+        if job is not None:
+            if job["owner"] == self.owner:
+                self._cancel_local(job_id)
+            # 다른 프로세스의 작업은 그 프로세스가 lease를 연장할 때 취소 표시를 보고 중단
+            await self._notify(job_id)
+            return job
+
+        # 없거나 이미 끝난 작업
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """작업 상태가 바뀔 때마다 작업 정보를 받는 큐를 반환합니다. (이 프로세스에서 일어난 변경만 전달)"""
+        updates: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(updates)
+        return updates
+
+    def unsubscribe(self, job_id: str, updates: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if subscribers is not None:
+            subscribers.discard(updates)
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def stats(self) -> Dict:
+        """대기/실행 중 작업 수와 상태별 작업 수를 반환합니다. (상태별 수는 poll_interval마다 갱신한 값)"""
+        return {
+            "owner": self.owner,
+            "workers": self.workers,
+            "max_depth": self.max_depth,
+            "queue_depth": self._counts.get(JobStatus.QUEUED, 0),
+            "running": len(self._running),
+            "jobs": dict(self._counts),
+        }
+
+    async def _work(self) -> None:
+        failures = 0
+        while True:
+            try:
+                job = await asyncio.to_thread(self.store.claim, self.owner, self.lease_seconds)
+            except Exception:
+                # 다른 worker와 경합해 "database is locked" 등이 나도 작업자가 끝나지 않도록 기록하고 잠시 후 다시 시도
+                failures += 1
+                logger.exception("작업 가져오기 실패 (%d회 연속)", failures)
+                await asyncio.sleep(min(self.poll_interval * 2 ** min(failures, 6), self.lease_seconds / 2))
+                continue
+            failures = 0
+            if job is None:
+                # 다른 프로세스에 들어온 작업이나 lease가 지난 작업도 가져가도록 일정 간격으로 다시 확인
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            try:
+                await self._run(job)
+            except Exception:
+                # 끝났다고 기록하지 못한 작업은 lease를 연장하지 않으므로 lease가 지나면 다시 실행됨
+                logger.exception("작업 처리 실패 (%s)", job["job_id"])
+
+    async def _maintain(self) -> None:
+        """lease 연장, 다른 프로세스에서 온 취소 요청 확인, lease가 지난 작업 회수, 끝난 작업 정리"""
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                if self._running:
+                    cancelled = await asyncio.to_thread(self.store.renew, self.owner, list(self._running), self.lease_seconds)
+                    for job_id in cancelled:
+                        self._cancel_local(job_id)
+                if await asyncio.to_thread(self.store.requeue_expired):
+                    self._wake.set()
+                if time.time() - self._last_eviction >= settings.job_eviction_interval:
+                    await asyncio.to_thread(self._evict_finished)
+                self._counts = await asyncio.to_thread(self.store.counts)
+            except Exception:
+                # 어떤 오류가 나도 멈추면 실행 중인 작업의 lease가 끊겨 다른 프로세스가 다시 실행하므로 계속 반복
+                logger.exception("작업 큐 유지 작업 실패")
+
+    def _cancel_local(self, job_id: str) -> None:
+        task = self._running.get(job_id)
+        if task is not None and job_id not in self._cancel_requested:
+            # 작업자가 CancelledError를 받아 cancelled로 기록
+            self._cancel_requested.add(job_id)
+            task.cancel()
+
+    async def _run(self, job: Dict) -> None:
+        job_id = job["job_id"]
+        await self._notify(job_id)
+        state = {"progress": 0.0, "stage": "started", "version": 0}
+
+        def report(progress: float, stage: str) -> None:
+            # 처리기는 동기적으로 호출하므로 마지막 값만 순서대로 저장하는 작업 하나로 모아 기록
+            state.update(progress=min(max(progress, 0.0), 1.0), stage=stage, version=state["version"] + 1)
+            if job_id not in self._progress_writers:
+                self._progress_writers[job_id] = asyncio.create_task(self._write_progress(job_id, state))
+
+        task = asyncio.create_task(self._handlers[job["kind"]](job, report))
+        self._running[job_id] = task
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job_id not in self._cancel_requested:
+                raise  # 서버 종료: stop()이 대기열로 돌려놓음
+            await self._finish(job, status=JobStatus.CANCELLED, stage="cancelled")
+        except JobFailedError as e:
+            await self._finish(job, status=JobStatus.FAILED, stage="failed", error=e.detail, status_code=e.status_code)
+        except Exception as e:
+            await self._finish(job, status=JobStatus.FAILED, stage="failed", error=str(e), status_code=500)
+        else:
+            await self._finish(job, status=JobStatus.SUCCEEDED, stage="done", progress=1.0, result=result, status_code=200)
+        finally:
+            self._running.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+
+    async def _write_progress(self, job_id: str, state: Dict) -> None:
+        try:
+            while True:
+                version = state["version"]
+                await asyncio.to_thread(
+                    self.store.update_owned, job_id, self.owner, progress=state["progress"], stage=state["stage"]
+                )
+                await self._notify(job_id)
+                if state["version"] == version:
+                    return
+        finally:
+            self._progress_writers.pop(job_id, None)
+
+    async def _finish(self, job: Dict, **fields) -> None:
+        writer = self._progress_writers.get(job["job_id"])
+        if writer is not None:
+            await asyncio.gather(writer, return_exceptions=True)
+        finished = await asyncio.to_thread(self.store.finish, job["job_id"], self.owner, **fields)
+        if not finished:
+            # lease를 잃어 다른 프로세스가 다시 가져간 작업: 결과를 덮어쓰거나 입력 파일을 지우지 않음
+            return
+        self._remove_input(job)
+        await self._notify(job["job_id"])
+
+    @staticmethod
+    def _remove_input(job: Dict) -> None:
+        input_path = (job.get("payload") or {}).get("input_path")
+        if input_path:
+            try:
+                os.remove(input_path)
+            except OSError:
+                pass
+
+    async def _notify(self, job_id: str) -> None:
+        subscribers = self._subscribers.get(job_id)
+        if not subscribers:
+            return
+        job = await asyncio.to_thread(self.store.get, job_id)
+        for updates in list(subscribers):
+            updates.put_nowait(job)
+
+    def _evict_finished(self) -> None:
+        """job_ttl보다 오래전에 끝난 작업을 정리합니다. (블로킹, 스레드에서 호출)"""
+        self._last_eviction = time.time()
+        for job in self.store.delete_finished(self._last_eviction - settings.job_ttl):
+            self._remove_input(job)
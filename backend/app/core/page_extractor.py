@@ -0,0 +1,302 @@
+import asyncio
+import functools
+import multiprocessing
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.core.pdf_processor import PDFDocument
+
+def _open_document(path: str):
+    """작업자에서 문서를 엽니다.
+
+    작업이 끝나면 업로드 임시 파일이 지워지므로 작업자에 문서를 열어 두지 않고 구간마다 열고 닫습니다.
+    (열어 두면 Linux에서는 지운 파일의 디스크 공간이 반환되지 않고 Windows에서는 파일을 지울 수 없음)
+    """
+    import fitz  # PyMuPDF (무거운 모듈이므로 작업자에서 처음 열 때 불러옴)
+
+    return fitz.open(path, filetype="pdf")
+
+
+def _inspect_document(path: str) -> Tuple[int, Dict[str, str]]:
+    """페이지 수와 메타데이터를 반환합니다. (작업자에서 실행)"""
+    with _open_document(path) as doc:
+        return len(doc), {key: value for key, value in (doc.metadata or {}).items() if value}
+
+
+def _extract_range(path: str, start: int, end: int) -> List[str]:
+    """[start, end) 페이지의 텍스트를 추출합니다. (작업자에서 실행)"""
+    with _open_document(path) as doc:
+        return [doc[page_num].get_text() for page_num in range(start, end)]
+
+
+def _warm_up_worker() -> None:
+    import fitz  # noqa: F401
+
+
+class PageTextCache:
+    """(문서 해시, 페이지 번호)별 추출 텍스트를 보관하는 LRU 캐시 (UTF-8 바이트 기준 용량 제한)
+
+    문서별 페이지 수/메타데이터도 함께 보관하여 같은 문서를 다시 요청하면 PDF를 열지 않습니다.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, max_documents: int = 256):
+        self.max_bytes = max_bytes if max_bytes is not None else settings.page_cache_max_bytes
+        self.max_documents = max_documents
+
+        self._pages: "OrderedDict[Tuple[str, int], Tuple[str, int]]" = OrderedDict()
+        self._documents: "OrderedDict[str, Tuple[int, Dict[str, str]]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+        }
+
+    def get_info(self, doc_hash: str) -> Optional[Tuple[int, Dict[str, str]]]:
+        """문서의 (페이지 수, 메타데이터)를 반환합니다."""
+        with self._lock:
+            info = self._documents.get(doc_hash)
+            if info is not None:
+                self._documents.move_to_end(doc_hash)
+            return info
+
+    def set_info(self, doc_hash: str, page_count: int, metadata: Dict[str, str]) -> None:
+        """문서의 페이지 수와 메타데이터를 저장합니다."""
+        with self._lock:
+            self._documents[doc_hash] = (page_count, metadata)
+            self._documents.move_to_end(doc_hash)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def get_range(self, doc_hash: str, start: int, end: int) -> Optional[List[str]]:
+        """[start, end) 페이지가 모두 캐시되어 있으면 텍스트 목록을, 하나라도 없으면 None을 반환합니다."""
+        with self._lock:
+            texts = []
+            for page_index in range(start, end):
+                entry = self._pages.get((doc_hash, page_index))
+                if entry is None:
+                    self._stats["misses"] += end - start
+                    return None
+                texts.append(entry[0])
+            for page_index in range(start, end):
+                self._pages.move_to_end((doc_hash, page_index))
+            self._stats["hits"] += end - start
+            return texts
+
+    def put_range(self, doc_hash: str, start: int, texts: List[str]) -> None:
+        """start부터 이어지는 페이지 텍스트를 저장합니다."""
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            for offset, text in enumerate(texts):
+                key = (doc_hash, start + offset)
+                size = len(text.encode("utf-8"))
+                previous = self._pages.pop(key, None)
+                if previous is not None:
+                    self._bytes -= previous[1]
+                self._pages[key] = (text, size)
+                self._bytes += size
+            while self._bytes > self.max_bytes and self._pages:
+                _, (_, size) = self._pages.popitem(last=False)
+                self._bytes -= size
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict:
+        """적중/실패 페이지 수와 사용 용량을 반환합니다."""
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+                "pages": len(self._pages),
+                "documents": len(self._documents),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+class PageExtractor:
+    """큰 PDF의 페이지를 구간(shard)으로 나누어 여러 작업자에서 병렬로 추출하는 클래스
+
+    - 구간마다 shard_pages개의 페이지를 작업자에 보내고, 작업자는 구간마다 문서를 열어 추출한 뒤 닫습니다.
+    - iter_pages()는 앞 페이지부터 순서대로, 구간 추출이 끝나는 대로 (페이지 번호, 텍스트)를 내보냅니다.
+      한 번에 작업자 수의 두 배 구간만 제출하므로 소비하는 쪽이 느리면 추출도 그만큼만 앞서 갑니다.
+    - 추출한 페이지 텍스트는 (문서 해시, 페이지 번호)로 PageTextCache에 저장하여 다시 추출하지 않습니다.
+
+    kind는 WorkerPool과 같이 "process"(spawn) 또는 "thread"입니다.
+    """
+
+    KINDS = ("process", "thread")
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        kind: Optional[str] = None,
+        shard_pages: Optional[int] = None,
+        cache: Optional[PageTextCache] = None
+    ):
+        self.kind = kind or settings.pdf_pool_kind
+        if self.kind not in self.KINDS:
+            raise ValueError(f"지원하지 않는 작업자 종류입니다: {self.kind}")
+
+        self.max_workers = max(1, max_workers or settings.page_extract_workers)
+        self.shard_pages = max(1, shard_pages or settings.page_extract_shard_pages)
+        self.cache = cache or PageTextCache()
+
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "documents": 0,
+            "shards": 0,
+            "cached_shards": 0,
+            "pages": 0,
+        }
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # 스레드가 있는 서버 프로세스에서 fork하지 않도록 spawn 사용
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="page-extract"
+                    )
+            return self._executor
+
+    async def _run(self, func: Callable, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+
+    def warm_up(self) -> None:
+        """작업자를 모두 띄우고 PyMuPDF를 미리 불러옵니다. (동기 함수, 시작 시 스레드에서 호출)"""
+        executor = self._get_executor()
+        for future in [executor.submit(_warm_up_worker) for _ in range(self.max_workers)]:
+            future.result()
+
+    async def inspect(self, path: str, doc_hash: str) -> Tuple[int, Dict[str, str]]:
+        """문서의 (페이지 수, 메타데이터)를 반환합니다. 열 수 없는 문서면 ValueError가 발생합니다."""
+        info = self.cache.get_info(doc_hash)
+        if info is not None:
+            return info
+
+        try:
+            page_count, metadata = await self._run(_inspect_document, path)
+        except Exception as e:
+            raise ValueError(str(e))
+        self.cache.set_info(doc_hash, page_count, metadata)
+        return page_count, metadata
+
+    async def iter_pages(
+        self,
+        path: str,
+        doc_hash: str,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, str]]:
+        """[start, end) 페이지의 (페이지 번호, 텍스트)를 앞 페이지부터 추출되는 대로 내보냅니다."""
+        page_count, _ = await self.inspect(path, doc_hash)
+        end = page_count if end is None else min(end, page_count)
+        shards = iter([
+            (shard_start, min(shard_start + self.shard_pages, end))
+            for shard_start in range(max(0, start), end, self.shard_pages)
+        ])
+        self._stats["documents"] += 1
+
+        loop = asyncio.get_running_loop()
+
+        def submit(shard: Tuple[int, int]) -> asyncio.Future:
+            cached = self.cache.get_range(doc_hash, *shard)
+            if cached is not None:
+                self._stats["cached_shards"] += 1
+                future = loop.create_future()
+                future.set_result(cached)
+                return future
+            self._stats["shards"] += 1
+            return asyncio.ensure_future(self._run(_extract_range, path, *shard))
+
+        pending = deque()
+        try:
+            for shard in shards:
+                pending.append((shard, submit(shard)))
+                if len(pending) >= self.max_workers * 2:
+                    break
+
+            while pending:
+                (shard_start, _), future = pending.popleft()
+                try:
+                    texts = await future
+                except Exception as e:
+                    raise ValueError(f"PDF 텍스트 추출 실패: {str(e)}")
+                self.cache.put_range(doc_hash, shard_start, texts)
+
+                shard = next(shards, None)
+                if shard is not None:
+                    pending.append((shard, submit(shard)))
+
+                self._stats["pages"] += len(texts)
+                for offset, text in enumerate(texts):
+                    yield shard_start + offset, text
+        finally:
+            # 소비하는 쪽이 중간에 멈추면 아직 시작하지 않은 구간은 취소
+            for _, future in pending:
+                future.cancel()
+
+    async def parse(
+        self,
+        path: str,
+        doc_hash: str,
+        max_pages: Optional[int] = None,
+        on_page: Optional[Callable[[int, int], None]] = None
+    ) -> PDFDocument:
+        """PDFProcessor.parse와 같은 PDFDocument를 병렬 추출로 만듭니다.
+
+        on_page(추출한 페이지 수, 추출할 페이지 수)가 주어지면 페이지를 받을 때마다 호출합니다.
+        """
+        try:
+            page_count, metadata = await self.inspect(path, doc_hash)
+        except ValueError as e:
+            return PDFDocument(is_valid=False, error=str(e))
+        if page_count == 0:
+            return PDFDocument(is_valid=False, error="페이지가 없습니다.")
+
+        limit = page_count if max_pages is None else min(page_count, max_pages)
+        page_texts = []
+        async for _, text in self.iter_pages(path, doc_hash, 0, limit):
+            page_texts.append(text)
+            if on_page is not None:
+                on_page(len(page_texts), limit)
+
+        return PDFDocument(
+            is_valid=True,
+            page_count=page_count,
+            page_texts=page_texts,
+            metadata=metadata
+        )
+
+    def stats(self) -> Dict:
+        """추출한 문서/구간/페이지 수와 페이지 캐시 통계를 반환합니다."""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "shard_pages": self.shard_pages,
+            **self._stats,
+            "cache": self.cache.stats(),
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """작업자를 종료합니다."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
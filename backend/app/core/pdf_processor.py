@@ -1,66 +1,94 @@
-import fitz  # PyMuPDF
-from typing import Union
-import os
-import PyPDF2
-from app.config import settings
+from typing import Dict, List, Optional
+
+
+class PDFDocument:
+    """한 번의 파싱으로 얻은 PDF 정보 (유효성, 페이지 수, 페이지별 텍스트, 메타데이터)"""
+    
+    def __init__(
+        self,
+        is_valid: bool,
+        page_count: int = 0,
+        page_texts: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        error: str = ""
+    ):
+        self.is_valid = is_valid
+        self.page_count = page_count
+        self.page_texts = page_texts or []
+        self.metadata = metadata or {}
+        self.error = error
+    
+    @property
+    def text(self) -> str:
+        """추출된 페이지 텍스트를 하나로 합쳐 반환합니다."""
+        return "".join(self.page_texts).strip()
+    
+    @property
+    def extracted_page_count(self) -> int:
+        """텍스트를 추출한 페이지 수를 반환합니다."""
+        return len(self.page_texts)
 
 
 class PDFProcessor:
     """PDF 파일 처리를 담당하는 클래스"""
-    
-    def __init__(self):
-        self.download_dir = settings.download_dir
 
-    def extract_text_from_pages(self, file_content: bytes, max_pages: int = 3) -> str:
-        """PDF에서 지정된 페이지까지의 텍스트를 추출합니다."""
+    def parse(
+        self,
+        file_content: Optional[bytes] = None,
+        max_pages: Optional[int] = None,
+        path: Optional[str] = None
+    ) -> PDFDocument:
+        """PDF를 한 번만 열어 유효성, 페이지 수, 페이지별 텍스트, 메타데이터를 추출합니다.
+        
+        max_pages가 None이면 모든 페이지의 텍스트를 추출합니다.
+        """
+        import fitz  # PyMuPDF (무거운 모듈이므로 처음 파싱할 때 불러옴)
+        
         try:
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            text = ""
-            
-            # 최대 페이지 수만큼 텍스트 추출
-            for page_num in range(min(len(doc), max_pages)):
-                page = doc[page_num]
-                text += page.get_text()
+            if path is not None:
+                doc = fitz.open(path, filetype="pdf")
+            else:
+                doc = fitz.open(stream=file_content, filetype="pdf")
+        except Exception as e:
+            return PDFDocument(is_valid=False, error=str(e))
+        
+        try:
+            page_count = len(doc)
+            if page_count == 0:
+                return PDFDocument(is_valid=False, error="페이지가 없습니다.")
             
-            doc.close()
-            return text.strip()
+            limit = page_count if max_pages is None else min(page_count, max_pages)
+            page_texts = [doc[page_num].get_text() for page_num in range(limit)]
+            metadata = {key: value for key, value in (doc.metadata or {}).items() if value}
             
+            return PDFDocument(
+                is_valid=True,
+                page_count=page_count,
+                page_texts=page_texts,
+                metadata=metadata
+            )
         except Exception as e:
             raise ValueError(f"PDF 텍스트 추출 실패: {str(e)}")
+        finally:
+            doc.close()
+
+    def extract_text_from_pages(self, file_content: bytes, max_pages: int = 3) -> str:
+        """PDF에서 지정된 페이지까지의 텍스트를 추출합니다."""
+        document = self.parse(file_content, max_pages)
+        if not document.is_valid:
+            raise ValueError(f"PDF 텍스트 추출 실패: {document.error}")
+        return document.text
     
     def validate_pdf(self, file_content: bytes) -> bool:
         """PDF 파일이 유효한지 검증합니다."""
         try:
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            is_valid = len(doc) > 0
-            doc.close()
-            return is_valid
-        except:
+            return self.parse(file_content, max_pages=0).is_valid
+        except ValueError:
             return False
     
     def get_page_count(self, file_content: bytes) -> int:
         """PDF의 총 페이지 수를 반환합니다."""
         try:
-            doc = fitz.open(stream=file_content, filetype="pdf")
-            page_count = len(doc)
-            doc.close()
-            return page_count
-        except:
+            return self.parse(file_content, max_pages=0).page_count
+        except ValueError:
             return 0
-
-    def get_pdf_text(self, file_id: str) -> str:
-        """PDF 파일에서 텍스트를 추출합니다."""
-        try:
-            file_path = os.path.join(self.download_dir, f"{file_id}.pdf")
-            if not os.path.exists(file_path):
-                return ""
-            
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            print(f"PDF 텍스트 추출 실패: {str(e)}")
-            return "" 
\ No newline at end of file
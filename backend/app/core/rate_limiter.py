@@ -1,54 +1,261 @@
+from abc import ABC, abstractmethod
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, Optional, Tuple
+import os
+import sqlite3
+import threading
+import time
 from app.config import settings
 
 
-class RateLimiter:
-    """사용량 제한을 관리하는 클래스"""
-    
+class RateLimitBackend(ABC):
+    """세션별 일일 사용량 저장소 인터페이스
+
+    day는 로컬 날짜 문자열(YYYY-MM-DD)이며, 저장된 날짜와 다르면 사용량은 0으로 간주합니다.
+    메서드는 블로킹일 수 있으므로(SQLite 잠금 대기 등) 이벤트 루프에서는 스레드에서 호출합니다.
+    """
+
+    @abstractmethod
+    def get_usage(self, session_id: str, day: str) -> int:
+        """오늘의 사용량을 반환합니다."""
+
+    @abstractmethod
+    def try_increment(self, session_id: str, day: str, limit: int) -> Tuple[bool, int]:
+        """사용량이 limit 미만이면 1 증가시킵니다. 확인과 증가는 원자적으로 수행됩니다.
+
+        반환값: (증가 성공 여부, 처리 후 사용량)
+        """
+
+    @abstractmethod
+    def decrement(self, session_id: str, day: str) -> int:
+        """day의 사용량이 0보다 크면 1 감소시키고 처리 후 사용량을 반환합니다. (날짜가 바뀌었으면 그대로 둠)"""
+
+    @abstractmethod
+    def evict_stale(self, older_than: float) -> int:
+        """older_than(타임스탬프) 이후로 사용되지 않은 세션을 삭제하고 삭제 수를 반환합니다."""
+
+    @abstractmethod
+    def session_count(self) -> int:
+        """저장된 세션 수를 반환합니다."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """단일 프로세스용 메모리 저장소 (uvicorn worker가 1개일 때만 정확함)"""
+
     def __init__(self):
-        # 메모리 기반 사용량 저장
-        self._usage_store: Dict[str, Dict] = {}
-    
-    def check_limit(self, session_id: str) -> Dict:
-        """세션의 사용량 제한을 확인합니다."""
-        current_time = datetime.now()
-        today = current_time.date()
-        
-        # 세션 정보가 없으면 새로 생성
-        if session_id not in self._usage_store:
-            self._usage_store[session_id] = {
-                "usage_count": 0,
-                "date": today,
-                "last_reset": current_time
-            }
-        
-        session_data = self._usage_store[session_id]
-        
-        # 날짜가 바뀌었으면 사용량 리셋
-        if session_data["date"] != today:
-            session_data["usage_count"] = 0
-            session_data["date"] = today
-            session_data["last_reset"] = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        remaining = max(0, settings.daily_limit - session_data["usage_count"])
-        
+        # session_id -> [day, usage_count, last_used]
+        self._usage_store: Dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def get_usage(self, session_id: str, day: str) -> int:
+        with self._lock:
+            entry = self._usage_store.get(session_id)
+            return entry[1] if entry and entry[0] == day else 0
+
+    def try_increment(self, session_id: str, day: str, limit: int) -> Tuple[bool, int]:
+        with self._lock:
+            entry = self._usage_store.get(session_id)
+            if entry is None or entry[0] != day:
+                entry = [day, 0, 0.0]
+                self._usage_store[session_id] = entry
+            entry[2] = time.time()
+            if entry[1] >= limit:
+                return False, entry[1]
+            entry[1] += 1
+            return True, entry[1]
+
+    def decrement(self, session_id: str, day: str) -> int:
+        with self._lock:
+            entry = self._usage_store.get(session_id)
+            if entry is None or entry[0] != day:
+                return 0
+            entry[1] = max(0, entry[1] - 1)
+            return entry[1]
+
+    def evict_stale(self, older_than: float) -> int:
+        with self._lock:
+            stale = [session_id for session_id, entry in self._usage_store.items() if entry[2] < older_than]
+            for session_id in stale:
+                del self._usage_store[session_id]
+            return len(stale)
+
+    def session_count(self) -> int:
+        return len(self._usage_store)
+
+
+class SQLiteRateLimitBackend(RateLimitBackend):
+    """여러 worker 프로세스가 공유하는 SQLite(WAL) 저장소
+
+    확인과 증가를 하나의 UPSERT 문으로 처리하므로 프로세스 간에도 원자적입니다.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or settings.rate_limit_db_path
+        self._local = threading.local()
+        # DB 파일과 테이블은 처음 연결할 때 만듦 (모듈을 import하기만 해도 cache/ 폴더가 생기지 않도록)
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def _ensure_schema(self) -> None:
+        """DB 폴더와 테이블을 한 번만 만듭니다."""
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            try:
+                self._create_schema(conn)
+            finally:
+                conn.close()
+            self._schema_ready = True
+
+    @staticmethod
+    def _create_schema(conn: sqlite3.Connection) -> None:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS usage (
+                session_id TEXT PRIMARY KEY,
+                day TEXT NOT NULL,
+                usage_count INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_usage_last_used ON usage(last_used)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """스레드별 연결을 반환합니다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._ensure_schema()
+            # isolation_level=None: 각 문장이 자체 트랜잭션으로 즉시 커밋됨
+            conn = sqlite3.connect(self.db_path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get_usage(self, session_id: str, day: str) -> int:
+        row = self._connection().execute(
+            "SELECT usage_count FROM usage WHERE session_id = ? AND day = ?",
+            (session_id, day)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def try_increment(self, session_id: str, day: str, limit: int) -> Tuple[bool, int]:
+        if limit <= 0:
+            return False, self.get_usage(session_id, day)
+
+        row = self._connection().execute(
+            """
+            INSERT INTO usage (session_id, day, usage_count, last_used) VALUES (?, ?, 1, ?)
+            ON CONFLICT(session_id) DO UPDATE SET
+                usage_count = CASE WHEN usage.day = excluded.day THEN usage.usage_count + 1 ELSE 1 END,
+                day = excluded.day,
+                last_used = excluded.last_used
+            WHERE usage.day != excluded.day OR usage.usage_count < ?
+            RETURNING usage_count
+            """,
+            (session_id, day, time.time(), limit)
+        ).fetchone()
+
+        if row is None:
+            # 조건을 만족하지 않아 갱신되지 않음 = 한도 초과
+            return False, self.get_usage(session_id, day)
+        return True, row[0]
+
+    def decrement(self, session_id: str, day: str) -> int:
+        row = self._connection().execute(
+            """
+            UPDATE usage SET usage_count = usage_count - 1
+            WHERE session_id = ? AND day = ? AND usage_count > 0
+            RETURNING usage_count
+            """,
+            (session_id, day)
+        ).fetchone()
+        return row[0] if row else self.get_usage(session_id, day)
+
+    def evict_stale(self, older_than: float) -> int:
+        cursor = self._connection().execute("DELETE FROM usage WHERE last_used < ?", (older_than,))
+        return cursor.rowcount
+
+    def session_count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM usage").fetchone()[0]
+
+
+def create_backend(name: Optional[str] = None) -> RateLimitBackend:
+    """설정에 맞는 사용량 저장소를 생성합니다."""
+    name = name or settings.rate_limit_backend
+    if name == "memory":
+        return MemoryRateLimitBackend()
+    if name == "sqlite":
+        return SQLiteRateLimitBackend()
+    raise ValueError(f"지원하지 않는 사용량 저장소입니다: {name}")
+
+
+class RateLimiter:
+    """사용량 제한을 관리하는 클래스
+
+    저장소 호출이 블로킹이므로 비동기 엔드포인트에서는 asyncio.to_thread로 호출합니다.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self.backend = backend or create_backend()
+        self._last_eviction = time.time()
+
+    def _maybe_evict(self) -> None:
+        """session_ttl 동안 사용되지 않은 세션을 주기적으로 정리합니다."""
+        now = time.time()
+        if now - self._last_eviction < settings.rate_limit_eviction_interval:
+            return
+        self._last_eviction = now
+        self.backend.evict_stale(now - settings.rate_limit_session_ttl)
+
+    def _usage_info(self, usage_count: int, current_time: datetime) -> Dict:
+        remaining = max(0, settings.daily_limit - usage_count)
+
         # 다음 리셋 시간 계산
         next_reset = current_time.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-        
+
         return {
-            "usage_count": session_data["usage_count"],
+            "day": current_time.date().isoformat(),
+            "usage_count": usage_count,
             "limit": settings.daily_limit,
             "remaining": remaining,
             "reset_time": next_reset
         }
-    
+
+    def check_limit(self, session_id: str) -> Dict:
+        """세션의 사용량 제한을 확인합니다."""
+        current_time = datetime.now()
+        self._maybe_evict()
+
+        # 날짜가 바뀌었으면 저장소가 사용량을 0으로 간주
+        usage_count = self.backend.get_usage(session_id, current_time.date().isoformat())
+        return self._usage_info(usage_count, current_time)
+
     def increment_usage(self, session_id: str) -> bool:
-        """사용량을 증가시킵니다."""
-        usage_info = self.check_limit(session_id)
-        
-        if usage_info["remaining"] <= 0:
-            return False
-        
-        self._usage_store[session_id]["usage_count"] += 1
-        return True 
\ No newline at end of file
+        """사용량을 증가시킵니다. 한도에 도달했으면 증가시키지 않고 False를 반환합니다."""
+        success, _ = self.consume(session_id)
+        return success
+
+    def consume(self, session_id: str) -> Tuple[bool, Dict]:
+        """사용량을 1 증가시키고 (성공 여부, 처리 후 사용량 정보)를 반환합니다. (저장소 호출 한 번)"""
+        current_time = datetime.now()
+        success, usage_count = self.backend.try_increment(
+            session_id,
+            current_time.date().isoformat(),
+            settings.daily_limit
+        )
+        return success, self._usage_info(usage_count, current_time)
+
+    def refund(self, session_id: str, day: str) -> Dict:
+        """consume으로 미리 차감한 사용량 1회를 되돌립니다. (day는 차감할 때의 usage_info["day"])
+
+        차감 후 처리가 실패한 경우에 사용하며, 그사이 날짜가 바뀌었으면 새 날짜의 사용량은 건드리지 않습니다.
+        """
+        current_time = datetime.now()
+        usage_count = self.backend.decrement(session_id, day)
+        if day != current_time.date().isoformat():
+            usage_count = self.backend.get_usage(session_id, current_time.date().isoformat())
+        return self._usage_info(usage_count, current_time)
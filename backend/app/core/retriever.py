@@ -0,0 +1,304 @@
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Callable, List, Optional, Tuple
+
+from app.config import settings
+from app.utils.text_utils import split_paragraphs
+from app.utils.tokenizer import token_counter
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+# 인덱스 형식이나 토큰화 규칙을 바꾸면 버전을 올려 저장된 인덱스를 다시 만들게 합니다.
+INDEX_VERSION = 1
+
+_TOKEN_PATTERN = re.compile(r"[가-힣]+|[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """한국어는 음절 bigram, 영문/숫자는 단어 단위로 토큰화합니다.
+
+    형태소 분석기 없이도 조사가 붙은 어절('결론은', '결론이')이 같은 bigram('결론')을 공유하므로
+    한국어 질문과 문서가 잘 매칭됩니다.
+    """
+    tokens: List[str] = []
+    for match in _TOKEN_PATTERN.finditer(text.lower()):
+        word = match.group()
+        if "가" <= word[0] <= "힣":
+            if len(word) == 1:
+                tokens.append(word)
+            else:
+                tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 or word.isdigit():
+            tokens.append(word)
+    return tokens
+
+
+class RetrievalIndex:
+    """페이지/문단 청크에 대한 BM25 검색 인덱스 (NumPy 역색인)"""
+
+    K1 = 1.5
+    B = 0.75
+
+    def __init__(
+        self,
+        chunk_texts: List[str],
+        chunk_pages: List[int],
+        vocab: List[str],
+        term_offsets: "np.ndarray",
+        posting_docs: "np.ndarray",
+        posting_tfs: "np.ndarray",
+        doc_lengths: "np.ndarray"
+    ):
+        self.chunk_texts = chunk_texts
+        self.chunk_pages = chunk_pages
+        self.vocab = vocab
+        self.term_ids = {term: term_id for term_id, term in enumerate(vocab)}
+        self.term_offsets = term_offsets
+        self.posting_docs = posting_docs
+        self.posting_tfs = posting_tfs
+        self.doc_lengths = doc_lengths
+
+        import numpy as np
+
+        # 질의마다 반복되는 계산은 미리 해 둠
+        doc_count = len(chunk_texts)
+        avg_length = float(doc_lengths.mean()) if doc_count else 0.0
+        document_freqs = np.diff(term_offsets).astype(np.float32)
+        self.idf = np.log1p((doc_count - document_freqs + 0.5) / (document_freqs + 0.5)).astype(np.float32)
+        self.length_norm = (
+            self.K1 * (1 - self.B + self.B * doc_lengths / avg_length)
+            if avg_length else np.full(doc_count, self.K1, dtype=np.float32)
+        ).astype(np.float32)
+
+    @functools.cached_property
+    def fingerprint(self) -> str:
+        """인덱스를 만든 문서 내용의 지문 (내용이 바뀌면 값도 바뀜)"""
+        digest = hashlib.sha1(str(INDEX_VERSION).encode("utf-8"))
+        for text in self.chunk_texts:
+            digest.update(text.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, page_texts: List[str], chunk_chars: Optional[int] = None) -> "RetrievalIndex":
+        """페이지 텍스트를 문단 단위 청크로 나누어 인덱스를 생성합니다."""
+        import numpy as np
+
+        chunk_chars = chunk_chars or settings.qa_chunk_chars
+
+        chunk_texts: List[str] = []
+        chunk_pages: List[int] = []
+        for page_index, page_text in enumerate(page_texts):
+            page_text = page_text.strip()
+            if not page_text:
+                continue
+            pieces = [page_text] if len(page_text) <= chunk_chars else split_paragraphs(page_text, chunk_chars)
+            for piece in pieces:
+                if piece.strip():
+                    chunk_texts.append(piece.strip())
+                    chunk_pages.append(page_index)
+
+        term_ids = {}
+        triple_terms: List[int] = []
+        triple_docs: List[int] = []
+        triple_tfs: List[int] = []
+        doc_lengths = np.zeros(len(chunk_texts), dtype=np.float32)
+
+        for doc_id, text in enumerate(chunk_texts):
+            tokens = tokenize(text)
+            doc_lengths[doc_id] = len(tokens)
+            for token, tf in Counter(tokens).items():
+                term_id = term_ids.setdefault(token, len(term_ids))
+                triple_terms.append(term_id)
+                triple_docs.append(doc_id)
+                triple_tfs.append(tf)
+
+        terms = np.asarray(triple_terms, dtype=np.int32)
+        order = np.argsort(terms, kind="stable")
+        term_offsets = np.zeros(len(term_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(terms, minlength=len(term_ids)), out=term_offsets[1:])
+
+        return cls(
+            chunk_texts=chunk_texts,
+            chunk_pages=chunk_pages,
+            vocab=list(term_ids),
+            term_offsets=term_offsets,
+            posting_docs=np.asarray(triple_docs, dtype=np.int32)[order],
+            posting_tfs=np.asarray(triple_tfs, dtype=np.float32)[order],
+            doc_lengths=doc_lengths
+        )
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[Tuple[int, float]]:
+        """질문과 관련도가 높은 청크의 (인덱스, 점수)를 점수 순으로 반환합니다."""
+        import numpy as np
+
+        top_k = top_k or settings.qa_top_k
+        scores = np.zeros(len(self.chunk_texts), dtype=np.float32)
+
+        for term in set(tokenize(query)):
+            term_id = self.term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self.term_offsets[term_id], self.term_offsets[term_id + 1]
+            docs = self.posting_docs[start:end]
+            tfs = self.posting_tfs[start:end]
+            # 한 단어의 posting에는 같은 문서가 한 번만 나오므로 fancy-index 덧셈이 안전함
+            scores[docs] += self.idf[term_id] * tfs * (self.K1 + 1) / (tfs + self.length_norm[docs])
+
+        matched = np.flatnonzero(scores)
+        if matched.size == 0:
+            return []
+        if matched.size > top_k:
+            matched = matched[np.argpartition(scores[matched], -top_k)[-top_k:]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(int(doc_id), float(scores[doc_id])) for doc_id in ranked]
+
+    def build_context(self, query: str, top_k: Optional[int] = None, max_tokens: Optional[int] = None) -> str:
+        """관련 청크를 문서 순서대로 이어 붙여 답변용 컨텍스트를 만듭니다.
+
+        max_tokens가 주어지면 점수가 높은 청크부터 토큰 예산 안에 들어가는 만큼만 담습니다.
+        (첫 청크가 예산보다 크면 잘라서 담습니다.) 일치하는 청크가 없으면 문서 앞부분 청크를 사용합니다.
+        """
+        top_k = top_k or settings.qa_top_k
+        doc_ids = [doc_id for doc_id, _ in self.search(query, top_k)]
+        if not doc_ids:
+            doc_ids = list(range(min(top_k, len(self.chunk_texts))))
+
+        parts = {doc_id: f"[p.{self.chunk_pages[doc_id] + 1}] {self.chunk_texts[doc_id]}" for doc_id in doc_ids}
+        if max_tokens is not None:
+            separator_tokens = token_counter.count("\n\n")
+            selected = []
+            used = 0
+            for doc_id in doc_ids:
+                part_tokens = token_counter.count(parts[doc_id]) + (separator_tokens if selected else 0)
+                if used + part_tokens > max_tokens:
+                    if not selected:
+                        parts[doc_id] = token_counter.truncate(parts[doc_id], max_tokens)
+                        selected.append(doc_id)
+                    continue
+                selected.append(doc_id)
+                used += part_tokens
+            doc_ids = selected
+        return "\n\n".join(parts[doc_id] for doc_id in sorted(doc_ids))
+
+    def save(self, path_prefix: str) -> None:
+        """인덱스를 {path_prefix}.npz(배열)와 {path_prefix}.json(텍스트/어휘)으로 저장합니다."""
+        import numpy as np
+
+        os.makedirs(os.path.dirname(path_prefix) or ".", exist_ok=True)
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+
+        with open(path_prefix + ".npz" + tmp_suffix, "wb") as f:
+            np.savez(
+                f,
+                term_offsets=self.term_offsets,
+                posting_docs=self.posting_docs,
+                posting_tfs=self.posting_tfs,
+                doc_lengths=self.doc_lengths
+            )
+        with open(path_prefix + ".json" + tmp_suffix, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "chunk_texts": self.chunk_texts,
+                "chunk_pages": self.chunk_pages,
+                "vocab": self.vocab,
+            }, f, ensure_ascii=False)
+
+        os.replace(path_prefix + ".npz" + tmp_suffix, path_prefix + ".npz")
+        os.replace(path_prefix + ".json" + tmp_suffix, path_prefix + ".json")
+
+    @classmethod
+    def load(cls, path_prefix: str) -> Optional["RetrievalIndex"]:
+        """저장된 인덱스를 불러옵니다. 없거나 버전이 다르면 None을 반환합니다."""
+        import numpy as np
+
+        try:
+            with open(path_prefix + ".json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != INDEX_VERSION:
+                return None
+            with np.load(path_prefix + ".npz") as arrays:
+                return cls(
+                    chunk_texts=meta["chunk_texts"],
+                    chunk_pages=meta["chunk_pages"],
+                    vocab=meta["vocab"],
+                    term_offsets=arrays["term_offsets"],
+                    posting_docs=arrays["posting_docs"],
+                    posting_tfs=arrays["posting_tfs"],
+                    doc_lengths=arrays["doc_lengths"]
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+
+
+class RetrievalIndexStore:
+    """file_id별 검색 인덱스를 메모리(LRU)와 디스크에 보관하는 클래스"""
+
+    def __init__(self, index_dir: Optional[str] = None, max_cached: Optional[int] = None):
+        self.index_dir = index_dir or settings.qa_index_dir
+        self.max_cached = max_cached or settings.qa_index_max_cached
+        self._indexes: "OrderedDict[str, RetrievalIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path_prefix(self, file_id: str) -> str:
+        safe_id = re.sub(r"[^A-Za-z0-9_-]", "_", file_id)
+        return os.path.join(self.index_dir, safe_id)
+
+    def get(self, file_id: str) -> Optional[RetrievalIndex]:
+        """메모리 → 디스크 순으로 인덱스를 찾습니다."""
+        with self._lock:
+            index = self._indexes.get(file_id)
+            if index is not None:
+                self._indexes.move_to_end(file_id)
+                return index
+
+        index = RetrievalIndex.load(self._path_prefix(file_id))
+        if index is not None:
+            self._remember(file_id, index)
+        return index
+
+    def put(self, file_id: str, index: RetrievalIndex) -> None:
+        """인덱스를 메모리에 올리고 디스크에 저장합니다."""
+        self._remember(file_id, index)
+        index.save(self._path_prefix(file_id))
+
+    def delete(self, file_id: str) -> None:
+        """메모리와 디스크에서 인덱스를 삭제합니다."""
+        with self._lock:
+            self._indexes.pop(file_id, None)
+        path_prefix = self._path_prefix(file_id)
+        for suffix in (".npz", ".json"):
+            try:
+                os.remove(path_prefix + suffix)
+            except OSError:
+                pass
+
+    def evict(self, keep: Callable[[str], bool]) -> List[str]:
+        """keep(file_id)가 False인 문서(페이지 텍스트가 만료/삭제된 문서)의 인덱스를 삭제하고 file_id 목록을 반환합니다."""
+        deleted = []
+        try:
+            with os.scandir(self.index_dir) as entries:
+                file_ids = [entry.name[:-len(".json")] for entry in entries if entry.name.endswith(".json")]
+        except FileNotFoundError:
+            file_ids = []  # 아직 저장한 인덱스가 없음 (폴더는 첫 저장 때 생성)
+        with self._lock:
+            file_ids.extend(file_id for file_id in self._indexes if file_id not in file_ids)
+        for file_id in file_ids:
+            if not keep(file_id):
+                self.delete(file_id)
+                deleted.append(file_id)
+        return deleted
+
+    def _remember(self, file_id: str, index: RetrievalIndex) -> None:
+        with self._lock:
+            self._indexes[file_id] = index
+            self._indexes.move_to_end(file_id)
+            while len(self._indexes) > self.max_cached:
+                self._indexes.popitem(last=False)
\ No newline at end of file
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _FlightAbandoned(Exception):
+    """선행 요청이 취소되어 결과를 받을 수 없을 때 대기 중인 요청에 전달하는 내부 예외"""
+
+
+class SingleFlight:
+    """같은 키의 작업이 이미 진행 중이면 새로 시작하지 않고 그 결과를 함께 기다리게 하는 클래스
+
+    처음 요청(선행 요청)만 작업을 실행하고, 그동안 들어온 같은 키의 요청은 같은 결과(또는 예외)를 받습니다.
+    선행 요청이 취소되면 기다리던 요청 중 하나가 작업을 다시 실행합니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._flights: Dict[str, asyncio.Future] = {}
+
+        self._stats = {
+            "leaders": 0,
+            "coalesced": 0,
+            "failures": 0,
+        }
+
+    async def do(self, key: str, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """key에 대한 func(*args, **kwargs)의 결과를 반환합니다. 진행 중인 작업이 있으면 그 결과를 기다립니다."""
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            self._stats["coalesced"] += 1
+            try:
+                # 기다리던 요청이 취소되어도 공유 결과는 취소되지 않도록 shield
+                return await asyncio.shield(flight)
+            except _FlightAbandoned:
+                self._stats["coalesced"] -= 1
+                continue
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self._stats["leaders"] += 1
+        try:
+            result = await func(*args, **kwargs)
+        except asyncio.CancelledError:
+            flight.set_exception(_FlightAbandoned())
+            raise
+        except BaseException as e:
+            self._stats["failures"] += 1
+            flight.set_exception(e)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+            if flight.done() and not flight.cancelled():
+                flight.exception()  # 기다린 요청이 없어도 "처리되지 않은 예외" 경고가 나지 않도록 함
+
+    def stats(self) -> Dict:
+        """진행 중인 작업 수와 합쳐진(coalesced) 요청 수를 반환합니다."""
+        leaders = self._stats["leaders"]
+        coalesced = self._stats["coalesced"]
+        return {
+            "name": self.name,
+            "in_flight": len(self._flights),
+            **self._stats,
+            "coalesced_ratio": coalesced / (leaders + coalesced) if leaders + coalesced else 0.0,
+        }
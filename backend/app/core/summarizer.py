@@ -1,49 +1,229 @@
-from openai import OpenAI
+import asyncio
+import hashlib
+from typing import AsyncIterator, Callable, Dict, List, Optional
 from app.config import settings
+from app.utils.llm_client import LLMClient, LLMUnavailableError, llm_client
+from app.utils.text_utils import split_into_chunks
+from app.utils.tokenizer import token_budget, token_counter
+
+
+SUMMARY_INSTRUCTION = """다음 PDF 문서의 내용을 한국어로 요약해주세요. 
+주요 내용과 핵심 포인트를 간결하고 명확하게 정리해주세요."""
+
+MAP_INSTRUCTION = """다음은 긴 PDF 문서의 일부분입니다. 이 부분의 내용을 한국어로 요약해주세요.
+이후 다른 부분의 요약과 합쳐지므로 핵심 사실과 수치를 빠짐없이 간결하게 정리해주세요."""
+
+REDUCE_INSTRUCTION = """다음은 하나의 PDF 문서를 여러 부분으로 나누어 요약한 결과입니다.
+이를 하나의 일관된 한국어 요약으로 통합해주세요. 중복은 제거하고 핵심 포인트를 명확하게 정리해주세요."""
 
 
 class GPTSummarizer:
     """GPT-3.5를 활용한 텍스트 요약 클래스"""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+    # 프롬프트나 입력 자르기 규칙을 수정하면 버전을 올려 기존 캐시를 무효화합니다.
+    # v2: 8000자 자르기 → 모델별 입력 토큰 예산
+    PROMPT_VERSION = "v2"
     
-    def summarize_text(self, text: str, max_tokens: int = 500) -> str:
-        """텍스트를 요약합니다."""
-        try:
-            # 텍스트가 너무 길면 자르기
-            if len(text) > 8000:  # GPT-3.5의 토큰 제한 고려
-                text = text[:8000]
-            
-            prompt = f"""
-다음 PDF 문서의 내용을 한국어로 요약해주세요. 
-주요 내용과 핵심 포인트를 간결하고 명확하게 정리해주세요.
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or llm_client
+        self.model = settings.summary_model
+    
+    @property
+    def client(self):
+        """공유 LLM 계층의 AsyncOpenAI 클라이언트"""
+        return self.llm.client
+    
+    @client.setter
+    def client(self, value) -> None:
+        self.llm.client = value
+    
+    @property
+    def input_token_budget(self) -> int:
+        """모델별로 요약 입력 텍스트에 허용하는 토큰 수"""
+        return token_budget(settings.summary_input_token_budgets, self.model)
+    
+    def _build_messages(self, text: str, instruction: str = SUMMARY_INSTRUCTION) -> List[Dict[str, str]]:
+        """요약 요청 메시지를 생성합니다."""
+        # 모델의 입력 토큰 예산을 넘으면 자르기
+        text = token_counter.truncate(text, self.input_token_budget)
+        
+        prompt = f"""
+{instruction}
 
 문서 내용:
 {text}
 
 요약:
 """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "당신은 문서 요약 전문가입니다. 주어진 텍스트의 핵심 내용을 간결하고 명확하게 요약해주세요."},
-                    {"role": "user", "content": prompt}
-                ],
+        
+        return [
+            {"role": "system", "content": "당신은 문서 요약 전문가입니다. 주어진 텍스트의 핵심 내용을 간결하고 명확하게 요약해주세요."},
+            {"role": "user", "content": prompt}
+        ]
+    
+    async def summarize_text(
+        self,
+        text: str,
+        max_tokens: int = 500,
+        instruction: str = SUMMARY_INSTRUCTION
+    ) -> str:
+        """텍스트를 요약합니다."""
+        try:
+            response = await self.llm.chat(
+                model=self.model,
+                messages=self._build_messages(text, instruction),
                 max_tokens=max_tokens,
                 temperature=0.3
             )
             
             return response.choices[0].message.content.strip()
             
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"요약 생성 실패: {str(e)}")
     
+    async def stream_summary(self, text: str, max_tokens: int = 500) -> AsyncIterator[str]:
+        """요약을 생성되는 대로 토큰 단위로 반환합니다."""
+        try:
+            stream = await self.llm.stream_chat(
+                model=self.model,
+                messages=self._build_messages(text),
+                max_tokens=max_tokens,
+                temperature=0.3
+            )
+            
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    yield delta
+                    
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            raise ValueError(f"요약 생성 실패: {str(e)}")
+    
+    async def summarize_long(
+        self,
+        page_texts: List[str],
+        cache=None,
+        pool=None,
+        chunk_tokens: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_tokens: int = 500,
+        on_progress: Optional[Callable[[int, int], None]] = None
+    ) -> str:
+        """긴 문서를 청크로 나누어 병렬로 요약(map)한 뒤 단계적으로 통합(reduce)합니다.
+        
+        cache(SummaryCache)가 주어지면 청크/통합 단계의 부분 요약을 저장하므로
+        일부 청크가 실패해 요청을 다시 시도해도 성공한 부분은 재사용됩니다.
+        pool(WorkerPool)이 주어지면 각 LLM 호출은 전역 동시 실행 제한도 함께 따릅니다.
+        청크 크기는 토큰 단위이며 기본값은 모델의 입력 토큰 예산입니다.
+        on_progress(완료한 청크 수, 전체 청크 수)는 map 단계의 청크 요약이 끝날 때마다 호출됩니다.
+        """
+        chunk_tokens = chunk_tokens or self.input_token_budget
+        semaphore = asyncio.Semaphore(concurrency or settings.summary_map_concurrency)
+        
+        # 최대 full_document_max_pages 페이지의 토큰 계산/분할은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        chunks = await asyncio.to_thread(split_into_chunks, page_texts, chunk_tokens, token_counter.count)
+        if not chunks:
+            raise ValueError("요약 생성 실패: 요약할 텍스트가 없습니다.")
+        if len(chunks) == 1:
+            return await self._summarize_part(chunks[0], SUMMARY_INSTRUCTION, semaphore, cache, pool, max_tokens)
+        
+        # map: 청크별 요약을 동시에 생성
+        completed = 0
+        
+        async def summarize_chunk(chunk: str) -> str:
+            nonlocal completed
+            summary = await self._summarize_part(chunk, MAP_INSTRUCTION, semaphore, cache, pool, max_tokens)
+            completed += 1
+            if on_progress is not None:
+                on_progress(completed, len(chunks))
+            return summary
+        
+        summaries = await self._gather_parts([summarize_chunk(chunk) for chunk in chunks])
+        
+        # reduce: 부분 요약이 하나가 될 때까지 묶어서 통합
+        while len(summaries) > 1:
+            groups = self._group_for_reduce(summaries, chunk_tokens)
+            summaries = await self._gather_parts([
+                self._summarize_part("\n\n".join(group), REDUCE_INSTRUCTION, semaphore, cache, pool, max_tokens)
+                for group in groups
+            ])
+        return summaries[0]
+    
+    @staticmethod
+    async def _gather_parts(coroutines: list) -> List[str]:
+        """부분 요약을 모두 실행합니다.
+        
+        하나가 실패해도 나머지는 끝까지 실행해 캐시에 남긴 뒤 첫 번째 오류를 다시 발생시킵니다.
+        """
+        results = await asyncio.gather(*coroutines, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
+    
+    @staticmethod
+    def _group_for_reduce(summaries: List[str], max_tokens: int) -> List[List[str]]:
+        """통합 단계 입력이 max_tokens를 넘지 않도록 부분 요약을 묶습니다. (그룹당 최소 2개)"""
+        separator_tokens = token_counter.count("\n\n")
+        groups: List[List[str]] = []
+        current: List[str] = []
+        current_tokens = 0
+        for summary in summaries:
+            summary_tokens = token_counter.count(summary)
+            if len(current) >= 2 and current_tokens + summary_tokens > max_tokens:
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(summary)
+            current_tokens += summary_tokens + separator_tokens
+        if current:
+            if len(current) == 1 and groups:
+                groups[-1].extend(current)
+            else:
+                groups.append(current)
+        return groups
+    
+    async def _summarize_part(
+        self,
+        text: str,
+        instruction: str,
+        semaphore: asyncio.Semaphore,
+        cache,
+        pool,
+        max_tokens: int
+    ) -> str:
+        """부분 요약을 생성합니다. 캐시를 먼저 확인합니다.
+        
+        일시적인 오류의 재시도와 장애 시 차단은 LLMClient가 맡으므로 여기서는 다시 시도하지 않습니다.
+        (잘못된 요청/컨텍스트 길이 초과 같은 오류는 다시 시도해도 실패함)
+        """
+        key = None
+        if cache is not None:
+            raw = f"part:{self.model}:{self.PROMPT_VERSION}:{self.input_token_budget}:{instruction}:{max_tokens}:{text}"
+            key = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+            cached = await cache.get(key)
+            if cached is not None:
+                return cached["summary"]
+        
+        async with semaphore:
+            if pool is not None:
+                summary = await pool.run(self.summarize_text, text, max_tokens, instruction)
+            else:
+                summary = await self.summarize_text(text, max_tokens, instruction)
+        
+        if cache is not None:
+            await cache.set(key, {"summary": summary})
+        return summary
+    
     def estimate_cost(self, text: str) -> float:
         """대략적인 API 비용을 추정합니다."""
         # GPT-3.5-turbo의 대략적인 토큰 비용 계산
-        estimated_tokens = len(text) // 4  # 대략적인 토큰 계산
+        estimated_tokens = token_counter.count(text)  # 프롬프트 예산과 같은 토큰 계산 (한국어는 글자 수 / 4보다 훨씬 많음)
         input_cost = (estimated_tokens / 1000) * 0.0015  # $0.0015 per 1K tokens
         output_cost = (500 / 1000) * 0.002  # $0.002 per 1K tokens (최대 출력)
         return input_cost + output_cost 
\ No newline at end of file
@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from app.config import settings
+
+
+class SummaryCache:
+    """요약 결과를 메모리(LRU)와 디스크 2단계로 캐싱하는 클래스
+
+    디스크 계층은 max_disk_bytes를 넘지 않도록 sweep()이 만료된 파일과 오래전에 쓴 파일부터 지웁니다.
+    (정리 주기마다 호출하고, 쓰기로 용량을 넘으면 바로 실행) 디스크 읽기/쓰기는 이벤트 루프를 막지 않도록
+    스레드에서 실행하므로 get/set은 코루틴입니다.
+    """
+
+    # 용량을 넘어 정리할 때 max_disk_bytes의 이 비율까지 줄여 쓰기마다 정리하지 않게 함
+    DISK_LOW_WATERMARK = 0.9
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_memory_bytes: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        max_disk_bytes: Optional[int] = None
+    ):
+        self.cache_dir = cache_dir or settings.summary_cache_dir
+        self.max_memory_bytes = max_memory_bytes if max_memory_bytes is not None else settings.summary_cache_max_bytes
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.summary_cache_ttl
+        self.max_disk_bytes = max_disk_bytes if max_disk_bytes is not None else settings.summary_cache_disk_max_bytes
+
+        # key -> (생성 시각, 직렬화된 크기, 값)
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        # 디스크 계층 크기 추정치 (sweep에서 실제 값으로 다시 계산, 여러 worker가 같은 폴더를 쓰므로 근삿값)
+        self._disk_bytes = 0
+        self._disk_entries = 0
+        self._sweep_lock = threading.Lock()
+
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "disk_evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(file_hash: str, max_pages: int, model: str, prompt_version: str) -> str:
+        """문서 해시와 요약 파라미터로 캐시 키를 생성합니다."""
+        raw = f"{file_hash}:{max_pages}:{model}:{prompt_version}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict]:
+        """캐시된 값을 조회합니다. 없거나 만료되었으면 None을 반환합니다."""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, _, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    return value
+                self._remove_memory(key)
+                self._stats["expirations"] += 1
+
+        # 디스크 계층 확인
+        record = await asyncio.to_thread(self._read_disk, key)
+        if record is not None:
+            if now - record["created_at"] <= self.ttl_seconds:
+                with self._lock:
+                    self._put_memory(key, record["created_at"], record["value"])
+                    self._stats["disk_hits"] += 1
+                return record["value"]
+            await asyncio.to_thread(self._delete_disk, key)
+            with self._lock:
+                self._stats["expirations"] += 1
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    async def set(self, key: str, value: Dict) -> None:
+        """값을 메모리와 디스크에 저장합니다."""
+        created_at = time.time()
+        with self._lock:
+            self._put_memory(key, created_at, value)
+        await asyncio.to_thread(self._write_disk, key, {"created_at": created_at, "value": value})
+
+    def sweep(self) -> int:
+        """만료된 디스크 항목을 지우고, max_disk_bytes를 넘으면 오래전에 쓴 항목부터 지웁니다. (블로킹)
+
+        삭제한 항목 수를 반환합니다. 파일 수정 시각을 저장 시각으로 사용합니다.
+        """
+        if not self._sweep_lock.acquire(blocking=False):
+            return 0  # 다른 스레드가 정리 중
+        try:
+            now = time.time()
+            entries = []
+            expired = 0
+            for root, _, names in os.walk(self.cache_dir):
+                for name in names:
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    # 중단된 쓰기가 남긴 임시 파일도 만료 시 정리
+                    if now - stat.st_mtime > self.ttl_seconds:
+                        self._remove_file(path)
+                        expired += 1
+                    elif name.endswith(".json"):
+                        entries.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            evicted = 0
+            if total > self.max_disk_bytes:
+                target = self.max_disk_bytes * self.DISK_LOW_WATERMARK
+                for _, size, path in sorted(entries):
+                    if total <= target:
+                        break
+                    if self._remove_file(path):
+                        total -= size
+                        evicted += 1
+
+            with self._lock:
+                self._disk_bytes = total
+                self._disk_entries = len(entries) - evicted
+                self._stats["expirations"] += expired
+                self._stats["disk_evictions"] += evicted
+            return expired + evicted
+        finally:
+            self._sweep_lock.release()
+
+    def clear(self) -> None:
+        """메모리 계층을 비웁니다. (디스크 계층은 유지)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict:
+        """캐시 적중/실패/제거 통계를 반환합니다."""
+        with self._lock:
+            lookups = self._stats["memory_hits"] + self._stats["disk_hits"] + self._stats["misses"]
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            return {
+                **self._stats,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+                "disk_entries": self._disk_entries,
+                "disk_bytes": self._disk_bytes,
+                "max_disk_bytes": self.max_disk_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _put_memory(self, key: str, created_at: float, value: Dict) -> None:
+        """메모리 계층에 저장하고 용량을 넘으면 오래된 항목부터 제거합니다. (lock 보유 상태에서 호출)"""
+        size = len(json.dumps(value, ensure_ascii=False).encode("utf-8"))
+        if size > self.max_memory_bytes:
+            return
+
+        if key in self._memory:
+            self._remove_memory(key)
+
+        self._memory[key] = (created_at, size, value)
+        self._memory_bytes += size
+
+        while self._memory_bytes > self.max_memory_bytes:
+            oldest_key = next(iter(self._memory))
+            self._remove_memory(oldest_key)
+            self._stats["evictions"] += 1
+
+    def _remove_memory(self, key: str) -> None:
+        _, size, _ = self._memory.pop(key)
+        self._memory_bytes -= size
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[Dict]:
+        try:
+            with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, record: Dict) -> None:
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except OSError:
+            return  # 디스크 캐시 실패는 요청 처리에 영향을 주지 않음
+
+        with self._lock:
+            self._disk_bytes += size
+            self._disk_entries += 1
+            over_limit = self._disk_bytes > self.max_disk_bytes
+        if over_limit:
+            self.sweep()
+
+    def _delete_disk(self, key: str) -> None:
+        self._remove_file(self._disk_path(key))
+
+    @staticmethod
+    def _remove_file(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
\ No newline at end of file
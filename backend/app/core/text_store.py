@@ -0,0 +1,219 @@
+import mmap
+import os
+import re
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Callable, List, Optional, TypeVar
+
+from app.config import settings
+
+T = TypeVar("T")
+
+
+class _PageTextReader:
+    """한 문서의 오프셋 인덱스와 mmap된 텍스트 blob"""
+
+    def __init__(self, index_path: str, blob_path: str):
+        self.offsets = array("Q")
+        with open(index_path, "rb") as f:
+            self.offsets.frombytes(f.read())
+
+        self._file = open(blob_path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        # 빈 파일은 mmap할 수 없으므로 페이지가 모두 비어 있으면 blob 없이 처리
+        self._blob = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+
+    @property
+    def page_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def page(self, page_index: int) -> str:
+        start, end = self.offsets[page_index], self.offsets[page_index + 1]
+        return self._blob[start:end].decode("utf-8")
+
+    def close(self) -> None:
+        if isinstance(self._blob, mmap.mmap):
+            self._blob.close()
+        self._file.close()
+
+
+class PageTextStore:
+    """file_id별 페이지 텍스트를 디스크에 한 번 저장하고 mmap으로 바로 읽는 저장소
+
+    문서마다 두 파일을 씁니다.
+        - {file_id}.idx: 페이지 시작 바이트 오프셋 (uint64, 페이지 수 + 1개)
+        - {file_id}.txt: 모든 페이지 텍스트를 UTF-8로 이어 붙인 blob
+    페이지 i는 blob[offsets[i]:offsets[i + 1]]이므로 PDF 파싱 없이 O(1)로 읽을 수 있습니다.
+    저장 후 max_age_seconds가 지난 문서는 만료되어 삭제됩니다.
+    열린 reader는 다른 스레드의 put/delete나 LRU 정리로 닫힐 수 있으므로 페이지 읽기는 잠금 안에서 합니다.
+    """
+
+    _FILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+    def __init__(
+        self,
+        store_dir: Optional[str] = None,
+        max_age_seconds: Optional[int] = None,
+        max_open_readers: int = 64
+    ):
+        self.store_dir = store_dir or settings.text_store_dir
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else settings.text_store_max_age
+        self.max_open_readers = max_open_readers
+        self._readers: "OrderedDict[str, _PageTextReader]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _paths(self, file_id: str):
+        if not self._FILE_ID_PATTERN.match(file_id):
+            raise ValueError("유효하지 않은 파일 ID입니다.")
+        base = os.path.join(self.store_dir, file_id)
+        return base + ".idx", base + ".txt"
+
+    def put(self, file_id: str, page_texts: List[str]) -> None:
+        """페이지 텍스트를 저장합니다. 이미 있으면 덮어씁니다."""
+        index_path, blob_path = self._paths(file_id)
+        tmp_suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        offsets = array("Q", [0])
+        with open(blob_path + tmp_suffix, "wb") as blob:
+            for page_text in page_texts:
+                encoded = page_text.encode("utf-8")
+                blob.write(encoded)
+                offsets.append(offsets[-1] + len(encoded))
+        with open(index_path + tmp_suffix, "wb") as index:
+            index.write(offsets.tobytes())
+
+        self._close_reader(file_id)
+        # 인덱스가 나중에 바뀌어야 읽는 쪽이 새 blob과 짝이 맞지 않는 인덱스를 보지 않음
+        os.replace(blob_path + tmp_suffix, blob_path)
+        os.replace(index_path + tmp_suffix, index_path)
+
+    def contains(self, file_id: str) -> bool:
+        """만료되지 않은 문서가 저장되어 있는지 파일을 열지 않고 확인합니다."""
+        try:
+            index_path, _ = self._paths(file_id)
+        except ValueError:
+            return False
+        return not self._is_expired(index_path)
+
+    def touch(self, file_id: str) -> bool:
+        """만료되지 않은 문서면 저장 시각을 지금으로 갱신해 만료를 미루고 True를 반환합니다.
+
+        같은 문서를 다시 요약할 때 호출하므로 자주 쓰는 문서는 처음 저장한 뒤 max_age_seconds가 지나도 남습니다.
+        """
+        try:
+            index_path, _ = self._paths(file_id)
+        except ValueError:
+            return False
+        if self._is_expired(index_path):
+            return False
+        try:
+            os.utime(index_path)
+        except OSError:
+            return False
+        return True
+
+    def exists(self, file_id: str) -> bool:
+        """만료되지 않은 문서가 저장되어 있는지 확인합니다."""
+        return self._read(file_id, lambda reader: True, False)
+
+    def page_count(self, file_id: str) -> int:
+        """저장된 페이지 수를 반환합니다. 없으면 0을 반환합니다."""
+        return self._read(file_id, lambda reader: reader.page_count, 0)
+
+    def get_page(self, file_id: str, page_index: int) -> Optional[str]:
+        """한 페이지의 텍스트를 반환합니다."""
+        def read(reader: _PageTextReader) -> Optional[str]:
+            if not 0 <= page_index < reader.page_count:
+                return None
+            return reader.page(page_index)
+        return self._read(file_id, read, None)
+
+    def get_pages(self, file_id: str, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """[start, end) 범위의 페이지 텍스트를 반환합니다. 없으면 빈 리스트를 반환합니다."""
+        def read(reader: _PageTextReader) -> List[str]:
+            stop = reader.page_count if end is None else min(end, reader.page_count)
+            return [reader.page(page_index) for page_index in range(max(0, start), stop)]
+        return self._read(file_id, read, [])
+
+    def delete(self, file_id: str) -> None:
+        """문서를 삭제합니다."""
+        self._close_reader(file_id)
+        for path in self._paths(file_id):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def evict_expired(self) -> List[str]:
+        """저장 후 max_age_seconds가 지난 문서를 삭제하고 삭제한 file_id 목록을 반환합니다."""
+        deleted = []
+        now = time.time()
+        try:
+            entries = list(os.scandir(self.store_dir))
+        except FileNotFoundError:
+            return deleted  # 아직 저장한 문서가 없음 (폴더는 첫 저장 때 생성)
+        for entry in entries:
+            if not entry.name.endswith(".idx"):
+                continue
+            try:
+                if now - entry.stat().st_mtime > self.max_age_seconds:
+                    file_id = entry.name[:-len(".idx")]
+                    self.delete(file_id)
+                    deleted.append(file_id)
+            except (OSError, ValueError):
+                pass
+        return deleted
+
+    def _is_expired(self, index_path: str) -> bool:
+        try:
+            return time.time() - os.path.getmtime(index_path) > self.max_age_seconds
+        except OSError:
+            return True
+
+    def _read(self, file_id: str, read: Callable[[_PageTextReader], T], default: T) -> T:
+        """문서의 reader로 read를 호출합니다. 문서가 없거나 만료되었으면 default를 반환합니다.
+
+        read가 끝날 때까지 잠금을 잡고 있으므로 그동안 reader(mmap)가 닫히지 않습니다.
+        """
+        try:
+            index_path, blob_path = self._paths(file_id)
+        except ValueError:
+            return default
+
+        if self._is_expired(index_path):
+            if os.path.exists(index_path):
+                self.delete(file_id)
+            return default
+
+        with self._lock:
+            reader = self._open_reader(file_id, index_path, blob_path)
+            if reader is None:
+                return default
+            return read(reader)
+
+    def _open_reader(self, file_id: str, index_path: str, blob_path: str) -> Optional[_PageTextReader]:
+        """열려 있는 reader를 반환하거나 새로 엽니다. (self._lock을 잡은 상태에서 호출)"""
+        reader = self._readers.get(file_id)
+        if reader is not None:
+            self._readers.move_to_end(file_id)
+            return reader
+
+        try:
+            reader = _PageTextReader(index_path, blob_path)
+        except (OSError, ValueError):
+            return None
+
+        self._readers[file_id] = reader
+        while len(self._readers) > self.max_open_readers:
+            _, oldest = self._readers.popitem(last=False)
+            oldest.close()
+        return reader
+
+    def _close_reader(self, file_id: str) -> None:
+        with self._lock:
+            reader = self._readers.pop(file_id, None)
+        if reader is not None:
+            reader.close()
\ No newline at end of file
@@ -0,0 +1,131 @@
+import asyncio
+import functools
+import multiprocessing
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from app.utils.metrics import POOL_WAIT_SECONDS
+
+
+class PoolSaturatedError(Exception):
+    """작업 풀의 대기열이 가득 찼을 때 발생하는 예외"""
+
+
+class WorkerPool:
+    """동시 실행 수가 제한된 작업 풀 (대기열 깊이와 대기 시간 지표 포함)
+
+    kind:
+        - "thread": ThreadPoolExecutor에서 동기 함수를 실행
+        - "process": ProcessPoolExecutor에서 동기 함수를 실행 (인자/반환값은 pickle 가능해야 함)
+        - "async": 코루틴 함수를 이벤트 루프에서 직접 실행하고 동시 실행 수만 제한
+    """
+
+    KINDS = ("thread", "process", "async")
+
+    def __init__(self, name: str, max_workers: int, kind: str = "thread", max_queue: int = 0):
+        if kind not in self.KINDS:
+            raise ValueError(f"지원하지 않는 풀 종류입니다: {kind}")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max_queue  # 0이면 대기열 제한 없음
+
+        self._executor: Optional[Executor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.kind == "async":
+            return None
+        if self._executor is None:
+            if self.kind == "process":
+                # 스레드가 있는 서버 프로세스에서 fork하지 않도록 spawn 사용
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=f"{self.name}-pool"
+                )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """풀의 실행 슬롯 하나를 점유합니다. (스트리밍처럼 run()으로 감쌀 수 없는 작업용)"""
+        if self.max_queue and self._queued >= self.max_queue:
+            self._rejected += 1
+            raise PoolSaturatedError(f"{self.name} 작업 대기열이 가득 찼습니다.")
+
+        submitted_at = time.perf_counter()
+        self._queued += 1
+        semaphore = self._get_semaphore()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._queued -= 1
+
+        wait = time.perf_counter() - submitted_at
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        POOL_WAIT_SECONDS.labels(self.name).observe(wait)
+        self._active += 1
+        try:
+            yield
+            self._completed += 1
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            self._active -= 1
+            semaphore.release()
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """풀에서 작업을 실행하고 결과를 반환합니다."""
+        async with self.slot():
+            if self.kind == "async":
+                return await func(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(),
+                functools.partial(func, *args, **kwargs)
+            )
+
+    def stats(self) -> Dict:
+        """풀의 대기열 깊이, 실행 중 작업 수, 대기 시간 통계를 반환합니다."""
+        started = self._completed + self._failed + self._active
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self._queued,
+            "active": self._active,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "avg_wait_ms": (self._total_wait / started * 1000) if started else 0.0,
+            "max_wait_ms": self._max_wait * 1000,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """풀을 종료합니다."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
\ No newline at end of file
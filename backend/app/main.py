@@ -1,10 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse
+import asyncio
 import os
 
 from app.config import settings
 from app.api.v1.api import api_router
+from app.api.v1.endpoints import pdf
+from app.core.artifact_store import ArtifactStore
+from app.utils.http_cache import CachingStaticFiles
+from app.utils.metrics import metrics
+from app.utils.upload_spool import UploadSizeLimitMiddleware
 
 
 def create_application() -> FastAPI:
@@ -17,6 +23,15 @@ def create_application() -> FastAPI:
         debug=settings.debug,
     )
 
+    # 업로드 크기 제한 (본문을 다 받기 전에 413으로 거절, 배치 요약은 파일 수만큼 허용)
+    app.add_middleware(
+        UploadSizeLimitMiddleware,
+        path_limits={
+            "/api/v1/pdf/summarize/batch":
+                (settings.max_file_size + UploadSizeLimitMiddleware.MULTIPART_OVERHEAD) * settings.batch_max_files,
+        }
+    )
+
     # Set up CORS middleware
     app.add_middleware(
         CORSMiddleware,
@@ -30,10 +45,76 @@ def create_application() -> FastAPI:
     app.include_router(api_router, prefix="/api/v1")
     
     # Create downloads directory if it doesn't exist
-    os.makedirs("downloads", exist_ok=True)
+    os.makedirs(settings.download_dir, exist_ok=True)
     
     # Serve static files for downloads
-    app.mount("/downloads", StaticFiles(directory="downloads"), name="downloads")
+    app.mount(
+        "/downloads",
+        CachingStaticFiles(directory=settings.download_dir, content_hash=ArtifactStore.content_hash),
+        name="downloads"
+    )
+
+    @app.on_event("startup")
+    async def warm_up_services():
+        """무거운 라이브러리/폰트를 미리 불러옴 (background: 시작을 막지 않음, blocking: 끝난 뒤 요청 수신)"""
+        if settings.startup_warm_up == "blocking":
+            await asyncio.to_thread(pdf.warm_up_services)
+        elif settings.startup_warm_up == "background":
+            app.state.warm_up_task = asyncio.create_task(asyncio.to_thread(pdf.warm_up_services))
+
+    @app.on_event("startup")
+    async def start_download_janitor():
+        """다운로드 폴더 인덱스를 만들고 주기적인 정리 작업 시작 (만료된 Q&A 문서, 요약 캐시 디스크 계층 정리도 함께 실행)"""
+        await asyncio.to_thread(pdf.download_janitor.rescan)
+
+        async def run_janitor():
+            while True:
+                try:
+                    await asyncio.to_thread(pdf.download_janitor.sweep)
+                except Exception:
+                    pass  # 정리 실패는 다음 주기에 다시 시도
+                try:
+                    # 만료된 Q&A 페이지 텍스트와 검색 인덱스
+                    await asyncio.to_thread(pdf.evict_expired_documents)
+                except Exception:
+                    pass
+                try:
+                    # 요약 캐시 디스크 계층의 만료/용량 초과 항목
+                    await asyncio.to_thread(pdf.summary_cache.sweep)
+                except Exception:
+                    pass
+                await asyncio.sleep(settings.download_janitor_interval)
+
+        app.state.janitor_task = asyncio.create_task(run_janitor())
+
+    @app.on_event("startup")
+    async def start_job_queue():
+        """비동기 작업 큐 시작 (lease가 지난 실행 중 작업은 다시 대기열에 넣음)"""
+        await pdf.job_queue.start()
+
+    @app.on_event("shutdown")
+    async def stop_job_queue():
+        """작업자 중지 (실행 중이던 작업은 대기열로 돌려놓아 다른 worker나 다음 시작 때 다시 실행)"""
+        await pdf.job_queue.stop()
+
+    @app.on_event("shutdown")
+    async def stop_download_janitor():
+        """정리 작업 중지"""
+        task = getattr(app.state, "janitor_task", None)
+        if task is not None:
+            task.cancel()
+
+    @app.on_event("shutdown")
+    async def close_llm_client():
+        """LLM 연결 풀 종료"""
+        await pdf.llm_client.close()
+
+    @app.on_event("shutdown")
+    async def shutdown_pools():
+        """작업 풀 종료"""
+        for pool in (pdf.pdf_pool, pdf.convert_pool, pdf.llm_pool):
+            pool.shutdown(wait=False)
+        pdf.page_extractor.shutdown(wait=False)
 
     return app
 
@@ -54,4 +135,10 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"} 
\ No newline at end of file
+    return {"status": "healthy"} 
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition endpoint"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -9,6 +9,43 @@ class SummarizeResponse(BaseModel):
     page_count: int = Field(..., description="처리된 페이지 수")
     usage_remaining: int = Field(..., description="남은 사용 횟수")
     processing_time: float = Field(..., description="처리 시간(초)")
+    file_id: Optional[str] = Field(None, description="Q&A 요청에 사용할 파일 ID")
+
+
+class BatchItemResult(BaseModel):
+    """배치 요약의 파일별 결과 모델 (성공하면 summary, 실패하면 error가 채워짐)"""
+    filename: str = Field(..., description="업로드한 파일명")
+    status_code: int = Field(..., description="파일별 처리 결과 코드 (200이면 성공)")
+    summary: Optional[str] = Field(None, description="요약된 텍스트")
+    page_count: Optional[int] = Field(None, description="처리된 페이지 수")
+    file_id: Optional[str] = Field(None, description="Q&A 요청에 사용할 파일 ID")
+    error: Optional[str] = Field(None, description="실패 사유")
+    processing_time: float = Field(..., description="파일별 처리 시간(초)")
+
+
+class BatchSummarizeResponse(BaseModel):
+    """배치 요약 응답 모델"""
+    results: List[BatchItemResult] = Field(..., description="파일별 결과 (업로드한 순서)")
+    succeeded: int = Field(..., description="성공한 파일 수")
+    failed: int = Field(..., description="실패한 파일 수")
+    usage_remaining: int = Field(..., description="남은 사용 횟수")
+    processing_time: float = Field(..., description="전체 처리 시간(초)")
+
+
+class JobResponse(BaseModel):
+    """비동기 작업 상태 응답 모델"""
+    job_id: str = Field(..., description="작업 ID")
+    kind: str = Field(..., description="작업 종류")
+    status: str = Field(..., description="상태 (queued, running, succeeded, failed, cancelled)")
+    priority: int = Field(..., description="우선순위 (높을수록 먼저 처리)")
+    progress: float = Field(..., description="진행률 (0~1)")
+    stage: Optional[str] = Field(None, description="현재 단계")
+    result: Optional[dict] = Field(None, description="성공한 경우 결과 (요약 응답과 같은 필드)")
+    error: Optional[str] = Field(None, description="실패 사유")
+    status_code: Optional[int] = Field(None, description="끝난 작업의 결과 코드")
+    created_at: float = Field(..., description="생성 시각 (유닉스 타임스탬프)")
+    started_at: Optional[float] = Field(None, description="시작 시각")
+    finished_at: Optional[float] = Field(None, description="종료 시각")
 
 
 class ConvertResponse(BaseModel):
@@ -18,6 +55,11 @@ class ConvertResponse(BaseModel):
     file_size: int = Field(..., description="파일 크기(바이트)")
 
 
+class BundleConvertResponse(BaseModel):
+    """여러 형식 변환 응답 모델"""
+    files: List[ConvertResponse] = Field(..., description="형식별 변환 결과 (요청한 순서)")
+
+
 class UsageResponse(BaseModel):
     """사용량 응답 모델"""
     usage_count: int = Field(..., description="사용 횟수")
@@ -1,5 +1,4 @@
 import os
-import hashlib
 from datetime import datetime
 from typing import Optional
 
@@ -11,11 +10,6 @@ def generate_filename(original_filename: str, prefix: str = "", suffix: str = ""
     return f"{prefix}{name}_{timestamp}{suffix}{ext}"
 
 
-def get_file_hash(file_content: bytes) -> str:
-    """파일 내용의 해시값을 계산합니다."""
-    return hashlib.md5(file_content).hexdigest()
-
-
 def validate_file_size(file_content: bytes, max_size: int) -> bool:
     """파일 크기가 제한 내에 있는지 확인합니다."""
     return len(file_content) <= max_size
@@ -0,0 +1,181 @@
+import asyncio
+import functools
+import hashlib
+import mimetypes
+import os
+import re
+from email.utils import formatdate
+from typing import Callable, Optional, Tuple
+
+import aiofiles
+from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import Response
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_md5(path: str, size: int, mtime_ns: int) -> str:
+    """파일 내용의 md5를 계산합니다. (경로/크기/수정 시각이 같으면 캐시된 값 사용)"""
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 ETag와 일치하는지 확인합니다. (약한 비교)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def parse_range(range_header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """단일 바이트 범위를 [start, end] (end 포함)로 반환합니다.
+
+    범위 요청이 아니거나 여러 범위이면 None(전체 응답), 만족할 수 없으면 ValueError를 발생시킵니다.
+    """
+    if not range_header:
+        return None
+    match = _RANGE_PATTERN.match(range_header.strip())
+    if not match:
+        return None
+    start, end = match.groups()
+    if not start and not end:
+        return None
+    if not start:
+        # 마지막 N바이트
+        length = int(end)
+        if length == 0:
+            raise ValueError("빈 범위입니다.")
+        return max(0, size - length), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        raise ValueError("파일 범위를 벗어났습니다.")
+    return start, end
+
+
+class CachedFileResponse(Response):
+    """ETag/조건부 요청(304)/범위 요청(206)을 지원하는 파일 응답
+
+    강한 ETag는 항상 실제로 내려주는 파일 내용의 md5입니다. 내용 주소 기반 파일명은 요약 텍스트/형식/렌더러
+    버전의 해시일 뿐이고, docx/pdf에는 생성 시각이 들어가므로 정리된 뒤 다시 렌더링하면 이름은 같아도
+    내용이 달라집니다. 파일명 해시를 ETag로 쓰면 이어받기(If-Range + Range)가 서로 다른 두 파일을 이어 붙이게 됨.
+
+    content_hash가 주어지면(내용 주소 기반 파일) 같은 이름은 같은 요약의 렌더링이므로 오래 캐시하도록(immutable)
+    알리고, 그렇지 않으면 매번 재검증하도록 합니다.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: Optional[os.stat_result] = None,
+        filename: Optional[str] = None,
+        media_type: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ):
+        self.path = path
+        self.stat_result = stat_result
+        self.filename = filename
+        self.media_type = media_type or mimetypes.guess_type(filename or path)[0] or "application/octet-stream"
+        self.content_hash = content_hash
+        self.status_code = 200
+        self.background = None
+        self.raw_headers = []
+
+    async def _etag(self, stat_result: os.stat_result) -> str:
+        digest = await asyncio.to_thread(_file_md5, self.path, stat_result.st_size, stat_result.st_mtime_ns)
+        return f'"{digest}"'
+
+    async def __call__(self, scope, receive, send) -> None:
+        stat_result = self.stat_result or await asyncio.to_thread(os.stat, self.path)
+        size = stat_result.st_size
+        etag = await self._etag(stat_result)
+        request_headers = Headers(scope=scope)
+
+        headers = {
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "cache-control": IMMUTABLE_CACHE_CONTROL if self.content_hash else REVALIDATE_CACHE_CONTROL,
+            "accept-ranges": "bytes",
+        }
+
+        if etag_matches(request_headers.get("if-none-match"), etag):
+            await self._send(send, 304, headers)
+            return
+
+        headers["content-type"] = self.media_type
+        if self.filename:
+            headers["content-disposition"] = f'attachment; filename="{self.filename}"'
+
+        # If-Range가 현재 ETag와 다르면 파일이 바뀐 것이므로 전체를 보냄
+        if_range = request_headers.get("if-range")
+        try:
+            byte_range = None if if_range and if_range != etag else parse_range(request_headers.get("range"), size)
+        except ValueError:
+            headers["content-range"] = f"bytes */{size}"
+            await self._send(send, 416, headers)
+            return
+
+        if byte_range is None:
+            status_code, start, end = 200, 0, size - 1
+        else:
+            status_code, (start, end) = 206, byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+        headers["content-length"] = str(end - start + 1)
+
+        await self._send(send, status_code, headers, body_follows=scope["method"] != "HEAD" and size > 0)
+        if scope["method"] == "HEAD" or size == 0:
+            return
+
+        async with aiofiles.open(self.path, "rb") as f:
+            await f.seek(start)
+            remaining = end - start + 1
+            while remaining > 0:
+                chunk = await f.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _send(send, status_code: int, headers: dict, body_follows: bool = False) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(key.encode("latin-1"), value.encode("latin-1")) for key, value in headers.items()],
+        })
+        if not body_follows:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+class CachingStaticFiles(StaticFiles):
+    """CachedFileResponse로 파일을 내려주는 StaticFiles (ETag/304/206/immutable 캐시 헤더)"""
+
+    def __init__(self, *args, content_hash: Optional[Callable[[str], Optional[str]]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.content_hash = content_hash
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        if status_code != 200:
+            # html 모드의 404 페이지 등은 기본 동작 사용
+            return super().file_response(full_path, stat_result, scope, status_code)
+        filename = os.path.basename(full_path)
+        return CachedFileResponse(
+            str(full_path),
+            stat_result=stat_result,
+            content_hash=self.content_hash(filename) if self.content_hash else None
+        )
@@ -0,0 +1,222 @@
+import asyncio
+import random
+import threading
+import time
+from typing import AsyncIterator, Dict, Optional
+
+from app.config import settings
+from app.utils.metrics import LLM_REQUEST_SECONDS, record_llm_usage
+
+
+class LLMUnavailableError(Exception):
+    """재시도 후에도 LLM API가 일시적인 오류(429/5xx/시간 초과)로 응답하지 않을 때 발생하는 예외"""
+
+
+class CircuitOpenError(LLMUnavailableError):
+    """연속 실패로 회로 차단기가 열려 호출하지 않고 바로 실패할 때 발생하는 예외"""
+
+
+class CircuitBreaker:
+    """연속 실패가 failure_threshold번 쌓이면 reset_timeout 동안 호출을 막는 회로 차단기
+
+    - closed: 정상 호출
+    - open: 호출하지 않고 바로 CircuitOpenError
+    - half_open: reset_timeout이 지나면 한 번만 시험 호출을 허용하고, 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: Optional[int] = None, reset_timeout: Optional[float] = None):
+        self.failure_threshold = failure_threshold or settings.llm_circuit_failure_threshold
+        self.reset_timeout = reset_timeout if reset_timeout is not None else settings.llm_circuit_reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """호출해도 되는지 확인하고, 막혀 있으면 CircuitOpenError를 발생시킵니다.
+
+        half_open의 시험 호출로 허용되면 True를 반환합니다.
+        """
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.OPEN or (self.state == self.HALF_OPEN and self._trial_in_flight):
+                raise CircuitOpenError("AI 서비스 연결이 일시적으로 차단되었습니다.")
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release(self) -> None:
+        """결과 없이 끝난(취소된) 시험 호출의 표시만 해제합니다. 상태는 바꾸지 않아 다음 호출이 다시 시험 호출이 됨"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+
+class LLMClient:
+    """요약과 Q&A가 함께 쓰는 OpenAI 호출 계층
+
+    - 하나의 AsyncOpenAI 클라이언트(연결 풀 공유, keep-alive)를 사용합니다.
+    - 호출마다 시간 제한을 두고, 429/5xx/연결 오류/시간 초과는 지수 백오프 + 지터로 재시도합니다.
+    - 재시도 후에도 실패하는 호출이 이어지면 회로 차단기를 열어 잠시 바로 실패시킵니다.
+    - openai_base_url을 지정하면 로컬 스텁 서버 등 다른 주소로 요청합니다.
+    """
+
+    RETRYABLE_STATUS_CODES = (408, 409, 429)
+    RETRYABLE_ERROR_NAMES = ("APIConnectionError", "APITimeoutError")
+
+    def __init__(self, breaker: Optional[CircuitBreaker] = None):
+        self._client = None
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = settings.llm_max_retries
+        self.timeout = settings.llm_timeout
+
+        self._stats = {
+            "calls": 0,
+            "retries": 0,
+            "failures": 0,
+            "short_circuited": 0,
+        }
+
+    @property
+    def client(self):
+        """AsyncOpenAI 클라이언트 (openai/httpx 패키지는 처음 사용할 때 불러옴)"""
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                base_url=settings.openai_base_url or None,
+                max_retries=0,  # 재시도는 이 클래스에서 처리
+                http_client=httpx.AsyncClient(
+                    timeout=httpx.Timeout(self.timeout, connect=settings.llm_connect_timeout),
+                    limits=httpx.Limits(
+                        max_connections=settings.llm_max_connections,
+                        max_keepalive_connections=settings.llm_max_keepalive_connections,
+                        keepalive_expiry=settings.llm_keepalive_expiry
+                    )
+                )
+            )
+        return self._client
+
+    @client.setter
+    def client(self, value) -> None:
+        self._client = value
+
+    @classmethod
+    def is_retryable(cls, error: BaseException) -> bool:
+        """일시적인 오류(다시 시도하면 성공할 수 있는 오류)인지 확인합니다."""
+        if isinstance(error, asyncio.TimeoutError):
+            return True
+        if type(error).__name__ in cls.RETRYABLE_ERROR_NAMES:
+            return True
+        status_code = getattr(error, "status_code", None)
+        return status_code is not None and (status_code in cls.RETRYABLE_STATUS_CODES or status_code >= 500)
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """attempt번째 재시도 전 대기 시간(초)을 계산합니다. (Retry-After 우선, 없으면 full jitter)"""
+        response = getattr(error, "response", None)
+        retry_after = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), settings.llm_backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(settings.llm_backoff_max, settings.llm_backoff_base * (2 ** attempt)))
+
+    async def chat(self, timeout: Optional[float] = None, **kwargs):
+        """chat.completions.create를 재시도/회로 차단기와 함께 호출하고 응답을 반환합니다."""
+        return await self._call(kwargs, timeout)
+
+    async def stream_chat(self, timeout: Optional[float] = None, **kwargs) -> AsyncIterator:
+        """스트리밍 응답을 반환합니다. 재시도는 스트림을 여는 단계까지만 적용됩니다."""
+        return await self._call({**kwargs, "stream": True}, timeout)
+
+    async def _call(self, kwargs: Dict, timeout: Optional[float]):
+        self._stats["calls"] += 1
+        try:
+            trial = self.breaker.allow()
+        except CircuitOpenError:
+            self._stats["short_circuited"] += 1
+            raise
+
+        timeout = timeout or self.timeout
+        model = kwargs.get("model", "unknown")
+        started = time.perf_counter()
+        try:
+            response = await self._call_with_retries(kwargs, timeout)
+        except asyncio.CancelledError:
+            # 작업 취소/single-flight 대표 요청 취소로 끝나면 성공도 실패도 기록되지 않으므로,
+            # 시험 호출 표시를 풀어 두지 않으면 이후 호출이 계속 차단됨
+            if trial:
+                self.breaker.release()
+            raise
+        except Exception:
+            LLM_REQUEST_SECONDS.labels(model, "error").observe(time.perf_counter() - started)
+            raise
+        LLM_REQUEST_SECONDS.labels(model, "ok").observe(time.perf_counter() - started)
+        record_llm_usage(model, response)
+        return response
+
+    async def _call_with_retries(self, kwargs: Dict, timeout: float):
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await asyncio.wait_for(
+                    self.client.chat.completions.create(timeout=timeout, **kwargs),
+                    timeout
+                )
+            except Exception as e:
+                if not self.is_retryable(e):
+                    # 잘못된 요청 등은 서비스 장애가 아니므로 차단기에 반영하지 않음
+                    self.breaker.record_success()
+                    raise
+                if attempt >= self.max_retries:
+                    self._stats["failures"] += 1
+                    self.breaker.record_failure()
+                    raise LLMUnavailableError(f"AI 서비스가 응답하지 않습니다: {str(e) or type(e).__name__}") from e
+                self._stats["retries"] += 1
+                await asyncio.sleep(self.backoff(attempt, e))
+            else:
+                self.breaker.record_success()
+                return response
+
+    async def close(self) -> None:
+        """연결 풀을 닫습니다."""
+        close = getattr(self._client, "close", None)
+        if close is not None:
+            await close()
+            self._client = None
+
+    def stats(self) -> Dict:
+        """호출/재시도/실패 횟수와 회로 차단기 상태를 반환합니다."""
+        return {
+            **self._stats,
+            "circuit_state": self.breaker.state,
+            "max_retries": self.max_retries,
+            "timeout": self.timeout,
+            "base_url": settings.openai_base_url or None,
+        }
+
+
+# 요약과 Q&A가 함께 쓰는 클라이언트
+llm_client = LLMClient()
@@ -0,0 +1,251 @@
+import logging
+import math
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 요청 단계(수 ms ~ 수십 초)와 작업 풀 대기(수 µs ~ 수 초)를 모두 담을 수 있는 구간
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+logger = logging.getLogger(__name__)
+
+_NAME_INVALID = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _HistogramChild:
+    """라벨 값 하나에 대한 히스토그램 (구간별 개수와 합계만 보관)
+
+    기록은 이벤트 루프 스레드에서만 하므로 lock을 쓰지 않습니다. (요청 경로의 비용을 줄이기 위함)
+    """
+
+    __slots__ = ("_upper_bounds", "_counts", "_sum")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        self._counts = [0] * (len(upper_bounds) + 1)  # 마지막 칸은 +Inf
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect_left(self._upper_bounds, value)] += 1
+        self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        return list(self._counts), self._sum
+
+
+class Histogram:
+    """Prometheus 히스토그램 (labels(...)로 라벨별 하위 히스토그램을 얻어 observe)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._children: Dict[Tuple[str, ...], _HistogramChild] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> _HistogramChild:
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, _HistogramChild(self.buckets))
+        return child
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for values, child in sorted(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, values, f'le="{_format_value(upper_bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, values)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Prometheus 카운터 (히스토그램과 같이 이벤트 루프 스레드에서만 기록)"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, *values: str) -> None:
+        self._values[values] = self._values.get(values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        for values, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, values)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """히스토그램/카운터와 기존 stats() 통계를 Prometheus 텍스트 형식으로 내보내는 저장소
+
+    요청 경로에서는 히스토그램/카운터만 갱신하고, 캐시 적중률/대기열 깊이처럼 각 서비스가
+    이미 stats()로 집계하는 값은 수집(scrape) 시점에 읽어 gauge로 내보내므로 추가 비용이 없습니다.
+    """
+
+    def __init__(self, prefix: str = "gpdf"):
+        self.prefix = prefix
+        self._metrics: List = []
+        self._stats_sources: List[Tuple[str, Callable[[], Dict], Optional[str]]] = []
+        self._stats_errors = self.counter(
+            "stats_collection_errors", "Failures reading a registered stats() source at scrape time.", ("source",)
+        )
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(f"{self.prefix}_{name}", documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(f"{self.prefix}_{name}_total", documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def register_stats(self, name: str, func: Callable[[], Dict], label: Optional[str] = None) -> None:
+        """stats() 함수의 숫자 값을 {prefix}_{name}_{키} gauge로 내보냅니다.
+
+        label이 주어지면 func는 {라벨 값: 통계 딕셔너리}를 반환해야 합니다. (예: 풀 이름별 통계)
+        숫자가 아닌 값(이름, 상태 문자열 등)은 내보내지 않습니다.
+        """
+        self._stats_sources.append((name, func, label))
+
+    def render(self) -> str:
+        """모든 지표를 Prometheus 텍스트 형식(0.0.4)으로 반환합니다.
+
+        stats()를 먼저 읽으므로 이번 수집에서 실패한 통계도 stats_collection_errors에 바로 반영됩니다.
+        """
+        stats_lines: List[str] = []
+        for name, func, label in self._stats_sources:
+            try:
+                stats = func()
+            except Exception:
+                logger.exception("지표 수집 실패 (%s)", name)
+                self._stats_errors.inc(1, name)
+                continue
+            groups = stats.items() if label else [(None, stats)]
+            self._render_stats(stats_lines, f"{self.prefix}_{name}", label, groups)
+
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines + stats_lines) + "\n"
+
+    @staticmethod
+    def _render_stats(lines: List[str], prefix: str, label: Optional[str], groups) -> None:
+        samples: Dict[str, List[str]] = {}
+        for label_value, stats in groups:
+            labels = _format_labels((label,), (label_value,)) if label else ""
+            for key, value in stats.items():
+                if isinstance(value, bool):
+                    value = int(value)
+                elif not isinstance(value, (int, float)):
+                    continue
+                metric_name = _NAME_INVALID.sub("_", f"{prefix}_{key}")
+                samples.setdefault(metric_name, []).append(f"{metric_name}{labels} {_format_value(value)}")
+        for metric_name, metric_lines in samples.items():
+            lines.append(f"# TYPE {metric_name} gauge")
+            lines.extend(metric_lines)
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "stage_duration_seconds", "Time spent in each stage of a request.", ("endpoint", "stage")
+)
+REQUESTS = metrics.counter(
+    "requests", "Finished requests by endpoint and outcome.", ("endpoint", "outcome")
+)
+POOL_WAIT_SECONDS = metrics.histogram(
+    "pool_wait_seconds", "Time a task waited for a worker pool slot.", ("pool",)
+)
+LLM_REQUEST_SECONDS = metrics.histogram(
+    "llm_request_duration_seconds", "LLM call duration including retries.", ("model", "outcome")
+)
+LLM_TOKENS = metrics.counter(
+    "llm_tokens", "LLM token usage reported by the API.", ("model", "type")
+)
+
+# 현재 요청(또는 비동기 작업)의 엔드포인트 이름. 공통 함수의 단계 시간을 호출한 엔드포인트별로 나누어 기록
+_current_endpoint: ContextVar[str] = ContextVar("metrics_endpoint", default="other")
+
+
+class _StageTimer:
+    __slots__ = ("_stage", "_started")
+
+    def __init__(self, stage: str):
+        self._stage = stage
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        STAGE_SECONDS.labels(_current_endpoint.get(), self._stage).observe(time.perf_counter() - self._started)
+        return False
+
+
+def set_endpoint(endpoint: str) -> None:
+    """이후 기록하는 단계 시간을 endpoint로 분류합니다. (전체 시간은 기록하지 않는 배치/스트리밍/비동기 작업용)"""
+    _current_endpoint.set(endpoint)
+
+
+def stage(name: str) -> _StageTimer:
+    """with stage("extract"): ... 블록의 실행 시간을 현재 엔드포인트의 단계 시간으로 기록합니다."""
+    return _StageTimer(name)
+
+
+class RequestTimer:
+    """요청 하나의 전체 시간과 결과를 기록합니다. 생성 시 현재 엔드포인트를 지정합니다."""
+
+    __slots__ = ("endpoint", "_started")
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self._started = time.perf_counter()
+        _current_endpoint.set(endpoint)
+
+    def finish(self) -> None:
+        """finally 블록에서 호출합니다. 처리 중인 예외가 있으면 error로 기록합니다."""
+        STAGE_SECONDS.labels(self.endpoint, "total").observe(time.perf_counter() - self._started)
+        REQUESTS.inc(1, self.endpoint, "error" if sys.exc_info()[0] is not None else "ok")
+
+
+def record_llm_usage(model: str, response) -> None:
+    """응답의 usage(prompt/completion 토큰 수)를 기록합니다. 스트리밍 응답처럼 usage가 없으면 무시합니다."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    for token_type in ("prompt_tokens", "completion_tokens"):
+        count = getattr(usage, token_type, None)
+        if count:
+            LLM_TOKENS.inc(count, model, token_type[:-len("_tokens")])
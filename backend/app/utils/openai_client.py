@@ -1,16 +1,27 @@
-from openai import OpenAI
-from app.config import settings
+from typing import Optional
+
+from app.utils.llm_client import LLMClient, LLMUnavailableError, llm_client
 from app.utils.security import SecurityUtils
+from app.utils.tokenizer import token_counter
 
 
 class OpenAIClient:
     """OpenAI API 클라이언트 래퍼"""
     
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.openai_api_key)
+    def __init__(self, llm: Optional[LLMClient] = None):
+        self.llm = llm or llm_client
         self.security = SecurityUtils()
     
-    def create_chat_completion(
+    @property
+    def client(self):
+        """공유 LLM 계층의 AsyncOpenAI 클라이언트"""
+        return self.llm.client
+    
+    @client.setter
+    def client(self, value) -> None:
+        self.llm.client = value
+    
+    async def create_chat_completion(
         self,
         messages: list,
         model: str = "gpt-3.5-turbo",
@@ -19,23 +30,26 @@ class OpenAIClient:
     ):
         """채팅 완성 요청을 생성합니다."""
         try:
-            response = self.client.chat.completions.create(
+            response = await self.llm.chat(
                 model=model,
                 messages=messages,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
             return response
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"OpenAI API 호출 실패: {str(e)}")
     
-    def create_pdf_qa(
+    async def create_pdf_qa(
         self,
         question: str,
         context: str,
         model: str = "gpt-3.5-turbo",
         max_tokens: int = 500,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        max_context_tokens: int = 1500
     ):
         """PDF 내용을 바탕으로 질문에 답변합니다."""
         try:
@@ -45,7 +59,7 @@ class OpenAIClient:
                 raise ValueError(error_message)
             
             # 안전한 프롬프트 생성
-            prompt = self.security.create_safe_prompt(question, context)
+            prompt = self.security.create_safe_prompt(question, context, max_context_tokens)
             
             # API 호출
             messages = [
@@ -53,17 +67,18 @@ class OpenAIClient:
                 {"role": "user", "content": prompt}
             ]
             
-            response = self.create_chat_completion(
+            response = await self.create_chat_completion(
                 messages=messages,
                 model=model,
                 max_tokens=max_tokens,
                 temperature=temperature
             )
             return response
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             raise ValueError(f"PDF Q&A 생성 실패: {str(e)}")
     
     def estimate_tokens(self, text: str) -> int:
-        """대략적인 토큰 수를 추정합니다."""
-        # 간단한 토큰 추정 (실제로는 tiktoken 라이브러리 사용 권장)
-        return len(text) // 4 
\ No newline at end of file
+        """토큰 수를 계산합니다. (tiktoken이 없으면 한글을 고려한 추정값)"""
+        return token_counter.count(text) 
\ No newline at end of file
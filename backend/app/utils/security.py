@@ -1,6 +1,8 @@
 import re
 from typing import Tuple
 
+from app.utils.tokenizer import token_counter
+
 class SecurityUtils:
     @staticmethod
     def sanitize_input(text: str) -> str:
@@ -40,11 +42,12 @@ class SecurityUtils:
         return True, ""
 
     @staticmethod
-    def create_safe_prompt(question: str, context: str, max_context_length: int = 4000) -> str:
+    def create_safe_prompt(question: str, context: str, max_context_tokens: int = 1500) -> str:
         """안전한 프롬프트를 생성합니다."""
-        # 컨텍스트 길이 제한
-        if len(context) > max_context_length:
-            context = context[:max_context_length] + "..."
+        # 컨텍스트 토큰 수 제한
+        truncated = token_counter.truncate(context, max_context_tokens)
+        if len(truncated) < len(context):
+            context = truncated + "..."
         
         # 프롬프트 템플릿
         template = """
@@ -0,0 +1,67 @@
+from typing import Callable, List
+
+
+def split_paragraphs(text: str, max_size: int, length: Callable[[str], int] = len) -> List[str]:
+    """문단(빈 줄 → 줄바꿈) 경계로 max_size 이하의 조각을 만듭니다.
+    
+    length로 크기를 재는 방법을 바꿀 수 있습니다. (기본: 글자 수, 예: 토큰 수)
+    """
+    for separator in ("\n\n", "\n"):
+        parts = [part for part in text.split(separator) if part.strip()]
+        if len(parts) > 1:
+            break
+    else:
+        # 경계가 없으면 크기 비율에 맞춰 글자 수로 자름
+        step = max(1, len(text) * max_size // max(1, length(text)))
+        return [text[i:i + step] for i in range(0, len(text), step)]
+    
+    separator_size = length(separator)
+    pieces: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    for part in parts:
+        part_size = length(part)
+        if part_size > max_size:
+            if current:
+                pieces.append(separator.join(current))
+                current, current_size = [], 0
+            pieces.extend(split_paragraphs(part, max_size, length))
+            continue
+        if current and current_size + separator_size + part_size > max_size:
+            pieces.append(separator.join(current))
+            current, current_size = [], 0
+        current_size += part_size + (separator_size if current else 0)
+        current.append(part)
+    if current:
+        pieces.append(separator.join(current))
+    return pieces
+
+
+def split_into_chunks(page_texts: List[str], max_size: int, length: Callable[[str], int] = len) -> List[str]:
+    """페이지와 문단 경계를 기준으로 텍스트를 max_size 이하의 청크로 나눕니다.
+    
+    여러 페이지가 한 청크에 들어갈 수 있으면 합치고, 한 페이지가 너무 길면 문단 단위로 나눕니다.
+    """
+    separator_size = length("\n")
+    chunks: List[str] = []
+    current: List[str] = []
+    current_size = 0
+    
+    for page_text in page_texts:
+        page_text = page_text.strip()
+        if not page_text:
+            continue
+        
+        page_size = length(page_text)
+        pieces = [page_text] if page_size <= max_size else split_paragraphs(page_text, max_size, length)
+        for piece in pieces:
+            piece_size = page_size if len(pieces) == 1 else length(piece)
+            if current and current_size + separator_size + piece_size > max_size:
+                chunks.append("\n".join(current))
+                current, current_size = [], 0
+            current_size += piece_size + (separator_size if current else 0)
+            current.append(piece)
+    
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,154 @@
+import functools
+import hashlib
+import math
+import os
+import re
+import tempfile
+from typing import Dict, List, Optional
+
+from app.config import settings
+
+try:
+    import tiktoken  # 선택 사항: 설치되어 있고 어휘 파일이 로컬에 캐시되어 있으면 정확한 토큰 수 사용
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+
+# cl100k_base 기준으로 보정한 문자 종류별 평균 토큰 비용
+# 한글 음절은 대부분 1토큰이지만 드문 음절은 바이트 단위로 쪼개지므로 약간 높게 잡습니다.
+_HANGUL_COST = 1.1
+_CJK_COST = 1.3
+_LATIN_CHARS_PER_TOKEN = 5
+_DIGITS_PER_TOKEN = 3
+_SYMBOL_COST = 1.0
+_ASTRAL_COST = 2.0  # 이모지 등 BMP 밖의 문자
+
+# 한 글자씩 비용이 다른 문자는 한 글자 단위로, 나머지는 묶어서 분리
+_SEGMENT_PATTERN = re.compile(
+    r"[가-힣ㄱ-ㅎㅏ-ㅣ]"
+    r"|[぀-ヿ㐀-䶿一-鿿]"
+    r"|[A-Za-z]+"
+    r"|[0-9]+"
+    r"|\n+"
+    r"|[ \t]+"
+    r"|.",
+    re.DOTALL
+)
+
+# tiktoken이 공개 인코딩 어휘 파일을 받는 주소 (캐시 파일 이름은 이 주소의 sha1)
+_TIKTOKEN_BLOB_URL = "https://openaipublic.blob.core.windows.net/encodings/{}.tiktoken"
+
+# 메시지마다 역할/구분자로 붙는 토큰 수 (OpenAI chat 형식)
+MESSAGE_OVERHEAD_TOKENS = 4
+REPLY_OVERHEAD_TOKENS = 3
+
+
+def _segment_cost(segment: str) -> float:
+    first = segment[0]
+    if "가" <= first <= "힣" or "ㄱ" <= first <= "ㅣ":
+        return _HANGUL_COST
+    if first.isascii():
+        if first.isalpha():
+            return math.ceil(len(segment) / _LATIN_CHARS_PER_TOKEN)
+        if first.isdigit():
+            return math.ceil(len(segment) / _DIGITS_PER_TOKEN)
+        if first == "\n":
+            return 1.0
+        if first in " \t":
+            # 공백은 대부분 다음 단어 토큰에 합쳐짐
+            return 0.0
+        return _SYMBOL_COST
+    if ord(first) > 0xFFFF:
+        return _ASTRAL_COST
+    if "぀" <= first <= "鿿":
+        return _CJK_COST
+    return _SYMBOL_COST
+
+
+class TokenCounter:
+    """오프라인에서 동작하는 토큰 수 계산기
+
+    tiktoken과 인코딩 어휘가 로컬에 있으면 정확한 값을, 없으면 한글/CJK를 구분해
+    보정한 추정값을 사용합니다. 같은 문자열의 반복 계산은 LRU 캐시로 피합니다.
+    어휘 파일은 tiktoken 캐시 폴더(TIKTOKEN_CACHE_DIR)에 이미 있을 때만 불러오고 내려받지 않습니다.
+    (요청 처리 중 네트워크를 기다리며 이벤트 루프를 막지 않도록)
+    """
+
+    def __init__(self, encoding_name: Optional[str] = None, cache_size: int = 4096):
+        self.encoding_name = encoding_name or settings.tokenizer_encoding
+        self._encoding = None
+        self._encoding_loaded = False
+        self.count = functools.lru_cache(maxsize=cache_size)(self._count)
+
+    def _cached_vocab_path(self) -> Optional[str]:
+        """tiktoken이 어휘 파일을 캐시하는 경로를 반환합니다. (tiktoken.load.read_file_cached와 같은 규칙)"""
+        if "TIKTOKEN_CACHE_DIR" in os.environ:
+            cache_dir = os.environ["TIKTOKEN_CACHE_DIR"]
+        elif "DATA_GYM_CACHE_DIR" in os.environ:
+            cache_dir = os.environ["DATA_GYM_CACHE_DIR"]
+        else:
+            cache_dir = os.path.join(tempfile.gettempdir(), "data-gym-cache")
+        if not cache_dir:
+            return None  # 캐시를 끈 경우 항상 내려받으므로 사용하지 않음
+        url = _TIKTOKEN_BLOB_URL.format(self.encoding_name)
+        return os.path.join(cache_dir, hashlib.sha1(url.encode()).hexdigest())
+
+    def _get_encoding(self):
+        if not self._encoding_loaded:
+            self._encoding_loaded = True
+            if tiktoken is not None:
+                try:
+                    vocab_path = self._cached_vocab_path()
+                    if vocab_path is not None and os.path.exists(vocab_path):
+                        self._encoding = tiktoken.get_encoding(self.encoding_name)
+                except Exception:
+                    self._encoding = None  # 어휘 파일을 읽을 수 없으면 추정값 사용
+        return self._encoding
+
+    @property
+    def exact(self) -> bool:
+        """정확한 토크나이저를 사용하는지 여부"""
+        return self._get_encoding() is not None
+
+    def _count(self, text: str) -> int:
+        if not text:
+            return 0
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return math.ceil(sum(_segment_cost(match.group()) for match in _SEGMENT_PATTERN.finditer(text)))
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """chat 메시지 목록의 토큰 수를 계산합니다."""
+        return sum(
+            MESSAGE_OVERHEAD_TOKENS + self.count(message.get("content", ""))
+            for message in messages
+        ) + REPLY_OVERHEAD_TOKENS
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """텍스트를 max_tokens 이하가 되도록 앞에서부터 최대한 채워 자릅니다."""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+
+        encoding = self._get_encoding()
+        if encoding is not None:
+            return encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+
+        total = 0.0
+        for match in _SEGMENT_PATTERN.finditer(text):
+            cost = _segment_cost(match.group())
+            if math.ceil(total + cost) > max_tokens:
+                return text[:match.start()]
+            total += cost
+        return text
+
+
+def token_budget(budgets: Dict[str, int], model: str) -> int:
+    """모델별 토큰 예산을 반환합니다. 모델이 없으면 'default' 값을 사용합니다."""
+    return budgets.get(model, budgets.get("default", 0))
+
+
+# 프로세스 전역에서 공유하는 계산기 (메모이제이션 캐시 공유)
+token_counter = TokenCounter()
\ No newline at end of file
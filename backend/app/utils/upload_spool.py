@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import tempfile
+from typing import Dict, Optional
+
+import aiofiles
+from fastapi import UploadFile
+
+from app.config import settings
+
+
+class UploadTooLargeError(Exception):
+    """업로드 크기가 제한을 넘었을 때 발생하는 예외"""
+
+
+class SpooledUpload:
+    """디스크에 저장된 업로드 파일 (경로, 크기, 내용 해시)
+
+    PDF 파서는 이 경로에서 직접 파일을 열므로 업로드 내용을 메모리에 다시 올리지 않습니다.
+    사용이 끝나면 cleanup()으로 임시 파일을 지워야 합니다.
+    """
+
+    def __init__(self, path: str, size: int, file_hash: str):
+        self.path = path
+        self.size = size
+        self.file_hash = file_hash
+
+    def cleanup(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+async def spool_upload(
+    file: UploadFile,
+    max_size: Optional[int] = None,
+    spool_dir: Optional[str] = None,
+    chunk_size: Optional[int] = None
+) -> SpooledUpload:
+    """업로드를 청크 단위로 임시 파일에 옮기며 md5를 계산합니다.
+
+    max_size를 넘는 순간 중단하고 UploadTooLargeError를 발생시키므로 메모리 사용량은 청크 크기로 제한됩니다.
+    """
+    max_size = max_size if max_size is not None else settings.max_file_size
+    chunk_size = chunk_size or settings.upload_chunk_size
+    spool_dir = spool_dir or settings.upload_spool_dir or None
+    if spool_dir:
+        os.makedirs(spool_dir, exist_ok=True)
+
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=".pdf", dir=spool_dir)
+    os.close(fd)
+    digest = hashlib.md5()
+    size = 0
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_size:
+                    raise UploadTooLargeError(f"업로드 크기가 {max_size}바이트를 초과합니다.")
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return SpooledUpload(path, size, digest.hexdigest())
+
+
+class UploadSizeLimitMiddleware:
+    """multipart 업로드 요청 본문이 제한을 넘으면 본문을 끝까지 받기 전에 413으로 응답하는 ASGI 미들웨어
+
+    Content-Length가 제한보다 크면 본문을 읽지 않고 바로 거절하고,
+    길이를 알 수 없는(chunked) 요청은 받은 바이트를 세다가 제한을 넘는 순간 중단합니다.
+    여러 파일을 받는 경로는 path_limits로 경로별 제한을 따로 지정할 수 있습니다.
+    """
+
+    # 폼 필드와 multipart 경계 문자열을 위한 여유분
+    MULTIPART_OVERHEAD = 64 * 1024
+
+    def __init__(
+        self,
+        app,
+        max_body_size: Optional[int] = None,
+        detail: str = "",
+        path_limits: Optional[Dict[str, int]] = None
+    ):
+        self.app = app
+        self.max_body_size = max_body_size or settings.max_file_size + self.MULTIPART_OVERHEAD
+        self.path_limits = path_limits or {}
+        self.detail = detail or f"파일 크기가 {settings.max_file_size // (1024*1024)}MB를 초과합니다."
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or not self._is_multipart(scope):
+            await self.app(scope, receive, send)
+            return
+
+        max_body_size = self.path_limits.get(scope.get("path", ""), self.max_body_size)
+        content_length = self._content_length(scope)
+        if content_length is not None and content_length > max_body_size:
+            await self._reject(send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            if exceeded:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body_size:
+                    # 파서에는 연결이 끊긴 것처럼 보이게 해 더 읽지 않도록 함
+                    exceeded = True
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded:
+                return  # 앱이 만든 오류 응답 대신 413을 보냄
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+        if exceeded and not response_started:
+            await self._reject(send)
+
+    @staticmethod
+    def _is_multipart(scope) -> bool:
+        for key, value in scope.get("headers", []):
+            if key == b"content-type":
+                return value.startswith(b"multipart/form-data")
+        return False
+
+    @staticmethod
+    def _content_length(scope) -> Optional[int]:
+        for key, value in scope.get("headers", []):
+            if key == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    async def _reject(self, send) -> None:
+        body = json.dumps({"detail": self.detail}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
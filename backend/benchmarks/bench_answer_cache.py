@@ -0,0 +1,130 @@
+"""Q&A 답변 캐시 벤치마크: 같은 문서에 대한 비슷한 질문의 LLM 호출 수와 응답 시간
+
+실행: python -m benchmarks.bench_answer_cache [--rounds 5] [--llm-delay 0.3]
+
+가짜 LLM 백엔드로 앱을 uvicorn에서 실행하고 PDF 하나를 요약한 뒤,
+여러 사용자가 묻는 것처럼 같은 질문의 변형(공백/대소문자/문장부호/어미 차이)을 /qa로 보냅니다.
+캐시 조회 자체의 비용(문서당 답변이 가득 찬 상태의 유사 질문 검색)도 측정합니다.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import make_pdf
+
+QUESTIONS = [
+    ["이 문서의 결론은 무엇인가요?", "이 문서의 결론은 무엇인가요", "  이 문서의  결론은 무엇인가요 ?"],
+    ["결론이 뭐야?", "결론이 뭐야", "결론이 뭐야요?"],
+    ["What is the conclusion?", "what is the conclusion", "what's the conclusion?"],
+    ["What are the main findings?", "WHAT ARE THE MAIN FINDINGS?", "What are the main findings??"],
+    ["2장의 핵심 내용은?", "2장의 핵심 내용은", "2장의 핵심 내용은…"],
+]
+
+
+class CountingCompletions:
+    """호출 수를 세고 고정 지연 후 답을 돌려주는 가짜 OpenAI 백엔드"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="답변"))])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_lookup(per_file: int, repeats: int = 2000) -> float:
+    """문서당 답변이 per_file개 있을 때 유사 질문 조회(캐시 실패) 한 번의 평균 시간(µs)"""
+    from app.core.answer_cache import AnswerCache
+
+    cache = AnswerCache(max_entries=per_file * 2, max_entries_per_file=per_file, similarity_threshold=0.8)
+    for i in range(per_file):
+        cache.set("doc", "v1", f"질문 {i}번 문서의 내용은 무엇인가요 {'가' * (i % 7)}", {"answer": "답변"})
+    started = time.perf_counter()
+    for _ in range(repeats):
+        cache.get("doc", "v1", "전혀 다른 질문으로 캐시에 없는 내용입니다")
+    return (time.perf_counter() - started) / repeats * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--llm-delay", type=float, default=0.3)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("STARTUP_WARM_UP", "off")
+    os.environ.setdefault("PDF_POOL_KIND", "thread")
+    os.environ["SUMMARY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.chdir(workdir)
+
+    import httpx
+    import uvicorn
+    from app.main import app
+    from app.api.v1.endpoints import pdf as pdf_module
+
+    completions = CountingCompletions(args.llm_delay)
+    pdf_module.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=None) as client:
+            response = client.post(
+                "/api/v1/pdf/summarize",
+                files={"file": ("doc.pdf", make_pdf(pages=3, seed=1, varied=True), "application/pdf")},
+                data={"session_id": "bench"}
+            )
+            file_id = response.json()["file_id"]
+            time.sleep(0.5)  # 페이지 텍스트 등록(백그라운드) 대기
+            completions.calls = 0
+
+            latencies = []
+            for _ in range(args.rounds):
+                for variants in QUESTIONS:
+                    for question in variants:
+                        started = time.perf_counter()
+                        response = client.post("/api/v1/pdf/qa", json={"file_id": file_id, "question": question})
+                        response.raise_for_status()
+                        latencies.append(time.perf_counter() - started)
+
+            stats = client.get("/api/v1/pdf/qa/cache/stats")
+            stats = stats.json() if stats.status_code == 200 else {}
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    requests = len(latencies)
+    misses = sorted(latencies)[-completions.calls:] if completions.calls else []
+    hits = sorted(latencies)[:requests - completions.calls]
+    print(f"{requests} questions ({len(QUESTIONS)} distinct x 3 variants x {args.rounds} rounds), LLM delay {args.llm_delay * 1000:.0f}ms")
+    print(f"LLM calls {completions.calls}, mean latency {statistics.mean(latencies) * 1000:.1f}ms")
+    if hits:
+        print(f"cached answers: median {statistics.median(hits) * 1000:.1f}ms; uncached: median {statistics.median(misses) * 1000:.1f}ms")
+    if stats:
+        print(f"cache stats: exact {stats['exact_hits']}, near {stats['near_hits']}, misses {stats['misses']}")
+        for per_file in (16, 64, 256):
+            print(f"lookup miss with {per_file} cached answers per document: {measure_lookup(per_file):.1f}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""배치 요약 벤치마크: 파일마다 /summarize 요청 vs /summarize/batch 한 번
+
+실행: python -m benchmarks.bench_batch [--files 8] [--pages 3] [--llm-delay 0.5]
+
+가짜 LLM 백엔드(호출마다 --llm-delay초 지연)로 앱을 uvicorn에서 실행하고
+같은 파일 묶음을 순차 요청과 배치 요청으로 보내 전체 시간을 비교합니다. (요청마다 다른 문서를 써서 캐시 적중을 피함)
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import make_pdf
+
+
+class DelayedCompletions:
+    """호출마다 고정 지연 후 답을 돌려주는 가짜 OpenAI 백엔드"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="요약"))])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_sequential(base_url: str, documents: list) -> tuple:
+    import httpx
+
+    started = time.perf_counter()
+    statuses = []
+    with httpx.Client(base_url=base_url, timeout=None) as client:
+        for index, contents in enumerate(documents):
+            response = client.post(
+                "/api/v1/pdf/summarize",
+                files={"file": (f"doc{index}.pdf", contents, "application/pdf")},
+                data={"session_id": "bench-sequential"}
+            )
+            statuses.append(response.status_code)
+    return time.perf_counter() - started, statuses
+
+
+def run_batch(base_url: str, documents: list) -> tuple:
+    import httpx
+
+    started = time.perf_counter()
+    with httpx.Client(base_url=base_url, timeout=None) as client:
+        response = client.post(
+            "/api/v1/pdf/summarize/batch",
+            files=[("files", (f"doc{index}.pdf", contents, "application/pdf")) for index, contents in enumerate(documents)],
+            data={"session_id": "bench-batch"}
+        )
+    elapsed = time.perf_counter() - started
+    body = response.json()
+    item_times = [result["processing_time"] for result in body["results"]]
+    return elapsed, [result["status_code"] for result in body["results"]], item_times
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=8)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--llm-delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("STARTUP_WARM_UP", "off")
+    os.environ["SUMMARY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["DAILY_LIMIT"] = str(args.files * 10)
+    os.environ["BATCH_MAX_FILES"] = str(max(args.files, 10))
+    os.environ["BATCH_CONCURRENCY"] = str(args.files)
+    os.chdir(workdir)
+
+    import uvicorn
+    from app.main import app
+    from app.api.v1.endpoints import pdf as pdf_module
+
+    pdf_module.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=DelayedCompletions(args.llm_delay)))
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        # 워커 프로세스 기동 비용이 측정에 섞이지 않도록 먼저 한 번 요청
+        run_sequential(base_url, [make_pdf(pages=1, seed=10_000)])
+
+        sequential_docs = [make_pdf(pages=args.pages, seed=index, varied=True) for index in range(args.files)]
+        batch_docs = [make_pdf(pages=args.pages, seed=1000 + index, varied=True) for index in range(args.files)]
+
+        sequential_time, sequential_statuses = run_sequential(base_url, sequential_docs)
+        batch_time, batch_statuses, item_times = run_batch(base_url, batch_docs)
+
+        print(f"{args.files} files x {args.pages} pages, LLM delay {args.llm_delay * 1000:.0f}ms")
+        print(f"sequential /summarize : {sequential_time * 1000:7.0f}ms  statuses={sorted(set(sequential_statuses))}")
+        print(
+            f"/summarize/batch      : {batch_time * 1000:7.0f}ms  statuses={sorted(set(batch_statuses))}  "
+            f"slowest item {max(item_times) * 1000:.0f}ms"
+        )
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
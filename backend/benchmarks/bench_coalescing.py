@@ -0,0 +1,118 @@
+"""요청 합치기(single-flight) 벤치마크: 같은 PDF를 동시에 요약 요청할 때 LLM 호출 수와 지연 시간
+
+실행: python -m benchmarks.bench_coalescing [--clients 20] [--pages 3] [--llm-delay 0.5]
+
+가짜 LLM 백엔드(호출마다 --llm-delay초 지연)로 앱을 uvicorn에서 실행하고
+--clients개의 서로 다른 세션이 같은 PDF를 동시에 /summarize로 보냅니다.
+LLM 호출 수, 전체/개별 응답 시간, 세션별 사용량 차감을 확인합니다.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import make_pdf
+
+
+class CountingCompletions:
+    """호출 수를 세고 고정 지연 후 답을 돌려주는 가짜 OpenAI 백엔드"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="요약"))])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def burst(base_url: str, contents: bytes, clients: int, session_prefix: str = "student") -> dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        async def one(index: int):
+            started = time.perf_counter()
+            response = await client.post(
+                "/api/v1/pdf/summarize",
+                files={"file": ("same.pdf", contents, "application/pdf")},
+                data={"session_id": f"{session_prefix}-{index}"}
+            )
+            return response.status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(one(index) for index in range(clients)))
+        wall = time.perf_counter() - started
+
+        usage = await asyncio.gather(*(client.get(f"/api/v1/pdf/usage/{session_prefix}-{index}") for index in range(clients)))
+        flights = await client.get("/api/v1/pdf/flights/stats")
+
+    latencies = sorted(latency for _, latency in results)
+    return {
+        "statuses": sorted({status for status, _ in results}),
+        "wall": wall,
+        "p50": latencies[len(latencies) // 2],
+        "max": latencies[-1],
+        "charged": sorted({response.json()["usage_count"] for response in usage}),
+        "flights": flights.json() if flights.status_code == 200 else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--llm-delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("STARTUP_WARM_UP", "off")
+    os.environ["SUMMARY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.chdir(workdir)
+
+    import uvicorn
+    from app.main import app
+    from app.api.v1.endpoints import pdf as pdf_module
+
+    completions = CountingCompletions(args.llm_delay)
+    pdf_module.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        # 워커 프로세스 기동 비용이 측정에 섞이지 않도록 다른 문서로 먼저 한 번 요청
+        asyncio.run(burst(base_url, make_pdf(pages=1, seed=10_000), 1, session_prefix="warm-up"))
+        completions.calls = 0
+
+        result = asyncio.run(burst(base_url, make_pdf(pages=args.pages, seed=1, varied=True), args.clients))
+        print(f"{args.clients} clients, same {args.pages}-page PDF, LLM delay {args.llm_delay * 1000:.0f}ms")
+        print(
+            f"statuses={result['statuses']} LLM calls={completions.calls} wall {result['wall'] * 1000:.0f}ms "
+            f"p50 {result['p50'] * 1000:.0f}ms max {result['max'] * 1000:.0f}ms usage per session={result['charged']}"
+        )
+        if result["flights"] is not None:
+            print(f"flights: {result['flights']}")
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
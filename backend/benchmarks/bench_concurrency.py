@@ -0,0 +1,117 @@
+"""동시 요청 처리량 벤치마크: 지연이 있는 로컬 스텁 LLM으로 /summarize 처리량 측정
+
+실행: python -m benchmarks.bench_concurrency [--latency 0.5] [--requests 32] [--concurrency 1 4 8 16]
+
+llm_max_concurrency 값별로 처리량과, 부하 중 /health 응답 시간을 출력합니다.
+처리량은 설정한 동시 실행 수에 비례해 늘어나야 하며 /health는 LLM 지연에 영향받지 않아야 합니다.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import make_pdf
+
+
+class StubCompletions:
+    """지정한 지연 후 고정 응답을 돌려주는 chat.completions 대역"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(self.latency)
+        message = SimpleNamespace(content="스텁 요약입니다.")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message)],
+            usage=SimpleNamespace(prompt_tokens=0, completion_tokens=0, total_tokens=0)
+        )
+
+
+def stub_client(latency: float) -> SimpleNamespace:
+    return SimpleNamespace(chat=SimpleNamespace(completions=StubCompletions(latency)))
+
+
+async def run_level(app, pdf_module, concurrency: int, latency: float, documents: list) -> dict:
+    import httpx
+    from app.core.worker_pool import WorkerPool
+
+    pdf_module.summarizer.client = stub_client(latency)
+    pdf_module.llm_pool = WorkerPool("llm", concurrency, kind="async")
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def summarize(index: int, contents: bytes) -> int:
+            response = await client.post(
+                "/api/v1/pdf/summarize",
+                files={"file": (f"doc{index}.pdf", contents, "application/pdf")},
+                data={"session_id": f"bench-{concurrency}-{index}"}
+            )
+            return response.status_code
+
+        async def probe_health(stop: asyncio.Event, samples: list) -> None:
+            while not stop.is_set():
+                started = time.perf_counter()
+                await client.get("/health")
+                samples.append(time.perf_counter() - started)
+                await asyncio.sleep(0.05)
+
+        stop = asyncio.Event()
+        health_samples: list = []
+        probe = asyncio.create_task(probe_health(stop, health_samples))
+
+        started = time.perf_counter()
+        statuses = await asyncio.gather(*(summarize(i, doc) for i, doc in enumerate(documents)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await probe
+
+    return {
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "throughput_rps": len(documents) / elapsed,
+        "ok": sum(1 for status in statuses if status == 200),
+        "health_max_ms": max(health_samples) * 1000 if health_samples else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--requests", type=int, default=32)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("PDF_POOL_KIND", "thread")
+    os.environ["SUMMARY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["DAILY_LIMIT"] = "1000000"
+    os.chdir(workdir)
+
+    from app.main import app
+    from app.api.v1.endpoints import pdf as pdf_module
+
+    async def run_all() -> None:
+        # 풀의 세마포어가 하나의 이벤트 루프에 묶이므로 모든 수준을 같은 루프에서 실행
+        for concurrency in args.concurrency:
+            # 캐시 적중을 피하기 위해 수준마다 서로 다른 문서를 사용
+            documents = [
+                make_pdf(pages=1, image_bytes_per_page=300, seed=concurrency * 100000 + i)
+                for i in range(args.requests)
+            ]
+            result = await run_level(app, pdf_module, concurrency, args.latency, documents)
+            print(
+                f"concurrency={result['concurrency']:>3}: {result['throughput_rps']:.2f} req/s "
+                f"({result['ok']}/{args.requests} ok, {result['elapsed_s']:.2f}s), "
+                f"/health max {result['health_max_ms']:.1f}ms"
+            )
+
+    asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""여러 형식 변환 벤치마크: 형식별 /convert 호출 vs /convert/bundle 한 번
+
+실행: python -m benchmarks.bench_convert_bundle [--runs 10] [--formats docx pdf txt html]
+
+매 회 다른 요약 텍스트를 사용하므로 저장된 변환 파일 재사용 없이 렌더링 시간만 비교합니다.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.fixtures import KOREAN
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--formats", nargs="+", default=["docx", "pdf", "txt", "html"])
+    args = parser.parse_args()
+
+    # 변환 파일이 저장소 안에 쌓이지 않도록 임시 폴더에서 실행
+    os.chdir(tempfile.mkdtemp(prefix="gpdf-bench-bundle-"))
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ["RATE_LIMIT_BACKEND"] = "memory"
+    os.environ["STARTUP_WARM_UP"] = "blocking"
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+    from app.api.v1.endpoints import pdf
+
+    pdf.rate_limiter.increment_usage("bench")
+    base = "\n\n".join([KOREAN] * 8)
+
+    with TestClient(app) as client:
+        separate, bundled, zipped = [], [], []
+        for run in range(args.runs):
+            text = f"{base}\n\n#{run}-separate"
+            started = time.perf_counter()
+            for fmt in args.formats:
+                response = client.post("/api/v1/pdf/convert", data={"summary_text": text, "format": fmt, "session_id": "bench"})
+                response.raise_for_status()
+            separate.append(time.perf_counter() - started)
+
+            for delivery, timings in (("manifest", bundled), ("zip", zipped)):
+                text = f"{base}\n\n#{run}-{delivery}"
+                started = time.perf_counter()
+                response = client.post("/api/v1/pdf/convert/bundle", data={
+                    "summary_text": text,
+                    "formats": ",".join(args.formats),
+                    "session_id": "bench",
+                    "delivery": delivery,
+                })
+                response.raise_for_status()
+                timings.append(time.perf_counter() - started)
+
+    print(f"formats: {', '.join(args.formats)} (convert pool workers: {pdf.settings.convert_pool_workers})")
+    print(f"separate /convert calls:  median {statistics.median(separate) * 1000:.1f}ms")
+    print(f"/convert/bundle manifest: median {statistics.median(bundled) * 1000:.1f}ms")
+    print(f"/convert/bundle zip:      median {statistics.median(zipped) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
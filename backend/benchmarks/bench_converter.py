@@ -0,0 +1,72 @@
+"""DocumentConverter 벤치마크: 형식별 변환 지연 (요청마다 폰트 탐색 vs 프로세스 캐시)
+
+실행: python -m benchmarks.bench_converter [--runs 30] [--font-path /path/to/font.ttf]
+
+before는 예전처럼 요청마다 matplotlib 폰트 목록을 훑고 TTF를 reportlab에 다시 등록한 뒤 변환하고,
+after는 한 번 등록한 폰트를 공유하는 변환기로 변환합니다.
+시스템에 한글 폰트가 없으면 --font-path의 TTF(기본: matplotlib 내장 DejaVuSans)를 등록 대상으로 사용합니다.
+"""
+import argparse
+import os
+import statistics
+import time
+
+from benchmarks.fixtures import KOREAN
+
+FORMATS = ("docx", "pdf", "txt")
+
+
+def default_font_path() -> str:
+    import matplotlib
+
+    return os.path.join(os.path.dirname(matplotlib.__file__), "mpl-data", "fonts", "ttf", "DejaVuSans.ttf")
+
+
+def measure(convert, runs: int) -> float:
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        convert()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--font-path", default=None)
+    args = parser.parse_args()
+
+    from app.config import settings
+    from app.core import converter as converter_module
+
+    font_path = args.font_path or default_font_path()
+    fallback_font = {"name": os.path.splitext(os.path.basename(font_path))[0], "path": font_path}
+    text = "\n\n".join([KOREAN] * 6)
+
+    started = time.perf_counter()
+    import matplotlib.font_manager  # noqa: F401  (예전 코드는 모듈 import 시점에 불러옴)
+    print(f"matplotlib.font_manager import: {(time.perf_counter() - started) * 1000:.0f}ms (one-time)")
+
+    def per_request(fmt: str):
+        def convert():
+            # 예전 DocumentConverter.__init__과 같은 작업: 폰트 탐색 + 등록
+            font = converter_module._discover_korean_font() or fallback_font
+            converter_module._register_korean_font(font)
+            getattr(converter_module.DocumentConverter(), f"to_{fmt}")(text)
+        return convert
+
+    settings.korean_font_path = font_path
+    shared = converter_module.DocumentConverter()
+    started = time.perf_counter()
+    shared.warm_up()
+    print(f"warm_up (configured font path): {(time.perf_counter() - started) * 1000:.1f}ms (one-time)")
+
+    for fmt in FORMATS:
+        before = measure(per_request(fmt), args.runs)
+        after = measure(lambda: getattr(shared, f"to_{fmt}")(text), args.runs)
+        print(f"{fmt:>5}: before {before * 1000:8.3f}ms  after {after * 1000:8.3f}ms  (saved {(before - after) * 1000:.1f}ms/request)")
+
+
+if __name__ == "__main__":
+    main()
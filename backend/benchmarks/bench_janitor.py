@@ -0,0 +1,65 @@
+"""다운로드 폴더 정리 벤치마크: cleanup_old_files(전체 listdir + getctime) vs DownloadJanitor 인덱스
+
+실행: python -m benchmarks.bench_janitor [--files 10000] [--file-bytes 4096]
+
+정리할 파일이 없는 평상시 주기 비용과, 용량을 절반으로 줄였을 때의 LRU 정리 결과를 비교합니다.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+
+def populate(directory: str, files: int, file_bytes: int) -> None:
+    payload = b"x" * file_bytes
+    now = time.time()
+    for i in range(files):
+        path = os.path.join(directory, f"summary_{i:08d}.txt")
+        with open(path, "wb") as f:
+            f.write(payload)
+        # 접근 시각을 최근 몇 시간에 고르게 퍼뜨림 (i가 작을수록 오래전에 접근)
+        accessed_at = now - (files - i) * 3600 / files
+        os.utime(path, (accessed_at, accessed_at))
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10_000)
+    parser.add_argument("--file-bytes", type=int, default=4096)
+    args = parser.parse_args()
+
+    from app.core.download_janitor import DownloadJanitor
+    from app.utils.file_utils import cleanup_old_files
+
+    directory = tempfile.mkdtemp(prefix="gpdf-bench-downloads-")
+    populate(directory, args.files, args.file_bytes)
+    total_bytes = args.files * args.file_bytes
+    print(f"{args.files} files, {total_bytes / 1024 / 1024:.1f}MB")
+
+    _, legacy_ms = timed(cleanup_old_files, directory, 24)
+    print(f"cleanup_old_files (nothing to delete): {legacy_ms:.1f}ms per run")
+
+    janitor = DownloadJanitor(directory, max_age_seconds=24 * 3600, max_bytes=total_bytes, rescan_interval=10 ** 9)
+    _, rescan_ms = timed(janitor.rescan)
+    print(f"janitor rescan (startup / hourly):     {rescan_ms:.1f}ms")
+    _, sweep_ms = timed(janitor.sweep)
+    print(f"janitor sweep (nothing to delete):     {sweep_ms:.3f}ms per run")
+
+    janitor.max_bytes = total_bytes // 2
+    reclaimed, evict_ms = timed(janitor.sweep)
+    stats = janitor.stats()
+    oldest_left = min(os.listdir(directory))
+    print(
+        f"janitor sweep (quota halved):          {evict_ms:.1f}ms, reclaimed {reclaimed / 1024 / 1024:.1f}MB, "
+        f"evicted {stats['quota_evicted_files']} files, oldest remaining {oldest_left}"
+    )
+
+
+if __name__ == "__main__":
+    main()
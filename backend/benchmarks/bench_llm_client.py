@@ -0,0 +1,101 @@
+"""공유 LLM 클라이언트 벤치마크: 일시적 오류/장애 상황에서 성공률과 지연 시간
+
+실행: python -m benchmarks.bench_llm_client [--calls 200] [--concurrency 20] [--latency 0.05] [--error-rate 0.2]
+
+로컬 가짜 OpenAI 서버(benchmarks.fake_openai)에 오류를 주입하고 다음 두 방식을 비교합니다.
+    - sdk: 기존처럼 AsyncOpenAI 기본 설정으로 직접 호출 (SDK 기본 재시도 2회)
+    - llm_client: 공유 LLMClient (연결 풀, 호출별 시간 제한, 백오프 + 지터, 회로 차단기)
+장애 시나리오(오류 비율 100%)에서는 회로 차단기가 열린 뒤 실패가 얼마나 빨리 반환되는지 봅니다.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+from benchmarks.fake_openai import FakeOpenAIConfig, FakeOpenAIServer
+
+MESSAGES = [{"role": "user", "content": "요약해주세요"}]
+
+
+async def drive(call, calls: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = {}
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await call()
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                name = type(e).__name__
+                errors[name] = errors.get(name, 0) + 1
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    ordered = sorted(latencies)
+    return {
+        "success": calls - sum(errors.values()),
+        "errors": errors,
+        "p50_ms": statistics.median(ordered) * 1000,
+        "p99_ms": ordered[int(len(ordered) * 0.99) - 1] * 1000,
+        "wall_ms": (time.perf_counter() - started) * 1000,
+    }
+
+
+def report(label: str, calls: int, result: dict) -> None:
+    print(
+        f"  {label:<11} success {result['success']:>4}/{calls}  p50 {result['p50_ms']:7.0f}ms  "
+        f"p99 {result['p99_ms']:7.0f}ms  wall {result['wall_ms']:7.0f}ms  errors {result['errors']}"
+    )
+
+
+async def run_scenario(base_url: str, calls: int, concurrency: int) -> None:
+    from openai import AsyncOpenAI
+    from app.utils.llm_client import CircuitBreaker, LLMClient
+
+    sdk = AsyncOpenAI(api_key="bench", base_url=base_url)
+    result = await drive(
+        lambda: sdk.chat.completions.create(model="gpt-3.5-turbo", messages=MESSAGES, max_tokens=50),
+        calls, concurrency
+    )
+    report("sdk", calls, result)
+    await sdk.close()
+
+    shared = LLMClient(CircuitBreaker())
+    result = await drive(
+        lambda: shared.chat(model="gpt-3.5-turbo", messages=MESSAGES, max_tokens=50),
+        calls, concurrency
+    )
+    report("llm_client", calls, result)
+    print(f"  {'':<11} {shared.stats()}")
+    await shared.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    args = parser.parse_args()
+
+    config = FakeOpenAIConfig(latency=args.latency, error_rate=args.error_rate, tokens=20)
+    with FakeOpenAIServer(config) as server:
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ.setdefault("OPENAI_API_KEY", "bench")
+
+        print(f"transient errors: {args.error_rate:.0%} of responses are {config.error_status}")
+        asyncio.run(run_scenario(server.base_url, args.calls, args.concurrency))
+
+        config.error_rate = 1.0
+        print("outage: every response is an error")
+        asyncio.run(run_scenario(server.base_url, args.calls, args.concurrency))
+        print(f"fake server counters: {config.counters}")
+
+
+if __name__ == "__main__":
+    main()
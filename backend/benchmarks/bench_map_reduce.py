@@ -0,0 +1,102 @@
+"""Map-reduce 요약 벤치마크: 청크 병렬 요약의 총 소요 시간 vs 청크 지연 합계
+
+실행: python -m benchmarks.bench_map_reduce [--pages 40] [--concurrency 8] [--latency 0.2 0.6]
+
+지연이 무작위인 스텁 LLM으로 GPTSummarizer.summarize_long을 실행하고
+총 소요 시간을 '가장 느린 청크(단계별)'와 '모든 호출 지연의 합'과 비교합니다.
+--fail-once를 주면 한 청크를 한 번 실패시킨 뒤, 재요청 시 부분 요약이 재사용되는지 확인합니다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import LOREM
+
+
+class StubCompletions:
+    """호출마다 무작위 지연을 주고, 지연 기록을 남기는 chat.completions 대역"""
+
+    def __init__(self, min_latency: float, max_latency: float, seed: int = 0):
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.fail_next = 0
+
+    async def create(self, **kwargs):
+        latency = self.rng.uniform(self.min_latency, self.max_latency)
+        self.latencies.append(latency)
+        await asyncio.sleep(latency)
+        if self.fail_next > 0:
+            self.fail_next -= 1
+            raise RuntimeError("injected failure")
+        content = f"부분 요약 ({len(kwargs['messages'][-1]['content'])}자)"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def make_pages(pages: int, chars_per_page: int) -> list:
+    paragraph = LOREM + "\n\n"
+    repeat = max(1, chars_per_page // len(paragraph))
+    return [f"[page {i + 1}]\n" + paragraph * repeat for i in range(pages)]
+
+
+async def run(args) -> None:
+    from app.core.summarizer import GPTSummarizer
+    from app.utils.text_utils import split_into_chunks
+    from app.core.summary_cache import SummaryCache
+    from app.utils.tokenizer import token_counter
+
+    summarizer = GPTSummarizer()
+    stub = StubCompletions(args.latency[0], args.latency[1])
+    summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=stub))
+    cache = SummaryCache(cache_dir=tempfile.mkdtemp(prefix="gpdf-bench-cache-"))
+
+    page_texts = make_pages(args.pages, args.chars_per_page)
+    chunks = split_into_chunks(page_texts, args.chunk_tokens, token_counter.count)
+    print(f"{args.pages} pages -> {len(chunks)} chunks (chunk_tokens={args.chunk_tokens}, concurrency={args.concurrency})")
+
+    if args.fail_once:
+        # 청크 하나를 실패시키고 요청 단위 재시도에서 부분 요약이 재사용되는지 확인
+        stub.fail_next = 1
+
+    started = time.perf_counter()
+    try:
+        await summarizer.summarize_long(
+            page_texts, cache=cache, chunk_tokens=args.chunk_tokens, concurrency=args.concurrency
+        )
+    except ValueError as e:
+        print(f"first attempt failed: {e}")
+        calls_before = len(stub.latencies)
+        started = time.perf_counter()
+        await summarizer.summarize_long(
+            page_texts, cache=cache, chunk_tokens=args.chunk_tokens, concurrency=args.concurrency
+        )
+        print(f"retry made {len(stub.latencies) - calls_before} LLM calls (partial summaries reused from cache)")
+    elapsed = time.perf_counter() - started
+
+    map_latencies = stub.latencies[:len(chunks)]
+    print(f"elapsed:             {elapsed:.2f}s")
+    print(f"slowest map chunk:   {max(map_latencies):.2f}s")
+    print(f"sum of all calls:    {sum(stub.latencies):.2f}s ({len(stub.latencies)} calls)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--chars-per-page", type=int, default=3000)
+    parser.add_argument("--chunk-tokens", type=int, default=1500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, nargs=2, default=[0.2, 0.6])
+    parser.add_argument("--fail-once", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
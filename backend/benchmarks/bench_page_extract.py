@@ -0,0 +1,95 @@
+"""페이지 병렬 추출 벤치마크: 큰 PDF를 PDFProcessor.parse(단일 작업자) vs PageExtractor(1/2/4/8 작업자)
+
+실행: python -m benchmarks.bench_page_extract [--pages 500] [--shard-pages 16] [--repeat 3]
+
+작업자를 미리 띄운 뒤(시작 시 warm_up과 같음) 다음을 측정합니다.
+    - 전체 추출 시간 (캐시 없이, 매번 다른 문서 해시로 요청해 작업자가 문서를 새로 열도록 함)
+    - 첫 페이지를 받기까지의 시간 (iter_pages를 소비하는 쪽이 기다리는 시간)
+    - 같은 문서를 다시 요청할 때 (페이지 캐시 적중)
+병렬 추출의 이득은 CPU 코어 수에 따라 달라지므로 결과와 함께 코어 수를 출력합니다.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.fixtures import make_pdf, write_fixture
+
+
+async def measure(extractor, path: str, run: int) -> dict:
+    doc_hash = f"bench-{extractor.max_workers}-{run}"
+    started = time.perf_counter()
+    first_page = None
+    pages = 0
+    async for _, _ in extractor.iter_pages(path, doc_hash):
+        if first_page is None:
+            first_page = time.perf_counter() - started
+        pages += 1
+    total = time.perf_counter() - started
+
+    started = time.perf_counter()
+    async for _ in extractor.iter_pages(path, doc_hash):
+        pass
+    cached = time.perf_counter() - started
+    return {"pages": pages, "total": total, "first_page": first_page, "cached": cached}
+
+
+def run_extractor(path: str, workers: int, shard_pages: int, repeat: int) -> dict:
+    from app.core.page_extractor import PageExtractor, PageTextCache
+
+    extractor = PageExtractor(max_workers=workers, kind="process", shard_pages=shard_pages, cache=PageTextCache())
+    extractor.warm_up()
+    try:
+        results = [asyncio.run(measure(extractor, path, run)) for run in range(repeat)]
+    finally:
+        extractor.shutdown()
+    return {
+        "pages": results[0]["pages"],
+        "total": statistics.median(result["total"] for result in results),
+        "first_page": statistics.median(result["first_page"] for result in results),
+        "cached": statistics.median(result["cached"] for result in results),
+    }
+
+
+def run_serial(path: str, repeat: int) -> float:
+    from app.core.pdf_processor import PDFProcessor
+
+    processor = PDFProcessor()
+    processor.parse(path=path, max_pages=1)  # PyMuPDF 불러오기
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        processor.parse(path=path)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--shard-pages", type=int, default=16)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    path = write_fixture(workdir, "large.pdf", make_pdf(pages=args.pages, seed=1, varied=True))
+    print(f"{args.pages}-page PDF ({os.path.getsize(path) / 1024 / 1024:.1f}MB), "
+          f"shard {args.shard_pages} pages, {os.cpu_count()} CPU cores")
+
+    serial = run_serial(path, args.repeat)
+    print(f"  {'serial parse':<14} total {serial * 1000:7.0f}ms  first page {serial * 1000:7.0f}ms")
+
+    for workers in args.workers:
+        result = run_extractor(path, workers, args.shard_pages, args.repeat)
+        print(
+            f"  {f'{workers} workers':<14} total {result['total'] * 1000:7.0f}ms  "
+            f"first page {result['first_page'] * 1000:7.0f}ms  speedup x{serial / result['total']:.2f}  "
+            f"cached {result['cached'] * 1000:5.1f}ms ({result['pages']} pages)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""PDF 파싱 벤치마크: 요청당 3회 fitz.open (기존) vs PDFProcessor.parse 1회
+
+실행: python -m benchmarks.bench_pdf_parse [--size-mb 5] [--repeat 20]
+
+각 방식은 별도 프로세스에서 실행하여 요청당 CPU 시간과 최대 RSS 증가량을 비교합니다.
+"""
+import argparse
+import multiprocessing
+import resource
+import time
+
+import fitz  # PyMuPDF
+
+from benchmarks.fixtures import make_pdf_of_size
+
+
+def legacy_request(contents: bytes, max_pages: int) -> int:
+    """기존 엔드포인트의 처리 방식 (validate / extract / page_count 각각 파싱)"""
+    doc = fitz.open(stream=contents, filetype="pdf")
+    is_valid = len(doc) > 0
+    doc.close()
+    if not is_valid:
+        return 0
+
+    doc = fitz.open(stream=contents, filetype="pdf")
+    text = ""
+    for page_num in range(min(len(doc), max_pages)):
+        text += doc[page_num].get_text()
+    doc.close()
+
+    doc = fitz.open(stream=contents, filetype="pdf")
+    page_count = len(doc)
+    doc.close()
+    return min(page_count, max_pages) + len(text.strip())
+
+
+def single_parse_request(contents: bytes, max_pages: int) -> int:
+    """PDFDocument 한 번의 파싱으로 처리하는 방식"""
+    from app.core.pdf_processor import PDFProcessor
+
+    document = PDFProcessor().parse(contents, max_pages)
+    return document.extracted_page_count + len(document.text)
+
+
+def _run(variant: str, contents: bytes, max_pages: int, repeat: int, queue) -> None:
+    func = legacy_request if variant == "legacy" else single_parse_request
+    func(contents, max_pages)  # 워밍업
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(repeat):
+        func(contents, max_pages)
+    cpu = (time.process_time() - cpu_start) / repeat
+    wall = (time.perf_counter() - wall_start) / repeat
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    queue.put({
+        "variant": variant,
+        "cpu_ms": cpu * 1000,
+        "wall_ms": wall * 1000,
+        "peak_rss_delta_kb": rss_after - rss_before,
+        "peak_rss_kb": rss_after,
+    })
+
+
+def measure(variant: str, contents: bytes, max_pages: int, repeat: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run, args=(variant, contents, max_pages, repeat, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--max-pages", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    contents = make_pdf_of_size(int(args.size_mb * 1024 * 1024), pages=args.pages)
+    print(f"fixture: {len(contents) / (1024 * 1024):.2f}MB, {args.pages} pages, max_pages={args.max_pages}")
+
+    results = [measure(variant, contents, args.max_pages, args.repeat) for variant in ("legacy", "single_parse")]
+    for result in results:
+        print(
+            f"{result['variant']:>12}: cpu {result['cpu_ms']:.2f}ms/req, wall {result['wall_ms']:.2f}ms/req, "
+            f"peak RSS {result['peak_rss_kb'] / 1024:.1f}MB (+{result['peak_rss_delta_kb'] / 1024:.1f}MB)"
+        )
+
+    legacy, single = results
+    print(f"CPU 감소: {(1 - single['cpu_ms'] / legacy['cpu_ms']) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+"""RateLimiter 저장소 벤치마크: 활성 세션 10만 개에서 초당 확인/증가 횟수
+
+실행: python -m benchmarks.bench_rate_limiter [--sessions 100000] [--ops 20000] [--processes 4]
+
+각 저장소(memory, sqlite)에 세션을 미리 채운 뒤 check_limit / increment_usage 처리량을 측정하고,
+여러 프로세스가 같은 세션을 동시에 증가시켜도 한도를 넘지 않는지(원자성) 확인합니다.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+
+def populate(backend, sessions: int) -> None:
+    day = date.today().isoformat()
+    if hasattr(backend, "_connection"):
+        # SQLite는 한 트랜잭션으로 채워야 준비 시간이 짧음
+        conn = backend._connection()
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO usage (session_id, day, usage_count, last_used) VALUES (?, ?, 1, ?)",
+            ((f"session-{i}", day, time.time()) for i in range(sessions))
+        )
+        conn.execute("COMMIT")
+    else:
+        for i in range(sessions):
+            backend.try_increment(f"session-{i}", day, 1_000_000)
+
+
+def measure(limiter, sessions: int, ops: int) -> dict:
+    rng = random.Random(0)
+    session_ids = [f"session-{rng.randrange(sessions)}" for _ in range(ops)]
+
+    started = time.perf_counter()
+    for session_id in session_ids:
+        limiter.check_limit(session_id)
+    check_rate = ops / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    for session_id in session_ids:
+        limiter.increment_usage(session_id)
+    increment_rate = ops / (time.perf_counter() - started)
+
+    return {"check_per_s": check_rate, "increment_per_s": increment_rate}
+
+
+def _contend(db_path: str, attempts: int, queue) -> None:
+    from app.core.rate_limiter import RateLimiter, SQLiteRateLimitBackend
+
+    limiter = RateLimiter(SQLiteRateLimitBackend(db_path))
+    queue.put(sum(1 for _ in range(attempts) if limiter.increment_usage("shared-session")))
+
+
+def check_atomicity(db_path: str, processes: int, attempts: int, limit: int) -> int:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_contend, args=(db_path, attempts, queue)) for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    granted = sum(queue.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    return granted
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--ops", type=int, default=20_000)
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ["DAILY_LIMIT"] = "1000000"
+
+    from app.config import settings
+    from app.core.rate_limiter import RateLimiter, MemoryRateLimitBackend, SQLiteRateLimitBackend
+
+    backends = {
+        "memory": MemoryRateLimitBackend(),
+        "sqlite": SQLiteRateLimitBackend(os.path.join(workdir, "rate_limit.db")),
+    }
+    for name, backend in backends.items():
+        populate(backend, args.sessions)
+        result = measure(RateLimiter(backend), args.sessions, args.ops)
+        print(
+            f"{name:>7} ({backend.session_count()} sessions): "
+            f"check_limit {result['check_per_s']:,.0f}/s, increment_usage {result['increment_per_s']:,.0f}/s"
+        )
+
+    limit = 50
+    os.environ["DAILY_LIMIT"] = str(limit)
+    settings.daily_limit = limit
+    granted = check_atomicity(os.path.join(workdir, "contention.db"), args.processes, limit, limit)
+    print(f"atomicity: {args.processes} processes x {limit} attempts, limit {limit} -> granted {granted}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,75 @@
+"""Q&A 검색 인덱스 벤치마크: 100/1000 페이지 PDF의 인덱스 생성 및 질의 지연
+
+실행: python -m benchmarks.bench_retrieval [--pages 100 1000] [--queries 200] [--korean]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from benchmarks.fixtures import make_pdf, random_paragraph
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(pages: int, queries: int, korean: bool) -> None:
+    from app.core.pdf_processor import PDFProcessor
+    from app.core.retriever import RetrievalIndex
+
+    contents = make_pdf(pages=pages, korean=korean, varied=True, seed=pages)
+    started = time.perf_counter()
+    page_texts = PDFProcessor().parse(contents).page_texts
+    parse_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    index = RetrievalIndex.build(page_texts)
+    build_s = time.perf_counter() - started
+
+    path_prefix = os.path.join(tempfile.mkdtemp(prefix="gpdf-bench-index-"), "doc")
+    started = time.perf_counter()
+    index.save(path_prefix)
+    save_s = time.perf_counter() - started
+    started = time.perf_counter()
+    RetrievalIndex.load(path_prefix)
+    load_s = time.perf_counter() - started
+
+    rng = random.Random(1)
+    latencies = []
+    context_lengths = []
+    for _ in range(queries):
+        question = random_paragraph(rng, korean, words=6)
+        started = time.perf_counter()
+        context = index.build_context(question)
+        latencies.append(time.perf_counter() - started)
+        context_lengths.append(len(context))
+
+    total_chars = sum(len(text) for text in page_texts)
+    print(
+        f"{pages:>5} pages ({len(index.chunk_texts)} chunks, {len(index.vocab)} terms, {total_chars / 1000:.0f}K chars): "
+        f"parse {parse_s * 1000:.0f}ms, build {build_s * 1000:.0f}ms, save {save_s * 1000:.0f}ms, load {load_s * 1000:.0f}ms"
+    )
+    print(
+        f"       query p50 {statistics.median(latencies) * 1000:.2f}ms, p95 {percentile(latencies, 95) * 1000:.2f}ms, "
+        f"avg context {statistics.mean(context_lengths):.0f} chars"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--korean", action="store_true")
+    args = parser.parse_args()
+
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    for pages in args.pages:
+        run(pages, args.queries, args.korean)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
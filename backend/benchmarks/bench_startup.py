@@ -0,0 +1,114 @@
+"""API 프로세스 cold-start 벤치마크: app.main import 시간과 첫 /health 응답까지의 시간
+
+실행: python -m benchmarks.bench_startup [--runs 5] [--warm-up off background blocking]
+                                         [--json result.json] [--baseline baseline.json] [--tolerance 0.25]
+
+매 측정마다 새 인터프리터를 띄우므로 이미 불러온 모듈의 영향이 없습니다.
+--baseline을 주면 각 지표가 기준값보다 tolerance 이상 느려졌을 때 종료 코드 1로 끝납니다.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)"
+
+
+def _env(warm_up: str) -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = BACKEND_DIR + os.pathsep + env.get("PYTHONPATH", "")
+    env.setdefault("OPENAI_API_KEY", "bench")
+    env["STARTUP_WARM_UP"] = warm_up
+    return env
+
+
+def measure_import(workdir: str) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=workdir, env=_env("off"), capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_health(workdir: str, warm_up: str, timeout: float = 60.0) -> float:
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=workdir, env=_env(warm_up), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError("서버가 제한 시간 안에 응답하지 않았습니다.")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def compare(result: dict, baseline: dict, tolerance: float) -> list:
+    regressions = []
+    for name, value in result.items():
+        reference = baseline.get(name)
+        if reference and value > reference * (1 + tolerance):
+            regressions.append(f"{name}: {value * 1000:.0f}ms > baseline {reference * 1000:.0f}ms (+{tolerance:.0%})")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--warm-up", nargs="+", default=["off", "background", "blocking"])
+    parser.add_argument("--json", dest="json_path", default=None)
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # 캐시/다운로드 폴더가 저장소 안에 생기지 않도록 임시 폴더에서 실행
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-startup-")
+    result = {}
+
+    imports = [measure_import(workdir) for _ in range(args.runs)]
+    result["import_app_main_s"] = statistics.median(imports)
+    print(f"import app.main:        median {result['import_app_main_s'] * 1000:.0f}ms (min {min(imports) * 1000:.0f}ms)")
+
+    for warm_up in args.warm_up:
+        timings = [measure_first_health(workdir, warm_up) for _ in range(args.runs)]
+        result[f"first_health_{warm_up}_s"] = statistics.median(timings)
+        print(f"first /health ({warm_up:>10}): median {statistics.median(timings) * 1000:.0f}ms (min {min(timings) * 1000:.0f}ms)")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""스트리밍 요약의 첫 바이트까지의 시간(TTFB) 벤치마크
+
+실행: python -m benchmarks.bench_stream_ttfb [--tokens 100] [--token-delay 0.05] [--first-token-delay 0.5]
+
+로컬 가짜 스트리밍 LLM 백엔드로 앱을 uvicorn에서 실행하고
+/summarize (전체 응답 대기)와 /summarize/stream (SSE)의 TTFB, 첫 토큰 시간, 전체 시간을 비교합니다.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import make_pdf
+
+
+class FakeStreamingCompletions:
+    """OpenAI chat.completions 응답을 흉내 내는 가짜 백엔드 (스트리밍/비스트리밍)"""
+
+    def __init__(self, tokens: int, token_delay: float, first_token_delay: float):
+        self.tokens = tokens
+        self.token_delay = token_delay
+        self.first_token_delay = first_token_delay
+
+    def _token(self, index: int) -> str:
+        return f"요약{index} "
+
+    async def create(self, stream: bool = False, **kwargs):
+        if stream:
+            return self._stream()
+
+        await asyncio.sleep(self.first_token_delay + self.token_delay * self.tokens)
+        content = "".join(self._token(i) for i in range(self.tokens))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def _stream(self):
+        await asyncio.sleep(self.first_token_delay)
+        for i in range(self.tokens):
+            delta = SimpleNamespace(content=self._token(i))
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+            await asyncio.sleep(self.token_delay)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def measure(base_url: str, path: str, contents: bytes, session_id: str) -> dict:
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=None) as client:
+        started = time.perf_counter()
+        ttfb = None
+        first_token = None
+        async with client.stream(
+            "POST",
+            path,
+            files={"file": ("doc.pdf", contents, "application/pdf")},
+            data={"session_id": session_id}
+        ) as response:
+            async for chunk in response.aiter_bytes():
+                now = time.perf_counter() - started
+                if ttfb is None:
+                    ttfb = now
+                if first_token is None and (b"event: token" in chunk or b'"summary"' in chunk):
+                    first_token = now
+        total = time.perf_counter() - started
+
+    return {"path": path, "status": response.status_code, "ttfb": ttfb, "first_token": first_token, "total": total}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tokens", type=int, default=100)
+    parser.add_argument("--token-delay", type=float, default=0.05)
+    parser.add_argument("--first-token-delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("PDF_POOL_KIND", "thread")
+    os.environ["SUMMARY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.chdir(workdir)
+
+    import uvicorn
+    from app.main import app
+    from app.api.v1.endpoints import pdf as pdf_module
+
+    completions = FakeStreamingCompletions(args.tokens, args.token_delay, args.first_token_delay)
+    pdf_module.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        for index, path in enumerate(("/api/v1/pdf/summarize", "/api/v1/pdf/summarize/stream")):
+            # 캐시 적중을 피하기 위해 요청마다 다른 문서 사용
+            contents = make_pdf(pages=3, image_bytes_per_page=300, seed=index)
+            result = asyncio.run(measure(base_url, path, contents, f"bench-{index}"))
+            print(
+                f"{result['path']:<30} status={result['status']} "
+                f"TTFB {result['ttfb'] * 1000:.0f}ms, first token {result['first_token'] * 1000:.0f}ms, "
+                f"total {result['total'] * 1000:.0f}ms"
+            )
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""업로드 처리 중 서버 프로세스의 최대 메모리(peak RSS) 벤치마크
+
+실행: python -m benchmarks.bench_upload_rss [--oversize-mb 50] [--valid-mb 4.5]
+
+앱을 가짜 LLM 백엔드와 함께 uvicorn에서 실행하고 요청마다 최대 RSS(VmHWM)를 초기화한 뒤
+    - 제한을 넘는 업로드 (Content-Length 있음 / chunked)
+    - 제한 이내의 정상 PDF 업로드 (/summarize)
+를 보내 RSS 증가량, 응답 코드, 처리 시간을 측정합니다. (Linux 전용: /proc/self/status, /proc/self/clear_refs)
+"""
+import argparse
+import os
+import socket
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from benchmarks.fixtures import make_pdf_of_size
+
+BOUNDARY = "gpdf-bench-boundary"
+BLOCK = 64 * 1024
+
+
+class FakeCompletions:
+    """요약 요청에 즉시 고정된 답을 돌려주는 가짜 OpenAI 백엔드"""
+
+    async def create(self, **kwargs):
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="요약"))])
+
+
+def _status_kb(field: str) -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise RuntimeError(f"{field}를 읽을 수 없습니다.")
+
+
+def _reset_peak_rss() -> int:
+    """최대 RSS를 현재 RSS로 초기화하고 현재 RSS(KB)를 반환합니다."""
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+    return _status_kb("VmRSS")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def multipart_body(payload_size: int, payload: bytes = b""):
+    """파일 내용을 메모리에 만들지 않고 multipart 본문을 블록 단위로 생성합니다."""
+    head = (
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"session_id\"\r\n\r\nbench-{time.time_ns()}\r\n"
+        f"--{BOUNDARY}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"doc.pdf\"\r\n"
+        f"Content-Type: application/pdf\r\n\r\n"
+    ).encode()
+    tail = f"\r\n--{BOUNDARY}--\r\n".encode()
+
+    def generate():
+        yield head
+        if payload:
+            for offset in range(0, len(payload), BLOCK):
+                yield payload[offset:offset + BLOCK]
+        else:
+            block = b"\0" * BLOCK
+            remaining = payload_size
+            while remaining > 0:
+                yield block[:min(BLOCK, remaining)]
+                remaining -= BLOCK
+        yield tail
+
+    return generate, len(head) + (len(payload) or payload_size) + len(tail)
+
+
+def measure(base_url: str, label: str, payload_size: int, payload: bytes = b"", content_length: bool = True) -> None:
+    import httpx
+
+    generate, total = multipart_body(payload_size, payload)
+    headers = {"content-type": f"multipart/form-data; boundary={BOUNDARY}"}
+    if content_length:
+        headers["content-length"] = str(total)
+
+    baseline_kb = _reset_peak_rss()
+    started = time.perf_counter()
+    try:
+        with httpx.Client(base_url=base_url, timeout=60) as client:
+            response = client.post("/api/v1/pdf/summarize", content=generate(), headers=headers)
+        status = str(response.status_code)
+    except httpx.TransportError as e:
+        # 서버가 본문을 다 받기 전에 응답하고 연결을 닫으면 전송 중 오류가 날 수 있음
+        status = f"closed ({type(e).__name__})"
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    peak_kb = _status_kb("VmHWM")
+
+    print(
+        f"{label:<38} status={status:<6} {elapsed_ms:7.0f}ms  "
+        f"peak RSS +{(peak_kb - baseline_kb) / 1024:6.1f}MB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--oversize-mb", type=float, default=50)
+    parser.add_argument("--valid-mb", type=float, default=4.5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-bench-")
+    os.environ.setdefault("OPENAI_API_KEY", "bench")
+    os.environ.setdefault("PDF_POOL_KIND", "thread")
+    os.environ.setdefault("STARTUP_WARM_UP", "off")
+    os.environ["SUMMARY_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.chdir(workdir)
+
+    import uvicorn
+    from app.config import settings
+    from app.main import app
+    from app.api.v1.endpoints import pdf as pdf_module
+
+    pdf_module.summarizer.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions()))
+    valid_pdf = make_pdf_of_size(int(args.valid_mb * 1024 * 1024))
+    oversize = int(args.oversize_mb * 1024 * 1024)
+    print(f"limit {settings.max_file_size / 1024 / 1024:.1f}MB, valid PDF {len(valid_pdf) / 1024 / 1024:.1f}MB")
+
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        measure(base_url, f"oversize {args.oversize_mb:.0f}MB (Content-Length)", oversize)
+        measure(base_url, f"oversize {args.oversize_mb:.0f}MB (chunked)", oversize, content_length=False)
+        measure(base_url, f"valid {len(valid_pdf) / 1024 / 1024:.1f}MB PDF", 0, payload=valid_pdf)
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+if __name__ == "__main__":
+    main()
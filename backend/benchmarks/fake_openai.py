@@ -0,0 +1,161 @@
+"""로컬 가짜 OpenAI 호환 서버 (벤치마크/부하 테스트용)
+
+실행: python -m benchmarks.fake_openai [--port 9000] [--latency 0.2] [--error-rate 0.1] [--error-status 503]
+
+/v1/chat/completions 하나만 구현하며 지연, 스트리밍 토큰 간격, 오류 비율을 설정할 수 있습니다.
+앱은 OPENAI_BASE_URL=http://127.0.0.1:9000/v1 로 이 서버를 바라보게 합니다.
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+@dataclass
+class FakeOpenAIConfig:
+    """가짜 서버 동작 설정 (실행 중에 바꾸면 다음 요청부터 반영)"""
+    latency: float = 0.2  # 응답(스트리밍이면 첫 토큰)까지의 지연(초)
+    jitter: float = 0.0  # 지연에 더할 무작위 값의 최대치(초)
+    tokens: int = 40  # 응답 토큰 수
+    token_delay: float = 0.0  # 스트리밍 토큰 사이 간격(초)
+    error_rate: float = 0.0  # 오류로 응답할 비율 (0~1)
+    error_status: int = 503
+    retry_after: Optional[float] = None  # 오류 응답에 붙일 Retry-After(초)
+    seed: int = 0
+    counters: Dict[str, int] = field(default_factory=lambda: {"requests": 0, "errors": 0, "streams": 0})
+
+
+def create_app(config: FakeOpenAIConfig) -> Starlette:
+    rng = random.Random(config.seed)
+
+    def completion_text() -> str:
+        return " ".join(f"요약{i}" for i in range(config.tokens))
+
+    async def chat_completions(request: Request):
+        body = await request.json()
+        config.counters["requests"] += 1
+        await asyncio.sleep(config.latency + rng.uniform(0, config.jitter))
+
+        if rng.random() < config.error_rate:
+            config.counters["errors"] += 1
+            headers = {"retry-after": str(config.retry_after)} if config.retry_after is not None else None
+            return JSONResponse(
+                {"error": {"message": "injected error", "type": "server_error", "code": None}},
+                status_code=config.error_status,
+                headers=headers
+            )
+
+        prompt_tokens = sum(len(message.get("content", "")) for message in body.get("messages", [])) // 2
+        created = int(time.time())
+        if body.get("stream"):
+            config.counters["streams"] += 1
+            return StreamingResponse(stream(body["model"], created), media_type="text/event-stream")
+
+        return JSONResponse({
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": created,
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": completion_text()},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": config.tokens,
+                "total_tokens": prompt_tokens + config.tokens,
+            },
+        })
+
+    async def stream(model: str, created: int):
+        for i in range(config.tokens):
+            chunk = {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {"content": f"요약{i} "}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n"
+            if config.token_delay:
+                await asyncio.sleep(config.token_delay)
+        yield "data: [DONE]\n\n"
+
+    return Starlette(routes=[Route("/v1/chat/completions", chat_completions, methods=["POST"])])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class FakeOpenAIServer:
+    """가짜 서버를 별도 스레드의 uvicorn으로 실행합니다. (with 문 사용)"""
+
+    def __init__(self, config: Optional[FakeOpenAIConfig] = None, port: Optional[int] = None):
+        self.config = config or FakeOpenAIConfig()
+        self.port = port or _free_port()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/v1"
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        import uvicorn
+
+        self._server = uvicorn.Server(uvicorn.Config(
+            create_app(self.config), host="127.0.0.1", port=self.port, log_level="warning", backlog=4096
+        ))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.02)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.should_exit = True
+        self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--tokens", type=int, default=40)
+    parser.add_argument("--token-delay", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--retry-after", type=float, default=None)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    config = FakeOpenAIConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        tokens=args.tokens,
+        token_delay=args.token_delay,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after
+    )
+    uvicorn.run(create_app(config), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""벤치마크용 PDF 픽스처 생성기
+
+외부 파일 없이 PyMuPDF만으로 재현 가능한 PDF를 만듭니다.
+"""
+import os
+import random
+
+import fitz  # PyMuPDF
+
+LOREM = (
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor "
+    "incididunt ut labore et dolore magna aliqua. Ut enim ad minim veniam, quis nostrud "
+    "exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat."
+)
+KOREAN = (
+    "본 보고서는 인공지능 기반 문서 요약 시스템의 성능을 분석합니다. 대규모 언어 모델을 "
+    "활용하여 긴 문서의 핵심 내용을 자동으로 정리하고, 사용자 질문에 답변하는 기능을 제공합니다."
+)
+
+
+
+def random_paragraph(rng: random.Random, korean: bool = False, words: int = 40) -> str:
+    """기본 문장의 단어를 무작위로 섞어 페이지마다 내용이 다른 문단을 만듭니다."""
+    vocabulary = (KOREAN if korean else LOREM).replace(".", "").replace(",", "").split()
+    return " ".join(rng.choice(vocabulary) for _ in range(words)) + "."
+
+
+def make_pdf(
+    pages: int = 10,
+    paragraphs_per_page: int = 8,
+    image_bytes_per_page: int = 0,
+    korean: bool = False,
+    seed: int = 0,
+    varied: bool = False
+) -> bytes:
+    """지정한 조건의 PDF를 생성하여 바이트로 반환합니다.
+
+    image_bytes_per_page를 지정하면 압축되지 않는 무작위 이미지를 페이지마다 삽입해
+    파일 크기를 원하는 수준으로 키울 수 있습니다.
+    varied를 지정하면 같은 문장을 반복하지 않고 문단마다 무작위 문장을 사용합니다.
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    base_text = KOREAN if korean else LOREM
+    fontname = "korea" if korean else "helv"
+
+    for page_num in range(pages):
+        page = doc.new_page()
+        y = 60
+        for paragraph_num in range(paragraphs_per_page):
+            body = random_paragraph(rng, korean) if varied else base_text
+            text = f"[{page_num + 1}-{paragraph_num + 1}] {body}"
+            rect = fitz.Rect(50, y, page.rect.width - 50, y + 80)
+            page.insert_textbox(rect, text, fontsize=10, fontname=fontname)
+            y += 85
+            if y > page.rect.height - 100:
+                break
+
+        if image_bytes_per_page > 0:
+            side = max(8, int((image_bytes_per_page / 3) ** 0.5))
+            samples = bytes(rng.getrandbits(8) for _ in range(side * side * 3))
+            pixmap = fitz.Pixmap(fitz.csRGB, side, side, samples, False)
+            page.insert_image(fitz.Rect(50, page.rect.height - 90, 130, page.rect.height - 10), pixmap=pixmap)
+
+    data = doc.tobytes(deflate=True, no_new_id=True)
+    doc.close()
+    return data
+
+
+def make_pdf_of_size(target_bytes: int, pages: int = 20, korean: bool = False) -> bytes:
+    """대략 target_bytes 크기의 PDF를 생성합니다."""
+    return make_pdf(pages=pages, image_bytes_per_page=target_bytes // pages, korean=korean)
+
+
+def write_fixture(directory: str, name: str, data: bytes) -> str:
+    """생성한 PDF를 파일로 저장하고 경로를 반환합니다."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(data)
+    return path
@@ -0,0 +1,411 @@
+"""엔드투엔드 부하 테스트: 가짜 OpenAI 서버에 연결한 앱에 요약/스트리밍 요약/Q&A/변환 요청을 섞어 보냄
+
+실행:
+    python -m benchmarks.load_test --workers 1 --rate 2 5 10 --duration 30
+    python -m benchmarks.load_test --workers 4 --rate 20 --llm-latency 0.8 --llm-error-rate 0.05
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --rate 5   # 이미 실행 중인 앱 (사용량 한도는 직접 설정)
+
+동작:
+    1. 가짜 OpenAI 서버(benchmarks.fake_openai)를 별도 프로세스로 띄웁니다. (--llm-latency, --llm-jitter,
+       --llm-tokens, --llm-token-delay로 지연/스트리밍 속도, --llm-error-rate/--llm-error-status로 오류 주입)
+    2. --url이 없으면 uvicorn으로 앱을 --workers개 프로세스로 띄웁니다. 임시 폴더에서 실행하고
+       OPENAI_BASE_URL은 가짜 서버로, 사용량 한도(DAILY_LIMIT)는 부하 테스트가 막히지 않을 만큼 크게 설정합니다.
+    3. --documents개의 서로 다른 PDF를 한 번씩 요약해 Q&A/변환에 쓸 file_id와 세션을 준비합니다.
+       이후 요약 요청 중 --cache-miss 비율은 파일 끝에 주석을 붙여 요약 캐시를 거치지 않게 합니다.
+    4. --rate마다 --duration초 동안 목표 초당 요청 수로 요청을 보냅니다. (open-loop: 응답을 기다리지 않고
+       예정 시각에 보내며, 지연 시간은 예정 시각부터 잽니다. 느린 응답이 다음 요청을 늦춰 결과가 좋아 보이는 것을 막음)
+       --mix로 엔드포인트 비율을 정하고, 동시에 진행 중인 요청이 --max-in-flight를 넘으면 보내지 않고 dropped로 셉니다.
+    5. 단계마다 엔드포인트별 처리량, p50/p95/p99/최대 지연, 상태 코드별 오류 비율을 출력하고
+       --output이 있으면 JSON으로 저장합니다. p99가 --p99-limit초를 넘거나 오류 비율이 --max-error-rate를 넘으면
+       그 단계에서 멈춥니다. (처리 한계를 찾는 용도)
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.fixtures import make_pdf
+
+ENDPOINTS = ("summarize", "summarize_stream", "qa", "convert")
+DEFAULT_MIX = "summarize=2,summarize_stream=1,qa=5,convert=2"
+CONVERT_FORMATS = ("txt", "html", "docx", "pdf")
+QUESTIONS = (
+    "이 문서의 결론은 무엇인가요?",
+    "What are the main findings?",
+    "{n}장의 핵심 내용은?",
+    "{n}번째 문단을 요약해 주세요.",
+)
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"unknown endpoint in --mix: {name} (choose from {', '.join(ENDPOINTS)})")
+        weights[name] = float(weight or 1)
+    return {name: weight for name, weight in weights.items() if weight > 0}
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """정렬된 값의 nearest-rank 백분위수"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def wait_until_ready(url: str, process: Optional[subprocess.Popen], timeout: float = 120) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise SystemExit(f"process exited with code {process.returncode} before {url} was ready")
+        try:
+            if httpx.get(url, timeout=2).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"{url} did not become ready within {timeout:.0f}s")
+
+
+def start_fake_openai(args, port: int, log) -> subprocess.Popen:
+    command = [
+        sys.executable, "-m", "benchmarks.fake_openai",
+        "--port", str(port),
+        "--latency", str(args.llm_latency),
+        "--jitter", str(args.llm_jitter),
+        "--tokens", str(args.llm_tokens),
+        "--token-delay", str(args.llm_token_delay),
+        "--error-rate", str(args.llm_error_rate),
+        "--error-status", str(args.llm_error_status),
+    ]
+    return subprocess.Popen(command, cwd=BACKEND_DIR, stdout=log, stderr=subprocess.STDOUT)
+
+
+def start_app(args, port: int, llm_base_url: str, workdir: str, log) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PYTHONPATH": BACKEND_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""),
+        "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "load-test"),
+        "OPENAI_BASE_URL": llm_base_url,
+        "DAILY_LIMIT": str(10 ** 9),
+        "STARTUP_WARM_UP": "blocking",
+    }
+    for item in args.app_env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    command = [
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(args.workers),
+        "--log-level", "warning",
+        "--backlog", "4096",
+    ]
+    # 캐시/다운로드/SQLite 파일이 저장소를 어지럽히지 않도록 임시 폴더에서 실행
+    return subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+class LoadGenerator:
+    """목표 초당 요청 수로 엔드포인트를 섞어 요청을 보내고 결과를 기록합니다."""
+
+    def __init__(
+        self, base_url: str, documents: List[bytes], weights: Dict[str, float], timeout: float,
+        cache_miss: float = 0.5, seed: int = 0
+    ):
+        self.base_url = base_url
+        self.documents = documents
+        self.weights = weights
+        self.timeout = timeout
+        self.cache_miss = cache_miss
+        self.rng = random.Random(seed)
+        self.prepared: List[Dict] = []  # 요약을 마친 문서: file_id, session_id, summary
+        self._client = None
+        self._sequence = 0
+
+    async def __aenter__(self) -> "LoadGenerator":
+        import httpx
+
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=None, max_keepalive_connections=None)
+        )
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self._client.aclose()
+
+    def _session(self) -> str:
+        self._sequence += 1
+        return f"load-{self._sequence}"
+
+    def _document(self):
+        """요약할 PDF를 고릅니다. cache_miss 비율만큼은 %%EOF 뒤에 주석을 붙여 내용은 같고 해시만 다른 파일로 보냄"""
+        index = self.rng.randrange(len(self.documents))
+        content = self.documents[index]
+        if self.rng.random() < self.cache_miss:
+            self._sequence += 1
+            content += f"\n%load-{self._sequence}\n".encode()
+        return f"doc-{index}.pdf", content, "application/pdf"
+
+    async def prepare(self) -> None:
+        """각 문서를 한 번씩 요약해 Q&A/변환에 쓸 file_id와 세션을 준비합니다."""
+        async def one(index: int, content: bytes):
+            session_id = f"load-prepare-{index}"
+            # 오류를 주입한 경우에도 준비는 끝나도록 몇 번 다시 시도 (회로 차단기가 열려 있으면 닫힐 때까지 대기)
+            for attempt in range(5):
+                response = await self._client.post(
+                    "/api/v1/pdf/summarize",
+                    files={"file": (f"doc-{index}.pdf", content, "application/pdf")},
+                    data={"session_id": session_id}
+                )
+                if response.status_code == 200:
+                    body = response.json()
+                    return {"file_id": body["file_id"], "session_id": session_id, "summary": body["summary"]}
+                await asyncio.sleep(2 ** attempt)
+            print(f"preparing doc-{index} failed: {response.status_code} {response.text[:200]}")
+            return None
+
+        prepared = await asyncio.gather(*(one(index, content) for index, content in enumerate(self.documents)))
+        self.prepared = [document for document in prepared if document is not None]
+        if not self.prepared:
+            raise SystemExit("no document could be prepared; check the server logs")
+
+    async def _summarize(self) -> int:
+        response = await self._client.post(
+            "/api/v1/pdf/summarize",
+            files={"file": self._document()},
+            data={"session_id": self._session()}
+        )
+        return response.status_code
+
+    async def _summarize_stream(self) -> int:
+        status = None
+        async with self._client.stream(
+            "POST",
+            "/api/v1/pdf/summarize/stream",
+            files={"file": self._document()},
+            data={"session_id": self._session()}
+        ) as response:
+            if response.status_code != 200:
+                return response.status_code
+            event = None
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                elif line.startswith("data: ") and event in ("done", "error"):
+                    status = 200 if event == "done" else json.loads(line[len("data: "):]).get("status_code", 500)
+        return status or 599  # done/error 없이 끊긴 스트림
+
+    async def _qa(self) -> int:
+        document = self.rng.choice(self.prepared)
+        question = self.rng.choice(QUESTIONS).format(n=self.rng.randint(1, 20))
+        response = await self._client.post(
+            "/api/v1/pdf/qa",
+            json={"file_id": document["file_id"], "question": question}
+        )
+        return response.status_code
+
+    async def _convert(self) -> int:
+        document = self.rng.choice(self.prepared)
+        # 같은 요약/형식은 저장된 변환 파일을 재사용하므로 일부는 새 변환이 되도록 변형
+        summary = document["summary"] + f"\n\n(사본 {self.rng.randint(1, 10)})"
+        response = await self._client.post(
+            "/api/v1/pdf/convert",
+            data={
+                "summary_text": summary,
+                "format": self.rng.choice(CONVERT_FORMATS),
+                "session_id": document["session_id"],
+            }
+        )
+        return response.status_code
+
+    async def _send(self, endpoint: str, scheduled: float, results: List) -> None:
+        handler = getattr(self, f"_{endpoint}")
+        try:
+            status = await handler()
+        except Exception as e:
+            status = type(e).__name__  # 시간 초과, 연결 오류 등
+        results.append((endpoint, status, time.perf_counter() - scheduled))
+
+    async def run_stage(self, rate: float, duration: float, max_in_flight: int) -> Dict:
+        """duration초 동안 초당 rate개의 요청을 보내고 엔드포인트별 결과를 반환합니다."""
+        names = list(self.weights)
+        weights = [self.weights[name] for name in names]
+        results: List = []
+        dropped = {name: 0 for name in names}
+        tasks = set()
+
+        started = time.perf_counter()
+        scheduled = started
+        while scheduled < started + duration:
+            # 포아송 도착 간격 (같은 간격으로 보내면 실제 트래픽보다 부하가 고르게 들어옴)
+            scheduled += self.rng.expovariate(rate)
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = self.rng.choices(names, weights)[0]
+            if len(tasks) >= max_in_flight:
+                dropped[endpoint] += 1
+                continue
+            task = asyncio.create_task(self._send(endpoint, scheduled, results))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.wait(tasks)
+        elapsed = time.perf_counter() - started
+        return summarize_results(results, dropped, rate, elapsed)
+
+
+def summarize_results(results: List, dropped: Dict[str, int], rate: float, elapsed: float) -> Dict:
+    report = {"target_rate": rate, "elapsed": elapsed, "endpoints": {}}
+    for endpoint in list(dropped) + ["all"]:
+        rows = [row for row in results if endpoint == "all" or row[0] == endpoint]
+        latencies = sorted(latency for _, _, latency in rows)
+        errors: Dict[str, int] = {}
+        for _, status, _ in rows:
+            if status != 200:
+                errors[str(status)] = errors.get(str(status), 0) + 1
+        ok = len(rows) - sum(errors.values())
+        endpoint_dropped = sum(dropped.values()) if endpoint == "all" else dropped[endpoint]
+        attempted = len(rows) + endpoint_dropped
+        report["endpoints"][endpoint] = {
+            "sent": len(rows),
+            "ok": ok,
+            "dropped": endpoint_dropped,
+            "throughput": ok / elapsed if elapsed else 0.0,
+            "error_rate": (attempted - ok) / attempted if attempted else 0.0,
+            "errors": errors,
+            "p50": percentile(latencies, 0.50),
+            "p95": percentile(latencies, 0.95),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+        }
+    return report
+
+
+def print_stage(report: Dict) -> None:
+    print(f"\ntarget {report['target_rate']:g} req/s, {report['elapsed']:.1f}s")
+    print(f"  {'endpoint':<17} {'sent':>6} {'ok/s':>7} {'err%':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}  errors")
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"  {endpoint:<17} {row['sent']:>6} {row['throughput']:>7.2f} {row['error_rate'] * 100:>5.1f}% "
+            f"{row['p50'] * 1000:>6.0f}ms {row['p95'] * 1000:>6.0f}ms {row['p99'] * 1000:>6.0f}ms "
+            f"{row['max'] * 1000:>6.0f}ms  {row['errors'] or ''}"
+            + (f" dropped={row['dropped']}" if row["dropped"] else "")
+        )
+
+
+async def run(args, base_url: str) -> List[Dict]:
+    rng = random.Random(args.seed)
+    documents = [
+        make_pdf(pages=args.pages, seed=rng.randrange(1 << 30), varied=True, korean=index % 2 == 1)
+        for index in range(args.documents)
+    ]
+    reports = []
+    async with LoadGenerator(
+        base_url, documents, parse_mix(args.mix), args.timeout, args.cache_miss, args.seed
+    ) as generator:
+        started = time.perf_counter()
+        await generator.prepare()
+        print(f"prepared {len(generator.prepared)}/{len(documents)} documents in {time.perf_counter() - started:.1f}s")
+
+        for rate in args.rate:
+            report = await generator.run_stage(rate, args.duration, args.max_in_flight)
+            reports.append(report)
+            print_stage(report)
+            overall = report["endpoints"]["all"]
+            if overall["p99"] > args.p99_limit or overall["error_rate"] > args.max_error_rate:
+                print(f"\nstopping: p99 {overall['p99']:.2f}s (limit {args.p99_limit:g}s), "
+                      f"error rate {overall['error_rate']:.1%} (limit {args.max_error_rate:.0%})")
+                break
+    return reports
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="이미 실행 중인 앱 주소 (없으면 uvicorn으로 직접 실행)")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn 작업자 프로세스 수")
+    parser.add_argument("--app-env", action="append", default=[], metavar="KEY=VALUE", help="앱에 넘길 환경 변수")
+    parser.add_argument("--rate", type=float, nargs="+", default=[2.0], help="단계별 목표 초당 요청 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="단계별 실행 시간(초)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="엔드포인트=비율 목록")
+    parser.add_argument("--max-in-flight", type=int, default=1000)
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청별 시간 제한(초)")
+    parser.add_argument("--p99-limit", type=float, default=10.0, help="p99가 이 값(초)을 넘으면 다음 단계로 가지 않음")
+    parser.add_argument("--max-error-rate", type=float, default=0.2)
+    parser.add_argument("--documents", type=int, default=10, help="요약할 서로 다른 PDF 수")
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--cache-miss", type=float, default=0.5, help="요약 캐시를 피하는 요약 요청 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="결과 JSON 경로")
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-tokens", type=int, default=60)
+    parser.add_argument("--llm-token-delay", type=float, default=0.01, help="스트리밍 토큰 사이 간격(초)")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-error-status", type=int, default=503)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="gpdf-load-")
+    log_path = os.path.join(workdir, "servers.log")
+    processes = []
+    with open(log_path, "ab") as log:
+        try:
+            llm_port = _free_port()
+            processes.append(start_fake_openai(args, llm_port, log))
+            llm_base_url = f"http://127.0.0.1:{llm_port}/v1"
+            wait_until_ready(f"http://127.0.0.1:{llm_port}/", processes[-1])
+
+            base_url = args.url
+            if base_url is None:
+                app_port = _free_port()
+                processes.append(start_app(args, app_port, llm_base_url, workdir, log))
+                base_url = f"http://127.0.0.1:{app_port}"
+                wait_until_ready(f"{base_url}/health", processes[-1])
+            else:
+                print(f"using running app at {base_url}; point its OPENAI_BASE_URL at {llm_base_url}")
+
+            print(
+                f"app {base_url} ({'external' if args.url else f'{args.workers} worker(s)'}), "
+                f"fake LLM latency {args.llm_latency:g}s+{args.llm_jitter:g}s jitter, "
+                f"error rate {args.llm_error_rate:.0%}, mix {args.mix}"
+            )
+            reports = asyncio.run(run(args, base_url))
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+            for process in processes:
+                try:
+                    process.wait(timeout=15)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "stages": reports}, f, ensure_ascii=False, indent=2)
+        print(f"\nresults written to {args.output}")
+    print(f"server logs: {log_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.answer_cache import AnswerCache
+
+
+def _reused(cached: str, asked: str, threshold: float = 0.7) -> bool:
+    cache = AnswerCache(max_entries=16, max_entries_per_file=16, similarity_threshold=threshold)
+    cache.set("file", "v1", cached, {"answer": cached})
+    return cache.get("file", "v1", asked) is not None
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("결론이 뭐야?", "결론은 뭐야"),
+    ("What is the conclusion?", "what's the conclusion"),
+    ("What do I need to know about the method?", "What do I need to know about the methods?"),
+])
+def test_paraphrase_reuses_answer(cached, asked):
+    """조사/복수형/축약형만 다른 질문과 대명사 I가 들어간 질문은 같은 질문으로 봄"""
+    assert _reused(cached, asked)
+
+
+@pytest.mark.parametrize("cached, asked", [
+    ("What is in chapter two?", "What is in chapter three?"),
+    ("What is shown in Table 2 of the paper?", "What is shown in Table 3 of the paper?"),
+    ("What are the advantages?", "What are the disadvantages?"),
+    ("Is the model accurate?", "Is the model not accurate?"),
+    ("세 번째 실험의 결과는?", "네 번째 실험의 결과는?"),
+    ("결과가 유의미한가요", "결과가 유의미하지 않은가요"),
+])
+def test_meaning_change_is_not_reused(cached, asked):
+    """수/부정어/부정 접두사가 다른 질문은 유사도가 높아도 재사용하지 않음"""
+    assert not _reused(cached, asked)
+
+
+def test_exact_match_only_by_default():
+    cache = AnswerCache(max_entries=16, max_entries_per_file=16, similarity_threshold=0)
+    cache.set("file", "v1", "결론이 뭐야?", {"answer": "a"})
+    assert cache.get("file", "v1", "  결론이 뭐야 ") is not None
+    assert cache.get("file", "v1", "결론은 뭐야") is None
+
+
+def test_document_version_change_invalidates():
+    cache = AnswerCache(max_entries=16, max_entries_per_file=16, similarity_threshold=0)
+    cache.set("file", "v1", "결론이 뭐야?", {"answer": "a"})
+    assert cache.get("file", "v2", "결론이 뭐야?") is None
+    assert cache.get("file", "v1", "결론이 뭐야?") is None
@@ -0,0 +1,111 @@
+import hashlib
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.utils.http_cache import (
+    IMMUTABLE_CACHE_CONTROL,
+    REVALIDATE_CACHE_CONTROL,
+    CachingStaticFiles,
+    parse_range,
+)
+
+CONTENT = b"0123456789abcdef"
+
+
+@pytest.fixture
+def directory(tmp_path):
+    (tmp_path / "summary_file.txt").write_bytes(CONTENT)
+    return tmp_path
+
+
+@pytest.fixture
+def client(directory):
+    app = FastAPI()
+    app.mount(
+        "/downloads",
+        CachingStaticFiles(directory=str(directory), content_hash=lambda name: "hash" if name.startswith("summary_") else None)
+    )
+    return TestClient(app)
+
+
+def test_full_response_has_content_etag(client):
+    response = client.get("/downloads/summary_file.txt")
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{hashlib.md5(CONTENT).hexdigest()}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+def test_other_files_are_revalidated(client, directory):
+    (directory / "other.txt").write_bytes(CONTENT)
+    assert client.get("/downloads/other.txt").headers["cache-control"] == REVALIDATE_CACHE_CONTROL
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get("/downloads/summary_file.txt").headers["etag"]
+    for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get("/downloads/summary_file.txt", headers={"If-None-Match": if_none_match})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+
+def test_etag_follows_content_not_name(client, directory):
+    """같은 이름으로 다시 렌더링해 내용이 바뀌면 ETag도 바뀌어 304를 보내지 않음"""
+    etag = client.get("/downloads/summary_file.txt").headers["etag"]
+    path = directory / "summary_file.txt"
+    stat = path.stat()
+    path.write_bytes(CONTENT[::-1])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    response = client.get("/downloads/summary_file.txt", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.parametrize("range_header, expected_range, body", [
+    ("bytes=2-5", "bytes 2-5/16", CONTENT[2:6]),
+    ("bytes=10-", "bytes 10-15/16", CONTENT[10:]),
+    ("bytes=-3", "bytes 13-15/16", CONTENT[-3:]),
+    ("bytes=14-100", "bytes 14-15/16", CONTENT[14:]),
+])
+def test_range_returns_partial_content(client, range_header, expected_range, body):
+    response = client.get("/downloads/summary_file.txt", headers={"Range": range_header})
+    assert response.status_code == 206
+    assert response.headers["content-range"] == expected_range
+    assert response.headers["content-length"] == str(len(body))
+    assert response.content == body
+
+
+@pytest.mark.parametrize("range_header", ["bytes=16-", "bytes=5-2", "bytes=-0"])
+def test_unsatisfiable_range_returns_416(client, range_header):
+    response = client.get("/downloads/summary_file.txt", headers={"Range": range_header})
+    assert response.status_code == 416
+    assert response.headers["content-range"] == "bytes */16"
+
+
+def test_if_range_mismatch_returns_full_content(client):
+    etag = client.get("/downloads/summary_file.txt").headers["etag"]
+
+    matching = client.get("/downloads/summary_file.txt", headers={"Range": "bytes=0-1", "If-Range": etag})
+    assert matching.status_code == 206
+
+    stale = client.get("/downloads/summary_file.txt", headers={"Range": "bytes=0-1", "If-Range": '"stale"'})
+    assert stale.status_code == 200
+    assert stale.content == CONTENT
+
+
+def test_head_has_headers_without_body(client):
+    response = client.head("/downloads/summary_file.txt")
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.content == b""
+
+
+def test_multiple_ranges_fall_back_to_full_response():
+    assert parse_range("bytes=0-1,4-5", 16) is None
+    assert parse_range("items=0-1", 16) is None
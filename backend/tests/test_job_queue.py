@@ -0,0 +1,243 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core.job_queue import JobFailedError, JobQueue, JobStatus, JobStore
+
+
+def _create(store: JobStore, job_id: str, priority: int = 0, created_at: float = None, payload: dict = None) -> dict:
+    return store.create({
+        "job_id": job_id,
+        "kind": "test",
+        "status": JobStatus.QUEUED,
+        "priority": priority,
+        "payload": payload or {},
+        "created_at": created_at if created_at is not None else time.time(),
+    })
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / "jobs.db"))
+
+
+def test_claim_orders_by_priority_then_age(store):
+    _create(store, "old", created_at=1)
+    _create(store, "new", created_at=2)
+    _create(store, "urgent", priority=1, created_at=3)
+
+    assert [store.claim("worker", 60)["job_id"] for _ in range(3)] == ["urgent", "old", "new"]
+    assert store.claim("worker", 60) is None
+
+
+def test_each_job_is_claimed_once(tmp_path):
+    db_path = str(tmp_path / "jobs.db")
+    _create(JobStore(db_path), "job")
+    claims = [JobStore(db_path).claim(f"worker-{i}", 60) for i in range(3)]
+    assert [claim["owner"] for claim in claims if claim] == ["worker-0"]
+
+
+def test_expired_lease_is_requeued(store):
+    _create(store, "expired")
+    _create(store, "live")
+    store.claim("crashed", -1)
+    store.claim("alive", 60)
+
+    assert store.requeue_expired() == 1
+    expired = store.get("expired")
+    assert (expired["status"], expired["owner"], expired["lease_until"]) == (JobStatus.QUEUED, None, None)
+    assert store.get("live")["status"] == JobStatus.RUNNING
+
+
+def test_cancel_requested_job_is_not_rerun_after_lease_expires(store):
+    _create(store, "job")
+    store.claim("crashed", -1)
+    assert store.request_cancel("job")["cancel_requested"] == 1
+
+    store.requeue_expired()
+    assert store.get("job")["status"] == JobStatus.CANCELLED
+
+
+def test_renew_extends_only_listed_jobs_and_reports_cancels(store):
+    for created_at, job_id in enumerate(("a", "b", "other")):
+        _create(store, job_id, created_at=created_at)
+    store.claim("worker", 1)
+    store.claim("worker", 1)
+    store.claim("other-worker", 1)
+    store.request_cancel("b")
+
+    assert store.renew("worker", ["a", "b", "other"], 60) == ["b"]
+    leases = {job_id: store.get(job_id)["lease_until"] for job_id in ("a", "b", "other")}
+    assert leases["a"] > time.time() + 30 and leases["b"] > time.time() + 30
+    assert leases["other"] < time.time() + 30
+
+
+def test_finish_after_lost_lease_is_ignored(store):
+    _create(store, "job")
+    store.claim("slow", -1)
+    store.requeue_expired()
+    store.claim("fast", 60)
+
+    assert store.finish("job", "slow", status=JobStatus.SUCCEEDED) is False
+    assert store.finish("job", "fast", status=JobStatus.SUCCEEDED) is True
+    assert store.get("job")["status"] == JobStatus.SUCCEEDED
+
+
+def _queue(store: JobStore) -> JobQueue:
+    queue = JobQueue(store=store, workers=1, max_depth=0)
+    queue.poll_interval = 0.01
+    return queue
+
+
+async def _wait_for(queue: JobQueue, job_id: str, statuses, timeout: float = 5.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"작업 상태가 바뀌지 않음: {job}")
+
+
+def test_queue_runs_job_and_removes_input(store, tmp_path):
+    input_path = tmp_path / "input.pdf"
+    input_path.write_bytes(b"pdf")
+
+    async def handler(job, report):
+        report(0.5, "half")
+        return {"echo": job["payload"]["value"]}
+
+    async def scenario():
+        queue = _queue(store)
+        queue.register("test", handler)
+        await queue.start()
+        try:
+            job = await queue.submit("test", {"value": 1, "input_path": str(input_path)})
+            job = await _wait_for(queue, job["job_id"], JobStatus.FINISHED)
+        finally:
+            await queue.stop()
+        assert (job["status"], job["result"], job["progress"]) == (JobStatus.SUCCEEDED, {"echo": 1}, 1.0)
+
+    asyncio.run(scenario())
+    assert not input_path.exists()
+
+
+def test_queue_records_handler_failure(store):
+    async def handler(job, report):
+        raise JobFailedError(429, "limit")
+
+    async def scenario():
+        queue = _queue(store)
+        queue.register("test", handler)
+        await queue.start()
+        try:
+            job = await queue.submit("test", {})
+            job = await _wait_for(queue, job["job_id"], JobStatus.FINISHED)
+        finally:
+            await queue.stop()
+        assert (job["status"], job["status_code"], job["error"]) == (JobStatus.FAILED, 429, "limit")
+
+    asyncio.run(scenario())
+
+
+def test_cancel_running_job(store):
+    started = asyncio.Event()
+
+    async def handler(job, report):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        queue = _queue(store)
+        queue.register("test", handler)
+        await queue.start()
+        try:
+            job = await queue.submit("test", {})
+            await started.wait()
+            await queue.cancel(job["job_id"])
+            job = await _wait_for(queue, job["job_id"], JobStatus.FINISHED)
+        finally:
+            await queue.stop()
+        assert job["status"] == JobStatus.CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_cancel_from_another_process_stops_running_job(tmp_path):
+    """다른 프로세스(같은 DB의 다른 저장소)로 온 취소 요청은 lease를 연장할 때 확인해 중단"""
+    db_path = str(tmp_path / "jobs.db")
+    started = asyncio.Event()
+
+    async def handler(job, report):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        queue = _queue(JobStore(db_path))
+        queue.register("test", handler)
+        await queue.start()
+        try:
+            job = await queue.submit("test", {})
+            await started.wait()
+            assert JobStore(db_path).request_cancel(job["job_id"]) is not None
+            job = await _wait_for(queue, job["job_id"], JobStatus.FINISHED)
+        finally:
+            await queue.stop()
+        assert job["status"] == JobStatus.CANCELLED
+
+    asyncio.run(scenario())
+
+
+def test_stop_returns_running_job_to_queue(store):
+    started = asyncio.Event()
+
+    async def handler(job, report):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        queue = _queue(store)
+        queue.register("test", handler)
+        await queue.start()
+        job = await queue.submit("test", {})
+        await started.wait()
+        await queue.stop()
+        job = await queue.get(job["job_id"])
+        assert (job["status"], job["owner"]) == (JobStatus.QUEUED, None)
+
+    asyncio.run(scenario())
+
+
+def test_lost_lease_keeps_other_owners_input(store, tmp_path):
+    """lease를 잃은 뒤 끝난 처리기는 결과를 기록하지 않고, 다시 가져간 프로세스가 쓰는 입력 파일도 지우지 않음"""
+    input_path = tmp_path / "input.pdf"
+    input_path.write_bytes(b"pdf")
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler(job, report):
+        started.set()
+        await release.wait()
+        return {"owner": "slow"}
+
+    async def scenario():
+        queue = _queue(store)
+        queue.lease_seconds = 60
+        queue.register("test", handler)
+        await queue.start()
+        try:
+            job = await queue.submit("test", {"input_path": str(input_path)})
+            await started.wait()
+            # 이 프로세스가 멈춘 것으로 보고 다른 프로세스가 다시 가져감
+            await asyncio.to_thread(store.release, queue.owner)
+            assert (await asyncio.to_thread(store.claim, "other", 60))["job_id"] == job["job_id"]
+            release.set()
+            await asyncio.sleep(0.1)
+        finally:
+            await queue.stop()
+        job = await queue.get(job["job_id"])
+        assert (job["status"], job["owner"], job["result"]) == (JobStatus.RUNNING, "other", None)
+
+    asyncio.run(scenario())
+    assert input_path.exists()
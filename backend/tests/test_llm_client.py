@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.llm_client import CircuitBreaker, CircuitOpenError, LLMClient
+
+
+def _client(create) -> LLMClient:
+    client = LLMClient(breaker=CircuitBreaker(failure_threshold=1, reset_timeout=0))
+    client.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return client
+
+
+def _open_breaker(client: LLMClient) -> None:
+    client.breaker.record_failure()
+    assert client.breaker.state == CircuitBreaker.OPEN
+
+
+def test_cancelled_half_open_trial_releases_breaker():
+    """half_open 시험 호출이 취소되어도 다음 호출이 다시 시험 호출이 되어야 함"""
+    started = asyncio.Event()
+
+    async def hang(**kwargs):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def ok(**kwargs):
+        return SimpleNamespace(usage=None)
+
+    async def scenario():
+        client = _client(hang)
+        _open_breaker(client)
+
+        trial = asyncio.create_task(client.chat(model="test", messages=[]))
+        await started.wait()
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN
+        trial.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await trial
+
+        client.client.chat.completions.create = ok
+        await client.chat(model="test", messages=[])
+        assert client.breaker.state == CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_call_does_not_release_other_trial():
+    """closed일 때 시작한 호출이 취소되어도 그사이 시작된 다른 시험 호출의 표시를 풀면 안 됨"""
+    started = asyncio.Event()
+
+    async def hang(**kwargs):
+        started.set()
+        await asyncio.sleep(3600)
+
+    async def scenario():
+        client = _client(hang)
+        call = asyncio.create_task(client.chat(model="test", messages=[]))
+        await started.wait()
+
+        _open_breaker(client)
+        assert client.breaker.allow() is True  # 다른 호출이 시험 호출로 진행 중
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+
+        with pytest.raises(CircuitOpenError):
+            client.breaker.allow()
+
+    asyncio.run(scenario())
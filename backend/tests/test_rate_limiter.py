@@ -0,0 +1,70 @@
+import threading
+
+import pytest
+
+from app.core.rate_limiter import MemoryRateLimitBackend, RateLimiter, SQLiteRateLimitBackend
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryRateLimitBackend()
+    return SQLiteRateLimitBackend(str(tmp_path / "rate_limit.db"))
+
+
+def test_concurrent_increments_never_exceed_limit(tmp_path):
+    """여러 worker(각자 연결을 가진 저장소)가 동시에 차감해도 한도만큼만 성공"""
+    db_path = str(tmp_path / "rate_limit.db")
+    backends = [SQLiteRateLimitBackend(db_path) for _ in range(4)]
+    barrier = threading.Barrier(32)
+    results = []
+
+    def consume(backend: SQLiteRateLimitBackend) -> None:
+        barrier.wait()
+        results.append(backend.try_increment("session", "2026-01-01", 3))
+
+    threads = [threading.Thread(target=consume, args=(backends[i % len(backends)],)) for i in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(success for success, _ in results) == 3
+    assert sorted(count for success, count in results if success) == [1, 2, 3]
+    assert backends[0].get_usage("session", "2026-01-01") == 3
+
+
+def test_new_day_resets_usage(backend):
+    assert backend.try_increment("session", "2026-01-01", 1) == (True, 1)
+    assert backend.try_increment("session", "2026-01-01", 1) == (False, 1)
+    assert backend.try_increment("session", "2026-01-02", 1) == (True, 1)
+    assert backend.get_usage("session", "2026-01-01") == 0
+
+
+def test_decrement_stops_at_zero_and_ignores_other_days(backend):
+    backend.try_increment("session", "2026-01-01", 3)
+    assert backend.decrement("session", "2026-01-01") == 0
+    assert backend.decrement("session", "2026-01-01") == 0
+
+    backend.try_increment("session", "2026-01-02", 3)
+    # 차감한 날짜가 지났으면 새 날짜의 사용량은 건드리지 않음
+    assert backend.decrement("session", "2026-01-01") == 0
+    assert backend.get_usage("session", "2026-01-02") == 1
+
+
+def test_refund_returns_consumed_use(backend):
+    limiter = RateLimiter(backend)
+    success, usage_info = limiter.consume("session")
+    assert success and usage_info["usage_count"] == 1
+
+    refunded = limiter.refund("session", usage_info["day"])
+    assert refunded["usage_count"] == 0
+    assert refunded["remaining"] == refunded["limit"]
+
+
+def test_schema_is_created_on_first_use(tmp_path):
+    db_path = tmp_path / "nested" / "rate_limit.db"
+    backend = SQLiteRateLimitBackend(str(db_path))
+    assert not db_path.parent.exists()
+    assert backend.get_usage("session", "2026-01-01") == 0
+    assert db_path.exists()
@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def scenario():
+        flights = SingleFlight("test")
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flights.stats()["coalesced"] == 4
+        assert flights.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_failure_is_shared_with_waiters():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def scenario():
+        flights = SingleFlight("test")
+        results = await asyncio.gather(*(flights.do("key", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert flights.stats()["failures"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_leader_hands_off_to_waiter():
+    """선행 요청이 취소되면 기다리던 요청 중 하나만 작업을 다시 실행하고 나머지는 그 결과를 받음"""
+    calls = 0
+    leader_started = asyncio.Event()
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            leader_started.set()
+            await asyncio.sleep(3600)
+        await asyncio.sleep(0.01)
+        return f"run {calls}"
+
+    async def scenario():
+        flights = SingleFlight("test")
+        leader = asyncio.create_task(flights.do("key", work))
+        await leader_started.wait()
+        waiters = [asyncio.create_task(flights.do("key", work)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+        assert await asyncio.gather(*waiters) == ["run 2"] * 3
+        assert calls == 2
+        stats = flights.stats()
+        assert (stats["leaders"], stats["coalesced"], stats["in_flight"]) == (2, 2, 0)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_run():
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def work():
+        started.set()
+        await release.wait()
+        return "result"
+
+    async def scenario():
+        flights = SingleFlight("test")
+        leader = asyncio.create_task(flights.do("key", work))
+        await started.wait()
+        waiter = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        release.set()
+        assert await leader == "result"
+
+    asyncio.run(scenario())
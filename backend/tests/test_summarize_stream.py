@@ -0,0 +1,117 @@
+import json
+from types import SimpleNamespace
+
+import fitz
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import pdf
+from app.core.rate_limiter import MemoryRateLimitBackend, RateLimiter
+from app.core.summarizer import GPTSummarizer
+from app.core.summary_cache import SummaryCache
+from app.core.text_store import PageTextStore
+from app.core.worker_pool import WorkerPool
+from app.utils.llm_client import CircuitBreaker, LLMClient
+
+
+def _chunk(text: str) -> SimpleNamespace:
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None)
+
+
+def _streaming_create(deltas, error: Exception = None):
+    """deltas를 차례로 보내고, error가 주어지면 그 뒤에 스트림을 끊는 가짜 chat.completions.create"""
+    async def stream():
+        for delta in deltas:
+            yield _chunk(delta)
+        if error is not None:
+            raise error
+
+    async def create(**kwargs):
+        assert kwargs["stream"] is True
+        return stream()
+
+    return create
+
+
+def _pdf_bytes(text: str) -> bytes:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    try:
+        return doc.tobytes()
+    finally:
+        doc.close()
+
+
+def _events(body: str):
+    events = []
+    for message in body.strip().split("\n\n"):
+        event_line, data_line = message.split("\n")
+        events.append((event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))))
+    return events
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """임시 폴더의 캐시/저장소와 메모리 사용량 저장소로 바꾼 /summarize/stream 엔드포인트"""
+    monkeypatch.setattr(pdf, "rate_limiter", RateLimiter(MemoryRateLimitBackend()))
+    monkeypatch.setattr(pdf, "summary_cache", SummaryCache(cache_dir=str(tmp_path / "summaries")))
+    monkeypatch.setattr(pdf, "text_store", PageTextStore(store_dir=str(tmp_path / "page_text")))
+    monkeypatch.setattr(pdf, "pdf_pool", WorkerPool("pdf", 1, kind="thread"))
+
+    def use_llm(create) -> None:
+        llm = LLMClient(breaker=CircuitBreaker(failure_threshold=5, reset_timeout=0))
+        llm.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+        monkeypatch.setattr(pdf, "summarizer", GPTSummarizer(llm=llm))
+
+    app = FastAPI()
+    app.include_router(pdf.router, prefix="/api/v1/pdf")
+    return TestClient(app), use_llm
+
+
+def _post(client: TestClient, content: bytes, session_id: str = "session"):
+    return client.post(
+        "/api/v1/pdf/summarize/stream",
+        files={"file": ("doc.pdf", content, "application/pdf")},
+        data={"session_id": session_id}
+    )
+
+
+def test_stream_event_order(service):
+    client, use_llm = service
+    use_llm(_streaming_create(["첫 ", "번째 ", "요약"]))
+
+    response = _post(client, _pdf_bytes("Streaming order test"))
+    assert response.status_code == 200
+    events = _events(response.text)
+
+    assert [name for name, _ in events] == ["received", "validated", "extracted", "token", "token", "token", "done"]
+    assert "".join(data["text"] for name, data in events if name == "token") == "첫 번째 요약"
+    assert events[1][1]["cached"] is False
+    assert events[-1][1]["usage_remaining"] == pdf.settings.daily_limit - 1
+
+
+def test_stream_failure_sends_error_without_charging_usage(service):
+    """토큰을 일부 보낸 뒤 LLM 스트림이 끊기면 error 이벤트로 끝나고 사용량은 차감하지 않음"""
+    client, use_llm = service
+    use_llm(_streaming_create(["일부 "], error=RuntimeError("connection reset")))
+
+    response = _post(client, _pdf_bytes("Streaming failure test"))
+    assert response.status_code == 200
+    events = _events(response.text)
+
+    assert [name for name, _ in events] == ["received", "validated", "extracted", "token", "error"]
+    assert events[-1][1]["status_code"] == 500
+    assert pdf.rate_limiter.check_limit("session")["usage_count"] == 0
+
+
+def test_stream_invalid_pdf_sends_error(service):
+    client, use_llm = service
+    use_llm(_streaming_create(["사용되지 않음"]))
+
+    response = _post(client, b"%PDF-1.4 not really a pdf")
+    events = _events(response.text)
+
+    assert [name for name, _ in events] == ["received", "error"]
+    assert events[-1][1]["status_code"] == 400
+    assert pdf.rate_limiter.check_limit("session")["usage_count"] == 0
@@ -46,6 +46,25 @@ export const convertDocument = async (summaryText, format, sessionId) => {
   }
 };
 
+// 여러 형식 한 번에 변환 요청 (형식별 다운로드 URL 목록 반환)
+export const convertDocumentBundle = async (summaryText, formats, sessionId) => {
+  try {
+    const formData = new FormData();
+    formData.append('summary_text', summaryText);
+    formData.append('formats', formats.join(','));
+    formData.append('session_id', sessionId);
+
+    const response = await apiClient.post('/pdf/convert/bundle', formData, {
+      headers: {
+        'Content-Type': 'multipart/form-data',
+      },
+    });
+    return response.data.files;
+  } catch (error) {
+    throw new Error(error.response?.data?.detail || '문서 변환에 실패했습니다.');
+  }
+};
+
 // 사용량 확인
 export const checkUsage = async (sessionId) => {
   try {